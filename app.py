@@ -10,7 +10,6 @@ Date: May 14, 2025
 """
 import asyncio
 import threading
-import time
 from datetime import datetime
 
 import streamlit as st
@@ -48,7 +47,8 @@ class BedrockChatApp:
                         session_id: str,
                         agent_name: str,
                         agent_type: str,
-                        agent_config: dict = None):
+                        agent_config: dict = None,
+                        bypass_tool_cache: bool = False):
         """
         Process the user request and get a response from AWS Bedrock.
 
@@ -59,6 +59,7 @@ class BedrockChatApp:
             agent_name: Name of the agent to invoke
             agent_type: Type of the agent (e.g., 'mcp', 'llm')
             agent_config: Optional configuration for the agent
+            bypass_tool_cache: Ignore cached MCP tool results for this request
         """
         try:
             # Initialize conversation history for this user if needed
@@ -73,15 +74,7 @@ class BedrockChatApp:
 
             st.session_state.waiting_for_response = True
 
-            conversation_history = ''
-            if agent_type == 'mcp' and user_id in st.session_state.conversation_history and \
-                    len(st.session_state.conversation_history[user_id]) > 0:
-                for message in reversed(st.session_state.conversation_history[user_id]):
-                    if message['role'] == 'assistant':
-                        conversation_history += message['content'] + "\n"
-                        break
-                prompt = conversation_history + "\n" + prompt
-
+            # MCP agents keep their own multi-turn history (see BedrockAgentManager.get_conversation)
             # Get response from Bedrock
             full_response = self.agent_manager.invoke_agent(
                 prompt,
@@ -89,7 +82,8 @@ class BedrockChatApp:
                 session_id,
                 agent_name,
                 agent_type,
-                agent_config
+                agent_config,
+                bypass_tool_cache
             )
 
             # Log the full response
@@ -109,6 +103,9 @@ class BedrockChatApp:
             st.session_state.is_processing = False
             st.session_state.waiting_for_response = False
 
+            # Wake up any script run blocked on the response queue
+            st.session_state.response_queue.put((user_id, None, False))
+
     def chat_interface(self):
         """Display and manage the chat interface."""
         # Render sidebar and get selected agent
@@ -117,6 +114,7 @@ class BedrockChatApp:
         # Clear conversation history if a new agent is selected
         if st.session_state.previous_agent_key != agent_key:
             st.session_state.conversation_history = {}
+            st.session_state.mcp_conversations = {}
             st.session_state.previous_agent_key = agent_key
 
         # Set app title
@@ -158,19 +156,16 @@ class BedrockChatApp:
                             st.session_state.session_id,
                             agent_name,
                             agent_type,
-                            self.config_manager.config[agent_key]
+                            self.config_manager.config[agent_key],
+                            st.session_state.bypass_tool_cache
                         )
                     )
                     add_script_run_ctx(thread)
                     thread.daemon = True
                     thread.start()
 
-                    # Wait for thread to complete
-                    time.sleep(0.1)  # Small delay for thread to start
-                    while thread.is_alive():
-                        time.sleep(0.1)
-                        if not st.session_state.waiting_for_response:
-                            break
+                    # Block until the request thread finishes; no polling
+                    thread.join()
 
                     status.update(label="Response received!", state="complete", expanded=False)
 
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Idle CPU benchmark for a script run waiting on an in-flight response.
+
+Compares the CPU time burned by the previous wait strategies (the empty-queue spin in
+process_response_queue and the 100 ms is_alive() poll in chat_interface) with the
+blocking queue/join waits that replaced them, while a simulated request takes
+--duration seconds.
+
+Run with: python benchmarks/idle_wait_cpu.py [--duration 2.0]
+"""
+
+import argparse
+import queue
+import threading
+import time
+
+
+def spin_on_queue(worker: threading.Thread, response_queue: queue.Queue, done: threading.Event):
+    """Previous process_response_queue: spin while waiting, no sleep"""
+    while not done.is_set() or not response_queue.empty():
+        if not response_queue.empty():
+            try:
+                while not response_queue.empty():
+                    response_queue.get(block=False)
+            except queue.Empty:
+                pass
+
+
+def poll_thread(worker: threading.Thread, response_queue: queue.Queue, done: threading.Event):
+    """Previous chat_interface: poll is_alive() every 100 ms"""
+    while worker.is_alive():
+        time.sleep(0.1)
+
+
+def block_on_queue(worker: threading.Thread, response_queue: queue.Queue, done: threading.Event):
+    """Current process_response_queue: block until the completion marker"""
+    while response_queue.get() is not None:
+        pass
+
+
+def join_thread(worker: threading.Thread, response_queue: queue.Queue, done: threading.Event):
+    """Current chat_interface: join the request thread"""
+    worker.join()
+
+
+def measure(waiter, duration: float) -> float:
+    """Return the CPU seconds used by the waiting thread during one simulated request"""
+    response_queue = queue.Queue()
+    done = threading.Event()
+
+    def request():
+        time.sleep(duration)
+        done.set()
+        response_queue.put(None)
+
+    worker = threading.Thread(target=request)
+    cpu_time = [0.0]
+
+    def wait():
+        start = time.thread_time()
+        waiter(worker, response_queue, done)
+        cpu_time[0] = time.thread_time() - start
+
+    waiting = threading.Thread(target=wait)
+    worker.start()
+    waiting.start()
+    waiting.join()
+    worker.join()
+    return cpu_time[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--duration", type=float, default=2.0, help="Simulated request duration in seconds")
+    args = parser.parse_args()
+
+    print(f"Simulated request duration: {args.duration:.1f}s")
+    print(f"{'wait strategy':<40}{'CPU seconds':>12}{'CPU %':>8}")
+    for label, waiter in [
+        ("process_response_queue spin (before)", spin_on_queue),
+        ("process_response_queue block (after)", block_on_queue),
+        ("chat_interface poll (before)", poll_thread),
+        ("chat_interface join (after)", join_thread),
+    ]:
+        cpu_seconds = measure(waiter, args.duration)
+        print(f"{label:<40}{cpu_seconds:>12.4f}{cpu_seconds / args.duration * 100:>7.1f}%")
+
+
+if __name__ == "__main__":
+    main()
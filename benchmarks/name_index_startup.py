@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Name index file startup benchmark.
+
+Writes a synthetic directory of --records people (the Zipf-distributed directory of
+name_search.py) as a CSV, builds an index file from it with the name_index.py build
+command, and compares what a freshly spawned name server process pays to get a searchable
+index: building it from the CSV, as any in-process data source must, or memory-mapping the
+prebuilt file. Each way runs in --processes concurrent child processes that open the
+index, run --queries lookups and report their open time, first lookup latency and memory;
+mapped pages are shared between the processes, so their proportional set size (PSS) drops
+as more of them run.
+
+Run with: python benchmarks/name_index_startup.py [--records 1000000] [--processes 4]
+"""
+
+import argparse
+import csv
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+MCP_SERVERS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "mcp_servers")
+sys.path.insert(0, MCP_SERVERS)
+
+from name_search import make_directory  # noqa: E402
+
+CHILD = """
+import json, sys, time
+start = time.perf_counter()
+from name_index import NameIndex, read_csv_names
+mode, path, queries = sys.argv[1], sys.argv[2], json.loads(sys.argv[3])
+index = NameIndex.load(path) if mode == "mapped" else NameIndex.build(read_csv_names(path))
+opened = time.perf_counter()
+index.search(queries[0])
+first = time.perf_counter()
+for query in queries[1:]:
+    index.search(query)
+done = time.perf_counter()
+print(json.dumps({"open": opened - start, "first": first - opened,
+                  "query": (done - first) / max(len(queries) - 1, 1)}), flush=True)
+# Stay alive until told to exit, so the processes' mappings overlap while measured
+sys.stdin.read()
+"""
+
+
+def run_processes(mode: str, path: str, queries: list, processes: int) -> list:
+    """Start concurrent child processes opening the index one way; return their reports"""
+    children = [subprocess.Popen([sys.executable, "-c", CHILD, mode, path, json.dumps(queries)],
+                                 cwd=MCP_SERVERS, stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True)
+                for _ in range(processes)]
+    reports = [json.loads(child.stdout.readline()) for child in children]
+    # Measure memory once every process is up, so shared pages are split between them
+    for child, report in zip(children, reports):
+        try:
+            with open(f"/proc/{child.pid}/smaps_rollup") as file:
+                for line in file:
+                    field, _, value = line.partition(":")
+                    if field in ("Rss", "Pss"):
+                        report[field] = int(value.split()[0]) * 1024
+        except OSError:
+            pass
+        child.communicate("")
+    return reports
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--records", type=int, default=1000000, help="People in the directory")
+    parser.add_argument("--processes", type=int, default=4, help="Concurrent server processes")
+    parser.add_argument("--queries", type=int, default=200, help="Lookups per process")
+    parser.add_argument("--seed", type=int, default=42, help="Seed of the directory and queries")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    directory = make_directory(args.records, rng)
+    queries = [name.split()[-1][:rng.randint(3, 8)] for name in rng.sample(directory, args.queries)]
+
+    with tempfile.TemporaryDirectory() as work:
+        csv_path = os.path.join(work, "names.csv")
+        index_path = os.path.join(work, "names.idx")
+        with open(csv_path, "w", newline="") as file:
+            writer = csv.writer(file)
+            writer.writerow(["given_name", "surname"])
+            writer.writerows(name.rsplit(" ", 1) for name in directory)
+        del directory
+
+        start = time.perf_counter()
+        subprocess.run([sys.executable, os.path.join(MCP_SERVERS, "name_index.py"), csv_path, index_path],
+                       check=True, stdout=subprocess.DEVNULL)
+        print(f"Index file of {args.records:,} names built in {time.perf_counter() - start:.1f}s: "
+              f"{os.path.getsize(index_path) / 2 ** 20:.1f} MB (CSV {os.path.getsize(csv_path) / 2 ** 20:.1f} MB)")
+
+        print(f"{'open':<18}{'open (ms)':>11}{'first (ms)':>12}{'lookup (us)':>13}{'RSS (MB)':>10}"
+              f"{'PSS (MB)':>10}   (median of {args.processes} processes)")
+        for mode, path in (("built", csv_path), ("mapped", index_path)):
+            reports = run_processes(mode, path, queries, args.processes)
+
+            def median(field: str, scale: float) -> str:
+                values = [report[field] for report in reports if field in report]
+                return f"{statistics.median(values) * scale:.1f}" if values else "n/a"
+
+            print(f"{mode + ' from ' + ('CSV' if mode == 'built' else 'file'):<18}{median('open', 1e3):>11}"
+                  f"{median('first', 1e3):>12}{median('query', 1e6):>13}{median('Rss', 2 ** -20):>10}"
+                  f"{median('Pss', 2 ** -20):>10}")
+
+
+if __name__ == "__main__":
+    main()
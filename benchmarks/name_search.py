@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Name search index benchmark.
+
+Builds a NameIndex (mcp_servers/name_index.py) over a synthetic directory of --records
+people, with Zipf-distributed surnames like a real directory, and reports its build time,
+its size next to the same directory held as a dict of name lists, and the latency of
+exact, prefix, typo-tolerant, phonetic and full-name lookups. A linear scan of the
+directory, the only way to match anything but exact surnames before, is timed for
+comparison.
+
+Run with: python benchmarks/name_search.py [--records 1000000] [--queries 2000]
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "mcp_servers"))
+
+from name_index import NameIndex, split_name  # noqa: E402
+
+GIVEN_NAMES = [
+    "James", "Mary", "Robert", "Patricia", "John", "Jennifer", "Michael", "Linda", "David", "Elizabeth",
+    "William", "Barbara", "Richard", "Susan", "Joseph", "Jessica", "Thomas", "Sarah", "Charles", "Karen",
+    "Christopher", "Lisa", "Daniel", "Nancy", "Matthew", "Betty", "Anthony", "Sandra", "Mark", "Margaret",
+    "Donald", "Ashley", "Steven", "Kimberly", "Andrew", "Emily", "Paul", "Donna", "Joshua", "Michelle",
+    "Kenneth", "Carol", "Kevin", "Amanda", "Brian", "Melissa", "George", "Deborah", "Timothy", "Stephanie",
+    "Maria", "Jose", "Ana", "Luis", "Carmen", "Wei", "Li", "Priya", "Arjun", "Fatima", "Omar", "Yuki", "Sven"
+]
+SYLLABLES = [
+    "an", "ber", "car", "den", "el", "fer", "gan", "har", "in", "jo", "kel", "lan", "mar", "nel", "or",
+    "per", "quin", "ros", "san", "ter", "ul", "van", "wes", "yor", "zel", "bro", "chan", "dra", "ek",
+    "fin", "gri", "hol", "ka", "lo", "mi", "no", "pa", "ri", "sto", "tha", "vi", "wil", "ya", "zo"
+]
+SUFFIXES = ["", "", "son", "sen", "ez", "er", "man", "ski", "ton", "ley", "field", "berg", "ova"]
+
+
+def make_directory(records: int, rng: random.Random):
+    """Full names with about one distinct surname per ten people, Zipf-distributed"""
+    surnames = set()
+    while len(surnames) < max(records // 10, 10):
+        surnames.add(("".join(rng.choice(SYLLABLES) for _ in range(rng.randint(1, 3))) +
+                      rng.choice(SUFFIXES)).title())
+    surnames = sorted(surnames)
+    rng.shuffle(surnames)
+    weights = [1 / rank for rank in range(1, len(surnames) + 1)]
+    picked = rng.choices(surnames, weights, k=records)
+    return [f"{rng.choice(GIVEN_NAMES)} {surname}" for surname in picked]
+
+
+def typo(word: str, rng: random.Random) -> str:
+    """Apply one random substitution, insertion, deletion or adjacent transposition"""
+    position = rng.randrange(1, len(word) - 1)
+    letter = rng.choice("abcdefghijklmnopqrstuvwxyz")
+    return rng.choice([
+        word[:position] + letter + word[position + 1:],
+        word[:position] + letter + word[position:],
+        word[:position] + word[position + 1:],
+        word[:position - 1] + word[position] + word[position - 1] + word[position + 1:],
+    ])
+
+
+def sound_alike(word: str, rng: random.Random) -> str:
+    """Swap one vowel for another, which keeps the Soundex code"""
+    vowels = [position for position, ch in enumerate(word) if ch in "aeiou" and position > 0]
+    if not vowels:
+        return word
+    position = rng.choice(vowels)
+    return word[:position] + rng.choice([v for v in "aeiouy" if v != word[position]]) + word[position + 1:]
+
+
+def latency(function, queries) -> tuple:
+    """Return median and 95th percentile microseconds and the share of queries with results"""
+    timings, hits = [], 0
+    for query in queries:
+        start = time.perf_counter()
+        hits += bool(function(query))
+        timings.append((time.perf_counter() - start) * 1e6)
+    timings.sort()
+    return statistics.median(timings), timings[int(len(timings) * 0.95)], hits / len(queries)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--records", type=int, default=1000000, help="People in the directory")
+    parser.add_argument("--queries", type=int, default=2000, help="Queries per lookup kind")
+    parser.add_argument("--seed", type=int, default=42, help="Seed of the directory and queries")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    directory = make_directory(args.records, rng)
+
+    # The directory as a dict of name lists, like NAMES_DB, with its own copy of every name
+    tracemalloc.start()
+    by_surname = {}
+    for name in directory:
+        by_surname.setdefault(split_name(name)[0], []).append(name.encode().decode())
+    dict_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del by_surname
+
+    start = time.perf_counter()
+    index = NameIndex.build(directory)
+    build_seconds = time.perf_counter() - start
+    print(f"Directory: {len(index):,} people, {len(index.surnames):,} surnames; index built in {build_seconds:.1f}s")
+    print(f"Size: index {index.nbytes() / 2 ** 20:.1f} MB, dict of name lists {dict_bytes / 2 ** 20:.1f} MB")
+
+    population = [split_name(name) for name in rng.sample(directory, args.queries)]
+    long_surnames = [surname for surname, _ in population if len(surname) >= 6] or [population[0][0]]
+    kinds = [
+        ("exact surname", lambda q: index.search(q, "exact"), [surname for surname, _ in population]),
+        ("surname prefix", lambda q: index.search(q, "prefix"), [surname[:3] for surname, _ in population]),
+        ("surname typo", lambda q: index.search(q, "fuzzy"), [typo(s, rng) for s in long_surnames]),
+        ("sounds alike", lambda q: index.search(q, "phonetic"), [sound_alike(s, rng) for s, _ in population]),
+        ("given + surname", lambda q: index.search(q), [f"{given[:3]} {surname}" for surname, given in population]),
+        ("auto, with typo", lambda q: index.search(q), [typo(s, rng) for s in long_surnames]),
+    ]
+
+    print(f"{'lookup':<18}{'median (us)':>13}{'p95 (us)':>11}{'hits':>7}")
+    for label, function, queries in kinds:
+        median, p95, hits = latency(function, queries)
+        print(f"{label:<18}{median:>13.1f}{p95:>11.1f}{hits:>7.0%}")
+
+    scan_queries = [surname for surname, _ in population[:5]]
+    median, _, _ = latency(lambda q: [name for name in directory if split_name(name)[0] == q], scan_queries)
+    print(f"{'linear scan':<18}{median:>13.1f}{'':>11}   (exact surname, for comparison)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Scan summary aggregation benchmark.
+
+Compares the per-statistic list comprehensions previously used to build the Fortify and
+Nexus summaries (severity counts, category_breakdown, license_summary and the other
+counts) with the single-pass aggregate_findings in mcp_servers/scan_aggregator.py, on
+--findings synthetic findings, and checks that both produce the same numbers.
+
+Run with: python benchmarks/scan_aggregation.py [--findings 100000] [--repeat 3]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "mcp_servers"))
+
+from scan_aggregator import aggregate_findings, severity_counts  # noqa: E402
+
+SEVERITIES = ["Critical", "High", "Medium", "Low", "Info"]
+CATEGORIES = [f"Category {index}" for index in range(40)]
+LICENSES = ["Apache-2.0", "MIT", "GPL-3.0", "BSD-3-Clause", "ISC", "LGPL-2.1", "MPL-2.0", "Unlicense", "EPL-1.0"]
+
+
+def make_vulnerabilities(count: int, rng: random.Random):
+    return [{"severity": rng.choice(SEVERITIES), "category": rng.choice(CATEGORIES)} for _ in range(count)]
+
+
+def make_components(count: int, rng: random.Random):
+    components = []
+    for _ in range(count):
+        vulnerabilities = [{"severity": rng.choice(SEVERITIES), "cvss_score": round(rng.uniform(1, 10), 1)}
+                           for _ in range(rng.randint(0, 5))]
+        components.append({
+            "license": rng.choice(LICENSES),
+            "license_threat_level": rng.choice(["None", "Low", "Medium", "High"]),
+            "age_months": rng.randint(1, 60),
+            "vulnerabilities": vulnerabilities,
+            "vulnerability_count": len(vulnerabilities),
+            "highest_cvss": max(v["cvss_score"] for v in vulnerabilities) if vulnerabilities else 0
+        })
+    return components
+
+
+def fortify_before(vulnerabilities):
+    """Previous vulnerability_counts and category_breakdown"""
+    return {
+        "vulnerability_counts": {
+            "total": len(vulnerabilities),
+            "critical": len([v for v in vulnerabilities if v["severity"] == "Critical"]),
+            "high": len([v for v in vulnerabilities if v["severity"] == "High"]),
+            "medium": len([v for v in vulnerabilities if v["severity"] == "Medium"]),
+            "low": len([v for v in vulnerabilities if v["severity"] == "Low"]),
+            "info": len([v for v in vulnerabilities if v["severity"] == "Info"])
+        },
+        "category_breakdown": {
+            category: len([v for v in vulnerabilities if v["category"] == category])
+            for category in set(v["category"] for v in vulnerabilities)
+        }
+    }
+
+
+def fortify_after(vulnerabilities):
+    stats = aggregate_findings(vulnerabilities, group_by=["category"])
+    return {
+        "vulnerability_counts": severity_counts(stats["total"], stats["severity"]),
+        "category_breakdown": stats["groups"]["category"]
+    }
+
+
+def nexus_before(components):
+    """Previous Nexus summary, legacy_components and license_summary"""
+    return {
+        "total_components": len(components),
+        "components_with_vulnerabilities": len([c for c in components if c["vulnerability_count"] > 0]),
+        "total_vulnerabilities": sum(c["vulnerability_count"] for c in components),
+        "critical_vulnerabilities": len(
+            [c for comp in components for c in comp["vulnerabilities"] if c["severity"] == "Critical"]),
+        "high_vulnerabilities": len(
+            [c for comp in components for c in comp["vulnerabilities"] if c["severity"] == "High"]),
+        "license_issues": len([c for c in components if c["license_threat_level"] in ["Medium", "High"]]),
+        "legacy_components": len([c for c in components if c["age_months"] > 24]),
+        "license_summary": {
+            license: len([c for c in components if c["license"] == license])
+            for license in set(c["license"] for c in components)
+        }
+    }
+
+
+def nexus_after(components):
+    stats = aggregate_findings(
+        components,
+        group_by=["license"],
+        conditions={
+            "with_vulnerabilities": ("vulnerability_count", lambda count: count > 0),
+            "license_issues": ("license_threat_level", lambda level: level in ("Medium", "High")),
+            "legacy": ("age_months", lambda age: age > 24)
+        },
+        max_fields=["highest_cvss"],
+        nested_key="vulnerabilities",
+        severity_field=None
+    )
+    return {
+        "total_components": stats["total"],
+        "components_with_vulnerabilities": stats["matches"]["with_vulnerabilities"],
+        "total_vulnerabilities": stats["nested_total"],
+        "critical_vulnerabilities": stats["nested_severity"]["critical"],
+        "high_vulnerabilities": stats["nested_severity"]["high"],
+        "license_issues": stats["matches"]["license_issues"],
+        "legacy_components": stats["matches"]["legacy"],
+        "license_summary": stats["groups"]["license"]
+    }
+
+
+def best_time(function, data, repeat: int) -> float:
+    """Return the fastest of repeat runs, in seconds"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(data)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--findings", type=int, default=100000, help="Fortify vulnerabilities and Nexus components")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement; the fastest is reported")
+    parser.add_argument("--seed", type=int, default=42, help="Seed of the synthetic findings")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    vulnerabilities = make_vulnerabilities(args.findings, rng)
+    components = make_components(args.findings, rng)
+
+    print(f"Findings: {args.findings:,} Fortify vulnerabilities ({len(CATEGORIES)} categories), "
+          f"{args.findings:,} Nexus components")
+    print(f"{'summary':<12}{'before (s)':>12}{'after (s)':>12}{'speedup':>10}")
+    for label, before, after, data in [
+        ("fortify", fortify_before, fortify_after, vulnerabilities),
+        ("nexus", nexus_before, nexus_after, components),
+    ]:
+        if before(data) != after(data):
+            raise SystemExit(f"{label}: single-pass aggregation does not match the previous summary")
+        before_seconds = best_time(before, data, args.repeat)
+        after_seconds = best_time(after, data, args.repeat)
+        print(f"{label:<12}{before_seconds:>12.4f}{after_seconds:>12.4f}{before_seconds / after_seconds:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Scan result store query benchmark.
+
+Fills a temporary ScanResultStore (mcp_servers/scan_store.py) with --scans generated
+scans per tool of --projects projects, then times the historical queries the store tools
+answer: filtered counts, grouped counts and filtered listings, on the latest scans and
+over the whole history.
+
+Run with: python benchmarks/scan_store_queries.py [--projects 200] [--scans 3] [--scale 10]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "mcp_servers"))
+
+from scan_data_generator import ScanDataGenerator  # noqa: E402
+from scan_store import SUMMARY_SECTIONS, ScanResultStore  # noqa: E402
+
+QUERIES = [
+    ("critical CWE-89, latest", "count", {"group_by": ["project"], "cwe_id": 89, "min_severity": "Critical"}),
+    ("critical CWE-89, history", "count", {"group_by": ["project"], "cwe_id": 89, "min_severity": "Critical",
+                                           "latest_only": False}),
+    ("project by tool+severity", "count", {"group_by": ["tool", "severity"], "project": "project-00007"}),
+    ("file path prefix", "query", {"file_path": "src/main/java/com/example/web/", "min_severity": "High"}),
+    ("package prefix", "count", {"group_by": ["package"], "package": "lodash"}),
+    ("all critical by project", "count", {"group_by": ["project"], "min_severity": "Critical"}),
+    ("high+ nexus listing", "query", {"tool": "nexus", "min_severity": "High"}),
+]
+
+
+def populate(store: ScanResultStore, projects: int, scans: int, scale: float) -> float:
+    """Store generated scans; return the seconds taken"""
+    start = time.perf_counter()
+    for scan in range(scans):
+        generator = ScanDataGenerator(scan, scale, churn=0.1)
+        for index in range(projects):
+            project = f"project-{index:05d}"
+            for tool in SUMMARY_SECTIONS:
+                store.record(tool, project, getattr(generator, f"{tool}_scan_results")(project))
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--projects", type=int, default=200, help="Projects with stored scans")
+    parser.add_argument("--scans", type=int, default=3, help="Scans per project and tool")
+    parser.add_argument("--scale", type=float, default=10, help="Multiplier of the findings per scan")
+    parser.add_argument("--repeat", type=int, default=20, help="Runs per query; the median is reported")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        store = ScanResultStore(os.path.join(directory, "scan_results.db"))
+        seconds = populate(store, args.projects, args.scans, args.scale)
+        total = store.count(group_by=[], latest_only=False)["total"]
+        print(f"Stored {total:,} findings of {args.projects * args.scans * len(SUMMARY_SECTIONS):,} scans "
+              f"in {seconds:.1f}s")
+
+        # Look up a CVE that occurs in the generated scans
+        cve_ids = store.count(group_by=["cve_id"], tool="nexus", latest_only=False)["groups"]
+        cve_id = next(group["cve_id"] for group in cve_ids if group["cve_id"])
+        queries = [*QUERIES, ("one CVE, history", "query", {"cve_id": cve_id, "latest_only": False})]
+
+        print(f"{'query':<28}{'kind':>6}{'matching':>10}{'median (ms)':>13}")
+        for label, kind, filters in queries:
+            timings = []
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                result = getattr(store, kind)(**filters)
+                timings.append((time.perf_counter() - start) * 1000)
+            matching = result["matching"] if kind == "query" else result["total"]
+            print(f"{label:<28}{kind:>6}{matching:>10,}{statistics.median(timings):>13.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,553 @@
+#!/usr/bin/env python3
+"""
+Search index over a directory of full names.
+
+Names are kept sorted by (surname, given names) in one UTF-8 blob with an array of
+offsets, so a million names take tens of megabytes rather than a Python object each.
+Distinct surnames are kept sorted the same way, each with the range of names that carry
+it, and every lookup starts from them:
+
+- exact and prefix matches are binary searches over the sorted surnames
+- typo-tolerant matches look up the single-character deletions of the query in a sorted
+  table of hashed deletions of every surname (a deletion neighbourhood), which finds every
+  surname within one edit, adjacent transpositions included, and most within two, in a
+  few dozen binary searches; candidates are confirmed with the true edit distance
+- phonetic matches look up the Soundex code of the query in a sorted table of codes
+
+Given names in a full-name query ("john smi", "Smith, Jo") narrow each matched surname's
+range of names by prefix, again by binary search. No lookup scans the directory.
+
+An index can be saved to a file holding its tables back to back and loaded by memory-mapping
+that file: loading reads only the header, whatever the directory's size, lookups page in the
+parts of the tables they touch, and every process mapping the file shares the same pages.
+
+Build an index file from a CSV of names with:
+    python mcp_servers/name_index.py names.csv names.idx
+"""
+
+import argparse
+import csv
+import itertools
+import mmap
+import os
+import struct
+import sys
+import time
+import unicodedata
+import zlib
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+MATCH_MODES = ("auto", "exact", "prefix", "fuzzy", "phonetic")
+
+# Matched surnames whose names are looked at per match kind, bounding lookups whose given
+# names match few of them
+MAX_SURNAMES_PER_STAGE = 200
+
+# Upper bound of every string starting with a prefix
+PREFIX_END = "\U0010ffff"
+
+# Index file layout: header, then a table of (offset, length) of each section, then the
+# sections, each aligned to 8 bytes. Arrays are stored in native byte order and item size,
+# so the header records both, itself in native byte order
+FILE_MAGIC = b"NAMEIDX\0"
+FILE_VERSION = 1
+FILE_HEADER = struct.Struct("=8sIII")
+FILE_SECTION = struct.Struct("<QQ")
+FILE_SECTIONS = ("names", "name_offsets", "surnames", "surname_offsets", "surname_starts", "deletion_hashes",
+                 "deletion_surnames", "phonetic_codes", "phonetic_surnames")
+BYTE_ORDER_MARK = 0x01020304
+
+# Columns holding the full name, or its parts in order, tried in turn when reading a CSV
+CSV_NAME_COLUMNS = (("name",), ("full_name",), ("given_name", "surname"), ("first_name", "last_name"))
+
+SOUNDEX_CODES = {
+    **dict.fromkeys("bfpv", "1"), **dict.fromkeys("cgjkqsxz", "2"), **dict.fromkeys("dt", "3"),
+    "l": "4", **dict.fromkeys("mn", "5"), "r": "6"
+}
+
+
+def normalize(text: str) -> str:
+    """Case-fold a name and strip accents and punctuation, keeping the words"""
+    if text.isascii():
+        # Fast path for the common case; binary searches normalize names on every comparison
+        words = text.lower().replace("-", " ").split()
+        if all(word.isalnum() for word in words):
+            return " ".join(words)
+    decomposed = unicodedata.normalize("NFKD", text.casefold())
+    return " ".join("".join(ch for ch in word if ch.isalnum())
+                    for word in decomposed.replace("-", " ").split() if any(ch.isalnum() for ch in word))
+
+
+def split_name(full_name: str) -> Tuple[str, str]:
+    """Split a full name into its normalized (surname, given names)"""
+    words = normalize(full_name).split()
+    if not words:
+        return "", ""
+    return words[-1], " ".join(words[:-1])
+
+
+def soundex(word: str) -> str:
+    """American Soundex code of a normalized word, e.g. "R163" for robert and rupert"""
+    letters = [ch for ch in word if "a" <= ch <= "z"]
+    if not letters:
+        return ""
+    code, previous = letters[0].upper(), SOUNDEX_CODES.get(letters[0], "")
+    for ch in letters[1:]:
+        digit = SOUNDEX_CODES.get(ch, "")
+        if digit and digit != previous:
+            code += digit
+            if len(code) == 4:
+                break
+        # h and w do not separate letters with the same code; vowels do
+        if ch not in "hw":
+            previous = digit
+    return code.ljust(4, "0")
+
+
+def _soundex_number(code: str) -> int:
+    return (ord(code[0]) - ord("A")) * 1000 + int(code[1:])
+
+
+def _align(offset: int) -> int:
+    return (offset + 7) & ~7
+
+
+def _hash(word: str) -> int:
+    return zlib.crc32(word.encode())
+
+
+def deletions(word: str, depth: int = 1) -> set:
+    """The word and every word made by deleting up to depth characters from it"""
+    words = {word}
+    frontier = {word}
+    for _ in range(depth):
+        frontier = {w[:i] + w[i + 1:] for w in frontier for i in range(len(w))}
+        words |= frontier
+    return words
+
+
+def edit_distance(a: str, b: str, max_distance: int) -> int:
+    """
+    Edit distance counting adjacent transpositions as one edit (optimal string alignment).
+
+    Returns max_distance + 1, as soon as it is known, for any distance above max_distance.
+    """
+    if abs(len(a) - len(b)) > max_distance:
+        return max_distance + 1
+    # A typo leaves most of a name intact; only the differing middle needs the full table
+    start = 0
+    while start < len(a) and start < len(b) and a[start] == b[start]:
+        start += 1
+    end_a, end_b = len(a), len(b)
+    while end_a > start and end_b > start and a[end_a - 1] == b[end_b - 1]:
+        end_a -= 1
+        end_b -= 1
+    a, b = a[start:end_a], b[start:end_b]
+    if not a or not b:
+        return min(len(a) + len(b), max_distance + 1)
+
+    previous2: List[int] = []
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i]
+        row_min = i
+        for j in range(1, len(b) + 1):
+            cost = previous[j - 1] + (a[i - 1] != b[j - 1])
+            if previous[j] + 1 < cost:
+                cost = previous[j] + 1
+            if current[j - 1] + 1 < cost:
+                cost = current[j - 1] + 1
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1] and previous2[j - 2] + 1 < cost:
+                cost = previous2[j - 2] + 1
+            current.append(cost)
+            if cost < row_min:
+                row_min = cost
+        if row_min > max_distance:
+            return max_distance + 1
+        previous2, previous = previous, current
+    return min(previous[-1], max_distance + 1)
+
+
+class StringTable(Sequence[str]):
+    """Read-only sequence of strings stored as one UTF-8 blob and an array of offsets"""
+
+    def __init__(self, blob: bytes, offsets: Sequence[int]):
+        self.blob = blob
+        self.offsets = offsets
+
+    @classmethod
+    def from_strings(cls, strings: Iterable[str]) -> "StringTable":
+        blob = bytearray()
+        offsets = array("I", [0])
+        for string in strings:
+            blob += string.encode()
+            offsets.append(len(blob))
+        return cls(bytes(blob), offsets)
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        return bytes(self.blob[self.offsets[index]:self.offsets[index + 1]]).decode()
+
+    def nbytes(self) -> int:
+        return len(self.blob) + len(self.offsets) * 4
+
+
+class NameIndex:
+    """Exact, prefix, typo-tolerant and phonetic search over full names"""
+
+    def __init__(self, names: StringTable, surnames: StringTable, surname_starts: Sequence[int],
+                 deletion_hashes: Sequence[int], deletion_surnames: Sequence[int],
+                 phonetic_codes: Sequence[int], phonetic_surnames: Sequence[int]):
+        """
+        Initialize the index from its tables; use build to create one from names.
+
+        Args:
+            names: Full names sorted by (surname, given names)
+            surnames: Distinct normalized surnames, sorted
+            surname_starts: Index of the first name of each surname, plus the number of names
+            deletion_hashes: Sorted hashes of every surname and its single-character deletions
+            deletion_surnames: Surname of each deletion hash
+            phonetic_codes: Sorted Soundex codes (as numbers) of the surnames
+            phonetic_surnames: Surname of each phonetic code
+        """
+        self.names = names
+        self.surnames = surnames
+        self.surname_starts = surname_starts
+        self.deletion_hashes = deletion_hashes
+        self.deletion_surnames = deletion_surnames
+        self.phonetic_codes = phonetic_codes
+        self.phonetic_surnames = phonetic_surnames
+        # File mapping backing the tables of a loaded index
+        self.mapping: Optional[mmap.mmap] = None
+
+    @classmethod
+    def build(cls, names: Iterable[str]) -> "NameIndex":
+        """
+        Build an index of full names ("Given Names Surname").
+
+        Args:
+            names: Full names; names without letters are skipped
+
+        Returns:
+            NameIndex: The index
+        """
+        entries = sorted((*split_name(name), name.strip()) for name in names)
+        entries = [entry for entry in entries if entry[0]]
+
+        surnames: List[str] = []
+        surname_starts = array("I")
+        for position, (surname, _, _) in enumerate(entries):
+            if not surnames or surnames[-1] != surname:
+                surnames.append(surname)
+                surname_starts.append(position)
+        surname_starts.append(len(entries))
+
+        deletion_pairs = sorted((_hash(word), surname_id) for surname_id, surname in enumerate(surnames)
+                                for word in deletions(surname))
+        phonetic_pairs = sorted((_soundex_number(soundex(surname)), surname_id)
+                                for surname_id, surname in enumerate(surnames) if soundex(surname))
+
+        return cls(
+            names=StringTable.from_strings(name for _, _, name in entries),
+            surnames=StringTable.from_strings(surnames),
+            surname_starts=surname_starts,
+            deletion_hashes=array("I", (pair[0] for pair in deletion_pairs)),
+            deletion_surnames=array("I", (pair[1] for pair in deletion_pairs)),
+            phonetic_codes=array("I", (pair[0] for pair in phonetic_pairs)),
+            phonetic_surnames=array("I", (pair[1] for pair in phonetic_pairs))
+        )
+
+    @classmethod
+    def load(cls, path: str) -> "NameIndex":
+        """
+        Load an index saved with save by memory-mapping its file.
+
+        Only the header is read; the tables are views of the mapping, paged in by the
+        lookups that touch them. Replacing the file (save does so atomically) does not
+        affect indexes already loaded from it.
+
+        Args:
+            path: Index file
+
+        Returns:
+            NameIndex: The index, backed by the file
+        """
+        with open(path, "rb") as file:
+            if os.fstat(file.fileno()).st_size < FILE_HEADER.size + FILE_SECTION.size * len(FILE_SECTIONS):
+                raise ValueError(f"{path} is not a name index file")
+            mapping = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(mapping)
+        magic, version, byte_order, itemsize = FILE_HEADER.unpack_from(view)
+        if magic != FILE_MAGIC:
+            raise ValueError(f"{path} is not a name index file")
+        if byte_order != BYTE_ORDER_MARK or itemsize != array("I").itemsize or version != FILE_VERSION:
+            raise ValueError(f"{path} was built by another version or on another platform; rebuild it")
+
+        sections = {}
+        for number, section in enumerate(FILE_SECTIONS):
+            offset, length = FILE_SECTION.unpack_from(view, FILE_HEADER.size + number * FILE_SECTION.size)
+            if offset + length > len(view):
+                raise ValueError(f"{path} is truncated; rebuild it")
+            sections[section] = view[offset:offset + length]
+        arrays = {section: sections[section].cast("I") for section in FILE_SECTIONS
+                  if section not in ("names", "surnames")}
+
+        index = cls(
+            names=StringTable(sections["names"], arrays["name_offsets"]),
+            surnames=StringTable(sections["surnames"], arrays["surname_offsets"]),
+            surname_starts=arrays["surname_starts"],
+            deletion_hashes=arrays["deletion_hashes"],
+            deletion_surnames=arrays["deletion_surnames"],
+            phonetic_codes=arrays["phonetic_codes"],
+            phonetic_surnames=arrays["phonetic_surnames"]
+        )
+        index.mapping = mapping
+        return index
+
+    def save(self, path: str):
+        """
+        Save the index to a file for load, replacing any earlier file atomically.
+
+        Args:
+            path: Index file
+        """
+        tables = [self.names.blob, self.names.offsets, self.surnames.blob, self.surnames.offsets,
+                  self.surname_starts, self.deletion_hashes, self.deletion_surnames,
+                  self.phonetic_codes, self.phonetic_surnames]
+        buffers = [memoryview(table).cast("B") for table in tables]
+
+        header = bytearray(FILE_HEADER.pack(FILE_MAGIC, FILE_VERSION, BYTE_ORDER_MARK, array("I").itemsize))
+        offset = _align(FILE_HEADER.size + FILE_SECTION.size * len(buffers))
+        for buffer in buffers:
+            header += FILE_SECTION.pack(offset, len(buffer))
+            offset = _align(offset + len(buffer))
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        temporary = f"{path}.{os.getpid()}.tmp"
+        try:
+            with open(temporary, "wb") as file:
+                file.write(header)
+                for buffer in buffers:
+                    file.write(b"\0" * (_align(file.tell()) - file.tell()))
+                    file.write(buffer)
+            # Processes holding the old file mapped keep reading it until they reload
+            os.replace(temporary, path)
+        finally:
+            if os.path.exists(temporary):
+                os.remove(temporary)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def nbytes(self) -> int:
+        """Bytes held by the index tables"""
+        return self.names.nbytes() + self.surnames.nbytes() + 4 * sum(
+            len(table) for table in (self.surname_starts, self.deletion_hashes, self.deletion_surnames,
+                                     self.phonetic_codes, self.phonetic_surnames))
+
+    def surname_count(self, surname_id: int) -> int:
+        """Number of names carrying a surname"""
+        return self.surname_starts[surname_id + 1] - self.surname_starts[surname_id]
+
+    def count_for_surname(self, surname: str) -> int:
+        """Number of names with exactly this surname, ignoring case and accents"""
+        surname_id = self._find_surname(split_name(surname)[0])
+        return 0 if surname_id is None else self.surname_count(surname_id)
+
+    def names_for_surname(self, surname: str, limit: Optional[int] = None) -> List[str]:
+        """
+        Names with exactly this surname, ignoring case and accents.
+
+        Args:
+            surname: Surname to look up
+            limit: Maximum names returned; all if None
+
+        Returns:
+            List of full names, sorted by given names
+        """
+        surname_id = self._find_surname(split_name(surname)[0])
+        if surname_id is None:
+            return []
+        start, end = self.surname_starts[surname_id], self.surname_starts[surname_id + 1]
+        return self.names[start:end if limit is None else min(end, start + limit)]
+
+    def search(self, query: str, mode: str = "auto", limit: int = 20, max_distance: int = 2) -> List[Dict[str, Any]]:
+        """
+        Search names by surname, optionally narrowed by given names.
+
+        The last word of the query is the surname ("john smi"), or the part before a comma
+        ("Smith, Jo"); the other words match the start of the given names.
+
+        Args:
+            query: Surname or full name to search for
+            mode: "exact", "prefix", "fuzzy" (typos), "phonetic" (sounds alike), or "auto" for
+                the first of these, in that order, that finds any names
+            limit: Maximum names returned
+            max_distance: Edits a fuzzy surname match may differ by; surnames shorter than six
+                letters allow one edit, shorter than three none
+
+        Returns:
+            List of matches, best first, each with the name, how its surname matched and, for
+            fuzzy matches, the edit distance
+        """
+        if mode not in MATCH_MODES:
+            raise ValueError(f"mode must be one of {', '.join(MATCH_MODES)}")
+        if "," in query:
+            surname_part, _, given_part = query.partition(",")
+            surname, given = split_name(surname_part)[0], normalize(given_part)
+        else:
+            surname, given = split_name(query)
+        if not surname:
+            return []
+
+        stages = {
+            "exact": lambda: self._exact(surname),
+            "prefix": lambda: self._prefix(surname),
+            "fuzzy": lambda: self._fuzzy(surname, max_distance),
+            "phonetic": lambda: self._phonetic(surname),
+        }
+        matches: List[Dict[str, Any]] = []
+        seen = set()
+        for stage in (stages if mode == "auto" else [mode]):
+            # Each kind of match is only looked for when the previous ones found nothing
+            if matches:
+                break
+            for surname_id, match in itertools.islice(stages[stage](), MAX_SURNAMES_PER_STAGE):
+                if surname_id in seen:
+                    continue
+                seen.add(surname_id)
+                for name in self._names_with_given(surname_id, given, limit - len(matches)):
+                    matches.append({"name": name, **match})
+                if len(matches) >= limit:
+                    return matches
+        return matches
+
+    def suggest_surnames(self, surname: str, limit: int = 5) -> List[str]:
+        """Surnames close to a surname in spelling or sound, most common first"""
+        key = split_name(surname)[0]
+        candidates = [surname_id for surname_id, _ in self._fuzzy(key, 2)]
+        candidates += [surname_id for surname_id, _ in self._phonetic(key) if surname_id not in candidates]
+        return [self.surnames[surname_id] for surname_id in candidates[:limit]]
+
+    def _find_surname(self, surname: str) -> Optional[int]:
+        position = bisect_left(self.surnames, surname)
+        if position < len(self.surnames) and self.surnames[position] == surname:
+            return position
+        return None
+
+    def _names_with_given(self, surname_id: int, given: str, limit: int) -> List[str]:
+        start, end = self.surname_starts[surname_id], self.surname_starts[surname_id + 1]
+        if given:
+            # Names of a surname are sorted by given names, so a given-name prefix is a range
+            def given_key(name: str) -> str:
+                return split_name(name)[1]
+
+            start = bisect_left(self.names, given, start, end, key=given_key)
+            end = bisect_right(self.names, given + PREFIX_END, start, end, key=given_key)
+        return self.names[start:min(end, start + limit)]
+
+    def _exact(self, surname: str) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        surname_id = self._find_surname(surname)
+        if surname_id is not None:
+            yield surname_id, {"match": "exact"}
+
+    def _prefix(self, surname: str) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        start = bisect_left(self.surnames, surname)
+        end = bisect_left(self.surnames, surname + PREFIX_END, start)
+        for surname_id in range(start, end):
+            yield surname_id, {"match": "prefix"}
+
+    def _fuzzy(self, surname: str, max_distance: int) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        # Short surnames are within a couple of edits of too many others
+        max_distance = min(max_distance, 0 if len(surname) < 3 else 1 if len(surname) < 6 else 2)
+        candidates = set()
+        for word in deletions(surname, min(max_distance, 2)):
+            word_hash = _hash(word)
+            position = bisect_left(self.deletion_hashes, word_hash)
+            while position < len(self.deletion_hashes) and self.deletion_hashes[position] == word_hash:
+                candidates.add(self.deletion_surnames[position])
+                position += 1
+
+        matches = []
+        for surname_id in candidates:
+            distance = edit_distance(surname, self.surnames[surname_id], max_distance)
+            if distance <= max_distance:
+                matches.append((distance, -self.surname_count(surname_id), surname_id))
+        for distance, _, surname_id in sorted(matches):
+            yield surname_id, {"match": "fuzzy", "distance": distance}
+
+    def _phonetic(self, surname: str) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        code = soundex(surname)
+        if not code:
+            return
+        number = _soundex_number(code)
+        start = bisect_left(self.phonetic_codes, number)
+        end = bisect_right(self.phonetic_codes, number, start)
+        # Codes are coarse; prefer surnames of about the query's length, then common ones
+        offsets = self.surnames.offsets
+        length = len(surname.encode())
+        ranked = sorted((abs(offsets[surname_id + 1] - offsets[surname_id] - length), -self.surname_count(surname_id),
+                         surname_id) for surname_id in self.phonetic_surnames[start:end])
+        for _, _, surname_id in ranked:
+            yield surname_id, {"match": "phonetic"}
+
+
+def read_csv_names(path: str, columns: Optional[Sequence[str]] = None) -> Iterator[str]:
+    """
+    Read full names from a CSV file with a header row.
+
+    Args:
+        path: CSV file
+        columns: Column holding the full name, or columns holding its parts in order (e.g.
+            given name and surname); the first of CSV_NAME_COLUMNS present if None
+
+    Returns:
+        Iterator of full names
+    """
+    with open(path, newline="", encoding="utf-8-sig") as file:
+        reader = csv.DictReader(file)
+        fields = {field.strip().lower(): field for field in reader.fieldnames or []}
+        if columns is None:
+            columns = next((candidate for candidate in CSV_NAME_COLUMNS
+                            if all(column in fields for column in candidate)), None)
+            if columns is None:
+                raise ValueError(f"{path} has none of the name columns "
+                                 f"{', '.join('+'.join(candidate) for candidate in CSV_NAME_COLUMNS)}; "
+                                 f"choose them with --columns")
+        missing = [column for column in columns if column.strip().lower() not in fields]
+        if missing:
+            raise ValueError(f"{path} has no column {', '.join(missing)}")
+        keys = [fields[column.strip().lower()] for column in columns]
+        for row in reader:
+            yield " ".join(row[key].strip() for key in keys if row.get(key))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("csv", help="CSV file of names with a header row")
+    parser.add_argument("index", help="Index file to write; point NAMES_INDEX_PATH at it to serve it")
+    parser.add_argument("--columns", nargs="+", default=None,
+                        help="Column of the full name, or columns of its parts in order, e.g. given_name surname")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    try:
+        index = NameIndex.build(read_csv_names(args.csv, args.columns))
+    except ValueError as e:
+        sys.exit(str(e))
+    index.save(args.index)
+    print(f"{args.index}: {len(index):,} names, {len(index.surnames):,} surnames, "
+          f"{os.path.getsize(args.index) / 2 ** 20:.1f} MB, built in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,6 +5,8 @@ Run with: python name_lookup_server.py
 """
 
 import logging
+import os
+from typing import Any, Dict, List, Optional
 
 import nest_asyncio  # Added import
 
@@ -12,6 +14,8 @@ nest_asyncio.apply()  # Added call
 
 from fastmcp import FastMCP
 
+from name_index import MATCH_MODES, NameIndex
+
 # from pydantic import BaseModel # Removed unused import
 
 # Configure logging
@@ -36,18 +40,82 @@ NAMES_DB = {
 }
 
 
+# Name formats supported by the formatting tools
+FORMATTERS = {
+    "upper": str.upper,
+    "lower": str.lower,
+    "title": str.title
+}
+
+# Maximum items a batch tool accepts in one call
+MAX_BATCH_SIZE = 500
+
+
+
+def load_name_index() -> NameIndex:
+    """
+    Open the name index file at NAMES_INDEX_PATH, built from a CSV with name_index.py;
+    the mock database is indexed when it is unset.
+    """
+    path = os.environ.get("NAMES_INDEX_PATH")
+    if not path:
+        return NameIndex.build(name for names in NAMES_DB.values() for name in names)
+    # Memory-mapped, so opening takes the same time for any directory size
+    index = NameIndex.load(path)
+    logger.info(f"Opened name index {path}: {len(index):,} names, {len(index.surnames):,} surnames")
+    return index
+
+
+# Search index over every name in the database
+name_index = load_name_index()
+
+
 @mcp.tool()
-async def get_names_by_surname(surname: str) -> str:
-    """Get a list of common names for a given surname"""
+async def get_names_by_surname(surname: str, limit: int = 50) -> str:
+    """
+    Get a list of common names for a given surname.
+
+    Args:
+        surname: Surname to look up
+        limit: Maximum names to return; the total found is always reported
+    """
     logger.info(f"Looking up names for surname: {surname}")
 
-    surname_lower = surname.lower()
-    names = NAMES_DB.get(surname_lower, [])
+    names = name_index.names_for_surname(surname, max(limit, 1))
 
     if not names:
-        return f"No names found for surname '{surname}'"
+        suggestions = name_index.suggest_surnames(surname)
+        hint = f"; did you mean {', '.join(s.title() for s in suggestions)}?" if suggestions else ""
+        return f"No names found for surname '{surname}'{hint}"
 
-    return f"Found {len(names)} names for '{surname}': {', '.join(names)}"
+    total = name_index.count_for_surname(surname)
+    shown = f", showing the first {len(names)}" if total > len(names) else ""
+    return f"Found {total} names for '{surname}'{shown}: {', '.join(names)}"
+
+
+@mcp.tool()
+async def search_names(query: str, mode: str = "auto", limit: int = 20) -> str:
+    """
+    Search names by surname or full name, tolerating typos and alternative spellings.
+
+    Args:
+        query: Surname, surname prefix or full name, e.g. "smi", "Jon Smyth" or "Smith, J"
+        mode: auto (exact, else prefix, else typo-tolerant, else sounds-alike matches),
+            exact, prefix, fuzzy or phonetic
+        limit: Maximum names to return
+    """
+    logger.info(f"Searching names for: {query} ({mode})")
+
+    if mode not in MATCH_MODES:
+        return f"Unknown search mode: {mode}"
+
+    matches = name_index.search(query, mode, limit)
+
+    if not matches:
+        return f"No names found matching '{query}'"
+
+    return (f"Found {len(matches)} names matching '{query}' ({matches[0]['match']} match): "
+            f"{', '.join(match['name'] for match in matches)}")
 
 
 @mcp.tool()
@@ -72,17 +140,129 @@ async def format_names(names: str, format_type: str = "upper") -> str:
 
     name_list = [name.strip() for name in names.split(',')]
 
-    if format_type == "upper":
-        formatted = [name.upper() for name in name_list]
-    elif format_type == "lower":
-        formatted = [name.lower() for name in name_list]
-    elif format_type == "title":
-        formatted = [name.title() for name in name_list]
-    else:
+    formatter = FORMATTERS.get(format_type)
+    if formatter is None:
         return f"Unknown format type: {format_type}"
 
+    formatted = [formatter(name) for name in name_list]
     return f"Formatted names: {', '.join(formatted)}"
 
 
+def check_batch(items: List[Any], label: str) -> Optional[str]:
+    """Return the error of an empty batch or a batch over MAX_BATCH_SIZE, else None"""
+    if not items:
+        return f"No {label} provided"
+    if len(items) > MAX_BATCH_SIZE:
+        return f"Too many {label}: {len(items)}; at most {MAX_BATCH_SIZE} per call"
+    return None
+
+
+@mcp.tool()
+async def get_names_by_surnames(surnames: List[str], limit: int = 50) -> Dict[str, Any]:
+    """
+    Get the names for many surnames in one call; use instead of repeated get_names_by_surname calls.
+
+    Args:
+        surnames: Surnames to look up
+        limit: Maximum names returned per surname
+
+    Returns:
+        Dictionary with one result per surname, in order: the names found, or close
+        surnames to try when none were found; or with an "error" for an invalid batch
+    """
+    error = check_batch(surnames, "surnames")
+    if error:
+        return {"error": error}
+    logger.info(f"Looking up names for {len(surnames)} surnames")
+
+    results = []
+    for surname in surnames:
+        names = name_index.names_for_surname(surname, max(limit, 1))
+        result = {"surname": surname, "found": bool(names), "total": name_index.count_for_surname(surname),
+                  "names": names}
+        if not names:
+            result["suggestions"] = [s.title() for s in name_index.suggest_surnames(surname)]
+        results.append(result)
+
+    return {
+        "found": sum(result["found"] for result in results),
+        "not_found": [result["surname"] for result in results if not result["found"]],
+        "results": results
+    }
+
+
+@mcp.tool()
+async def search_names_batch(queries: List[str], mode: str = "auto", limit: int = 5) -> Dict[str, Any]:
+    """
+    Search names for many queries in one call; use instead of repeated search_names calls.
+
+    Args:
+        queries: Surnames, surname prefixes or full names, e.g. ["smi", "Jon Smyth", "Smith, J"]
+        mode: auto (exact, else prefix, else typo-tolerant, else sounds-alike matches),
+            exact, prefix, fuzzy or phonetic
+        limit: Maximum names returned per query
+
+    Returns:
+        Dictionary with one result per query, in order, with its matching names and how they
+        matched; or with an "error" for an invalid batch or mode
+    """
+    error = check_batch(queries, "queries")
+    if error:
+        return {"error": error}
+    if mode not in MATCH_MODES:
+        return {"error": f"Unknown search mode: {mode}"}
+    logger.info(f"Searching names for {len(queries)} queries ({mode})")
+
+    results = []
+    for query in queries:
+        matches = name_index.search(query, mode, limit)
+        results.append({
+            "query": query,
+            "match": matches[0]["match"] if matches else None,
+            "names": [match["name"] for match in matches]
+        })
+
+    return {
+        "found": sum(bool(result["names"]) for result in results),
+        "not_found": [result["query"] for result in results if not result["names"]],
+        "results": results
+    }
+
+
+@mcp.tool()
+async def format_names_batch(name_lists: List[str], format_types: Optional[List[str]] = None) -> Dict[str, Any]:
+    """
+    Format many comma-separated name lists in several formats in one call; use instead of
+    repeated format_names calls.
+
+    Args:
+        name_lists: Comma-separated name lists, e.g. ["john smith, jane doe", "ana garcia"]
+        format_types: Formats to apply to every list: upper, lower, title; defaults to ["title"]
+
+    Returns:
+        Dictionary with one result per list, in order, holding its names in each format; or
+        with an "error" for an invalid batch or format type
+    """
+    error = check_batch(name_lists, "name lists")
+    if error:
+        return {"error": error}
+    format_types = format_types or ["title"]
+    unknown = [format_type for format_type in format_types if format_type not in FORMATTERS]
+    if unknown:
+        return {"error": f"Unknown format types: {', '.join(unknown)}; use {', '.join(FORMATTERS)}"}
+    logger.info(f"Formatting {len(name_lists)} name lists as {', '.join(format_types)}")
+
+    results = []
+    for names in name_lists:
+        name_list = [name.strip() for name in names.split(',') if name.strip()]
+        results.append({
+            "input": names,
+            "formatted": {format_type: [FORMATTERS[format_type](name) for name in name_list]
+                          for format_type in format_types}
+        })
+
+    return {"results": results}
+
+
 if __name__ == "__main__":
     mcp.run()
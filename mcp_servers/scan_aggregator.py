@@ -0,0 +1,107 @@
+"""
+Single-pass aggregation of scan findings.
+
+Every count, breakdown, sum and maximum a scan summary needs is computed from one
+traversal of the findings, instead of one list comprehension per statistic (and one per
+category for breakdowns). Conditions are evaluated once per distinct field value rather
+than once per finding, and findings can be streamed through in constant memory.
+"""
+
+from typing import Any, Callable, Dict, Iterable, Optional, Sequence, Tuple
+
+SEVERITY_KEYS = ["critical", "high", "medium", "low", "info"]
+
+
+def aggregate_findings(findings: Iterable[Dict[str, Any]],
+                       group_by: Sequence[str] = (),
+                       conditions: Optional[Dict[str, Tuple[str, Callable[[Any], bool]]]] = None,
+                       sum_fields: Sequence[str] = (),
+                       max_fields: Sequence[str] = (),
+                       nested_key: Optional[str] = None,
+                       severity_field: Optional[str] = "severity") -> Dict[str, Any]:
+    """
+    Aggregate findings in a single traversal.
+
+    Every finding must have every field named in the arguments.
+
+    Args:
+        findings: Findings to aggregate; any iterable, consumed once
+        group_by: Fields whose values are counted, e.g. ["category"]
+        conditions: Name mapped to (field, predicate on the field value); findings whose
+            value matches are counted, e.g. {"legacy": ("age_months", lambda age: age > 24)}
+        sum_fields: Numeric fields summed over all findings
+        max_fields: Numeric fields whose maximum is kept (0 when there are no findings)
+        nested_key: Key of nested findings, e.g. component vulnerabilities, whose total and
+            severities are counted as well
+        severity_field: Field holding the severity of a finding; None for findings without one
+
+    Returns:
+        Dictionary with total, severity counts, groups, matches, sums, max and, with a
+        nested_key, nested_total and nested_severity
+    """
+    conditions = conditions or {}
+    counted_fields = list(dict.fromkeys([*([severity_field] if severity_field else []), *group_by,
+                                         *(field for field, _ in conditions.values())]))
+    counters = [(field, {}) for field in counted_fields]
+    sum_fields = list(sum_fields)
+    max_fields = list(max_fields)
+    sums = dict.fromkeys(sum_fields, 0)
+    maxes = dict.fromkeys(max_fields, 0)
+    nested_total = 0
+    nested_severity: Dict[Optional[str], int] = {}
+
+    # The only traversal of the findings. It updates plain dicts and keeps no reference to a
+    # finding, so streamed findings are freed as they pass and no cyclic garbage collection
+    # is set off by per-finding containers.
+    total = 0
+    for finding in findings:
+        total += 1
+        for field, counts in counters:
+            value = finding[field]
+            counts[value] = counts.get(value, 0) + 1
+        for field in sum_fields:
+            sums[field] += finding[field] or 0
+        for field in max_fields:
+            value = finding[field]
+            if value is not None and value > maxes[field]:
+                maxes[field] = value
+        if nested_key:
+            nested = finding[nested_key]
+            if nested:
+                nested_total += len(nested)
+                for item in nested:
+                    level = item.get("severity")
+                    nested_severity[level] = nested_severity.get(level, 0) + 1
+
+    value_counts = dict(counters)
+    aggregate = {
+        "total": total,
+        "severity": _fold_severities(value_counts[severity_field] if severity_field else {}),
+        "groups": {field: value_counts[field] for field in group_by},
+        # Conditions are evaluated once per distinct value, not once per finding
+        "matches": {
+            name: sum(count for value, count in value_counts[field].items() if predicate(value))
+            for name, (field, predicate) in conditions.items()
+        },
+        "sums": sums,
+        "max": maxes
+    }
+    if nested_key:
+        aggregate["nested_total"] = nested_total
+        aggregate["nested_severity"] = _fold_severities(nested_severity)
+    return aggregate
+
+
+def _fold_severities(counts: Dict[Optional[str], int]) -> Dict[str, int]:
+    """Merge raw severity counts case-insensitively into the lower-case severity keys"""
+    severity = dict.fromkeys(SEVERITY_KEYS, 0)
+    for level, count in counts.items():
+        if level is not None:
+            level = level.lower()
+            severity[level] = severity.get(level, 0) + count
+    return severity
+
+
+def severity_counts(total: int, severity: Dict[str, int]) -> Dict[str, int]:
+    """Format a total and severity counts as the issue_counts/vulnerability_counts section"""
+    return {"total": total, **{level: severity.get(level, 0) for level in SEVERITY_KEYS}}
@@ -0,0 +1,421 @@
+#!/usr/bin/env python3
+"""
+Pluggable sources of scan results for the Security Scan Results MCP Server.
+
+GeneratedScanBackend produces synthetic scans in process. HttpScanBackend fetches scans
+from scanner APIs over pooled keep-alive connections, fetching the pages of a findings
+list concurrently with retries and exponential backoff. StubScannerServer serves
+generated scans over HTTP in the same paged protocol, so the HTTP path can be exercised
+offline.
+
+Run a standalone stub scanner API with:
+    python mcp_servers/scan_backends.py --port 8900 --seed 7 --scale 10
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict, deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import parse_qs, quote, unquote, urlsplit
+
+import httpx
+
+from scan_data_generator import ScanDataGenerator
+
+# Findings lists of each scanner, fetched page by page
+SOURCE_FINDINGS = {
+    "sonar": ("issues",),
+    "fortify": ("vulnerabilities",),
+    "nexus": ("components", "policy_violations")
+}
+
+
+class ScanBackend(ABC):
+    """Source of complete scan results, findings included"""
+
+    @abstractmethod
+    async def get_scan(self, source: str, name: str, seed: int, scan_id: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Get the latest scan of a project, or an earlier fetched one.
+
+        Args:
+            source: Scanner name: sonar, fortify or nexus
+            name: Project key, application name or repository name in the scanner
+            seed: Seed of the scan, used by backends that generate data
+            scan_id: scan_id of a scan fetched before, to read further pages of that scan
+
+        Returns:
+            Dictionary containing the scan result with every finding
+
+        Raises:
+            ValueError: If the scan_id scan is no longer available
+        """
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Get fetch metrics of the backend"""
+        return {"backend": type(self).__name__}
+
+    async def close(self):
+        """Release connections held by the backend"""
+
+
+class GeneratedScanBackend(ScanBackend):
+    """Backend generating synthetic scans in process"""
+
+    def __init__(self, scale: float = 1.0, churn: float = 0.0):
+        self.scale = scale
+        self.churn = churn
+
+    async def get_scan(self, source: str, name: str, seed: int, scan_id: Optional[str] = None) -> Dict[str, Any]:
+        # The seed determines the scan, so scan_id needs no lookup
+        generator = ScanDataGenerator(seed, self.scale, churn=self.churn)
+        # Large scales take a while to generate; keep the server's event loop responsive
+        return await asyncio.to_thread(getattr(generator, f"{source}_scan_results"), name)
+
+
+class FetchMetrics:
+    """Thread-safe page fetch counters with a window of recent latencies"""
+
+    def __init__(self, window: int = 1000):
+        self._lock = threading.Lock()
+        self._latencies = deque(maxlen=window)
+        self._counts = {"requests": 0, "pages": 0, "items": 0, "bytes": 0, "retries": 0, "errors": 0}
+        self._busy_seconds = 0.0
+        self._in_flight = 0
+        self._busy_since = 0.0
+
+    def start(self):
+        with self._lock:
+            if self._in_flight == 0:
+                self._busy_since = time.monotonic()
+            self._in_flight += 1
+
+    def finish(self):
+        with self._lock:
+            self._in_flight -= 1
+            if self._in_flight == 0:
+                self._busy_seconds += time.monotonic() - self._busy_since
+
+    def record(self, name: str, value: float = 1):
+        with self._lock:
+            self._counts[name] += value
+
+    def record_page(self, latency: float, items: int, size: int):
+        with self._lock:
+            self._counts["pages"] += 1
+            self._counts["items"] += items
+            self._counts["bytes"] += size
+            self._latencies.append(latency)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Get the metrics.
+
+        Returns:
+            Dict: Counters, pages and items per second of time spent fetching, and latency
+            percentiles in milliseconds over the recent window
+        """
+        with self._lock:
+            metrics = dict(self._counts)
+            busy = self._busy_seconds + (time.monotonic() - self._busy_since if self._in_flight else 0.0)
+            latencies = sorted(self._latencies)
+
+        def percentile(fraction: float) -> float:
+            return round(latencies[min(int(len(latencies) * fraction), len(latencies) - 1)] * 1000, 2)
+
+        metrics["busy_seconds"] = round(busy, 3)
+        metrics["pages_per_second"] = round(metrics["pages"] / busy, 1) if busy else 0.0
+        metrics["items_per_second"] = round(metrics["items"] / busy, 1) if busy else 0.0
+        if latencies:
+            metrics["latency_ms"] = {"p50": percentile(0.5), "p95": percentile(0.95), "max": percentile(1.0)}
+        return metrics
+
+
+class HttpScanBackend(ScanBackend):
+    """
+    Backend fetching scans from scanner APIs over HTTP.
+
+    A scan is read from GET {base_url}/{source}/{name} and each of its findings lists from
+    GET {base_url}/{source}/{name}/{findings}?offset=&limit=, which answers
+    {"total": n, "items": [...]}. The first page gives the total; the remaining pages are
+    fetched concurrently. Connections are pooled and kept alive across tool calls.
+
+    The most recently fetched scans are kept by scan_id, so the later pages of a scan are
+    served from it instead of downloading the project's latest scan again.
+    """
+
+    RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+    def __init__(self, base_url: str, page_size: int = 500, max_concurrent_pages: int = 8,
+                 max_connections: int = 20, max_attempts: int = 4, backoff: float = 0.2,
+                 timeout: float = 30.0, headers: Optional[Dict[str, str]] = None, cached_scans: int = 8):
+        """
+        Initialize the HTTP backend.
+
+        Args:
+            base_url: Base URL of the scanner API
+            page_size: Findings requested per page
+            max_concurrent_pages: Pages of one findings list fetched at the same time
+            max_connections: Size of the connection pool shared by all requests
+            max_attempts: Attempts per request, including the first one
+            backoff: Base delay in seconds, doubled on each retry and jittered
+            timeout: Timeout of each request in seconds
+            headers: Extra headers, e.g. authentication, sent with every request
+            cached_scans: Recently fetched scans kept for reading their later pages
+        """
+        self.base_url = base_url.rstrip("/")
+        self.page_size = page_size
+        self.max_concurrent_pages = max_concurrent_pages
+        self.max_connections = max_connections
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.timeout = timeout
+        self.headers = headers or {}
+        self.cached_scans = cached_scans
+        self.metrics = FetchMetrics()
+        self._client: Optional[httpx.AsyncClient] = None
+        self._scans: "OrderedDict[str, Tuple[str, str, Dict[str, Any]]]" = OrderedDict()
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Pooled client, created on first use inside the server's event loop"""
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                headers=self.headers,
+                timeout=self.timeout,
+                limits=httpx.Limits(max_connections=self.max_connections,
+                                    max_keepalive_connections=self.max_connections)
+            )
+        return self._client
+
+    async def get_scan(self, source: str, name: str, seed: int, scan_id: Optional[str] = None) -> Dict[str, Any]:
+        if scan_id:
+            cached = self._scans.get(scan_id)
+            if cached is None or cached[:2] != (source, name):
+                raise ValueError(f"Scan {scan_id} of {name} is no longer cached; "
+                                 f"call again without cursor to start from the first page of the latest scan")
+            self._scans.move_to_end(scan_id)
+            # Callers replace the findings lists of the result; keep the cached ones intact
+            return dict(cached[2])
+
+        path = f"/{source}/{quote(name, safe='')}"
+        scan, _ = await self._get_json(path)
+        findings = await asyncio.gather(*(self._fetch_all(f"{path}/{key}") for key in SOURCE_FINDINGS[source]))
+        scan.update(zip(SOURCE_FINDINGS[source], findings))
+
+        self._scans[scan["scan_id"]] = (source, name, scan)
+        self._scans.move_to_end(scan["scan_id"])
+        while len(self._scans) > self.cached_scans:
+            self._scans.popitem(last=False)
+        return dict(scan)
+
+    async def _fetch_all(self, path: str) -> list:
+        """Fetch every page of a findings list, pages after the first one concurrently"""
+        first = await self._fetch_page(path, 0)
+        semaphore = asyncio.Semaphore(self.max_concurrent_pages)
+
+        async def fetch(offset: int) -> list:
+            async with semaphore:
+                return await self._fetch_page(path, offset)
+
+        total, items = first
+        pages = await asyncio.gather(*(fetch(offset) for offset in range(self.page_size, total, self.page_size)))
+        return [item for page_items in (items, *(page[1] for page in pages)) for item in page_items]
+
+    async def _fetch_page(self, path: str, offset: int) -> Tuple[int, list]:
+        start = time.monotonic()
+        body, size = await self._get_json(path, {"offset": offset, "limit": self.page_size})
+        self.metrics.record_page(time.monotonic() - start, len(body["items"]), size)
+        return body["total"], body["items"]
+
+    async def _get_json(self, path: str, params: Optional[Dict[str, Any]] = None) -> Tuple[Any, int]:
+        """GET a JSON document, retrying transport errors and retryable statuses with backoff"""
+        self.metrics.start()
+        try:
+            for attempt in range(1, self.max_attempts + 1):
+                self.metrics.record("requests")
+                try:
+                    response = await self.client.get(path, params=params)
+                    if response.status_code not in self.RETRY_STATUSES:
+                        response.raise_for_status()
+                        return response.json(), len(response.content)
+                    error = httpx.HTTPStatusError(f"{response.status_code} from {path}",
+                                                  request=response.request, response=response)
+                except httpx.TransportError as e:
+                    error = e
+
+                if attempt == self.max_attempts:
+                    raise error
+                self.metrics.record("retries")
+                await asyncio.sleep(self.backoff * 2 ** (attempt - 1) * (0.5 + random.random()))
+        except Exception:
+            self.metrics.record("errors")
+            raise
+        finally:
+            self.metrics.finish()
+
+    def get_metrics(self) -> Dict[str, Any]:
+        return {"backend": type(self).__name__, "base_url": self.base_url, **self.metrics.snapshot()}
+
+    async def close(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+class StubScannerServer:
+    """
+    In-process HTTP server serving generated scans in the HttpScanBackend protocol.
+
+    Scans are generated on first request and kept, so every page of a findings list comes
+    from the same scan. Latency and a failure rate can be injected to exercise timeouts,
+    retries and partial results.
+    """
+
+    def __init__(self, generator: ScanDataGenerator, host: str = "127.0.0.1", port: int = 0,
+                 latency: float = 0.0, failure_rate: float = 0.0):
+        """
+        Initialize and start the stub server.
+
+        Args:
+            generator: Generator of the served scans
+            host: Interface to listen on
+            port: Port to listen on; 0 picks a free port
+            latency: Seconds added to every response
+            failure_rate: Fraction of requests answered with 503
+        """
+        self.generator = generator
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self._scans: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                stub.handle(self)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, name="stub-scanner-api", daemon=True)
+        self._thread.start()
+
+    @property
+    def url(self) -> str:
+        """Base URL of the running server"""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def get_scan(self, source: str, name: str) -> Dict[str, Any]:
+        """Return the served scan of a project, generating it on first use"""
+        with self._lock:
+            key = (source, name)
+            if key not in self._scans:
+                self._scans[key] = getattr(self.generator, f"{source}_scan_results")(name)
+            return self._scans[key]
+
+    def handle(self, request: BaseHTTPRequestHandler):
+        if self.latency:
+            time.sleep(self.latency)
+        if self.failure_rate and random.random() < self.failure_rate:
+            return self._send(request, 503, {"error": "Service temporarily unavailable"})
+
+        url = urlsplit(request.path)
+        parts = [unquote(part) for part in url.path.strip("/").split("/")]
+        if len(parts) not in (2, 3) or parts[0] not in SOURCE_FINDINGS or \
+                (len(parts) == 3 and parts[2] not in SOURCE_FINDINGS[parts[0]]):
+            return self._send(request, 404, {"error": f"Not found: {url.path}"})
+
+        scan = self.get_scan(parts[0], parts[1])
+        if len(parts) == 2:
+            body = {key: value for key, value in scan.items() if key not in SOURCE_FINDINGS[parts[0]]}
+        else:
+            query = parse_qs(url.query)
+            offset = int(query.get("offset", ["0"])[0])
+            limit = int(query.get("limit", ["100"])[0])
+            findings = scan[parts[2]]
+            body = {"total": len(findings), "offset": offset, "items": findings[offset:offset + limit]}
+        self._send(request, 200, body)
+
+    @staticmethod
+    def _send(request: BaseHTTPRequestHandler, status: int, body: Dict[str, Any]):
+        payload = json.dumps(body).encode()
+        request.send_response(status)
+        request.send_header("Content-Type", "application/json")
+        request.send_header("Content-Length", str(len(payload)))
+        request.end_headers()
+        request.wfile.write(payload)
+
+    def close(self):
+        """Stop the server"""
+        self._server.shutdown()
+        self._server.server_close()
+
+
+def create_backend(kind: Optional[str] = None) -> ScanBackend:
+    """
+    Create the backend selected by the environment.
+
+    SCAN_BACKEND selects "generated" (default), "http" (SCAN_BACKEND_URL, optional
+    SCAN_BACKEND_TOKEN sent as a bearer token) or "stub" (an in-process StubScannerServer
+    seeded with SCAN_STUB_SEED). SCAN_DATA_SCALE scales generated scans, SCAN_DATA_CHURN
+    sets the fraction of findings that differ between generated scans of a project and
+    SCAN_BACKEND_PAGE_SIZE sets the HTTP page size.
+
+    Args:
+        kind: Backend kind overriding SCAN_BACKEND
+
+    Returns:
+        ScanBackend: The configured backend
+    """
+    kind = kind or os.environ.get("SCAN_BACKEND", "generated")
+    scale = float(os.environ.get("SCAN_DATA_SCALE", 1))
+    page_size = int(os.environ.get("SCAN_BACKEND_PAGE_SIZE", 500))
+
+    if kind == "generated":
+        return GeneratedScanBackend(scale, float(os.environ.get("SCAN_DATA_CHURN", 0.1)))
+    if kind == "http":
+        token = os.environ.get("SCAN_BACKEND_TOKEN")
+        return HttpScanBackend(os.environ["SCAN_BACKEND_URL"], page_size=page_size,
+                               headers={"Authorization": f"Bearer {token}"} if token else None)
+    if kind == "stub":
+        stub = StubScannerServer(ScanDataGenerator(int(os.environ.get("SCAN_STUB_SEED", 0)), scale))
+        return HttpScanBackend(stub.url, page_size=page_size)
+    raise ValueError(f"Unknown SCAN_BACKEND: {kind}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to listen on")
+    parser.add_argument("--port", type=int, default=8900, help="Port to listen on")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the served scans")
+    parser.add_argument("--scale", type=float, default=1.0, help="Multiplier of the findings per scan")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every response")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="Fraction of requests answered with 503")
+    args = parser.parse_args()
+
+    stub = StubScannerServer(ScanDataGenerator(args.seed, args.scale), args.host, args.port,
+                             args.latency, args.failure_rate)
+    print(f"Stub scanner API listening on {stub.url}")
+    try:
+        stub._thread.join()
+    except KeyboardInterrupt:
+        stub.close()
+
+
+if __name__ == "__main__":
+    main()
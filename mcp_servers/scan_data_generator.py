@@ -0,0 +1,484 @@
+#!/usr/bin/env python3
+"""
+Seedable, scalable synthetic scan data for the Security Scan Results MCP Server.
+
+The same seed, scale and as-of date always produce the same scans. Findings are yielded
+lazily, one at a time, so very large scans can be streamed to disk or through the
+aggregator without being held in memory. Each project and finding stream draws from its
+own random generator derived from the seed, so streams are reproducible independently
+of the order they are consumed in. With churn, the scans of a project under different
+seeds share a baseline of findings and differ only in a fraction of them.
+
+Export fixtures with:
+    python mcp_servers/scan_data_generator.py --seed 7 --scale 100 --project demo --output fixtures
+"""
+
+import argparse
+import json
+import os
+import random
+import time
+from datetime import date, datetime, timedelta
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, Tuple
+
+from scan_aggregator import aggregate_findings, severity_counts
+
+SEVERITY_LEVELS = ["Critical", "High", "Medium", "Low", "Info"]
+
+ISSUE_TYPES = [
+    "Code Smell", "Bug", "Vulnerability", "Security Hotspot",
+    "Maintainability Issue", "Reliability Issue"
+]
+ISSUE_MESSAGES = [
+    "Potential SQL injection vulnerability",
+    "Unused import should be removed",
+    "Method complexity is too high",
+    "Hardcoded credentials detected",
+    "Potential XSS vulnerability",
+    "Memory leak possible",
+    "Dead code should be removed"
+]
+VULNERABILITY_CATEGORIES = [
+    "Cross-Site Scripting", "SQL Injection", "Path Manipulation",
+    "Command Injection", "LDAP Injection", "XML Injection",
+    "Buffer Overflow", "Resource Injection", "Privacy Violation",
+    "Weak Cryptographic Hash", "Insecure Randomness", "Trust Boundary Violation"
+]
+VULNERABILITY_DESCRIPTIONS = [
+    "User input is not properly validated before being used in SQL query",
+    "Data from user input is not encoded before output to web page",
+    "File path constructed from user input without proper validation",
+    "Cryptographic hash function is weak and vulnerable to attacks",
+    "Random number generator is not cryptographically secure"
+]
+CVE_SUMMARIES = [
+    "Remote code execution vulnerability",
+    "Cross-site scripting vulnerability",
+    "Denial of service vulnerability",
+    "Information disclosure vulnerability",
+    "Authentication bypass"
+]
+LICENSES = [
+    "Apache-2.0", "MIT", "GPL-3.0", "BSD-3-Clause",
+    "ISC", "LGPL-2.1", "MPL-2.0", "Unlicense", "EPL-1.0"
+]
+POLICY_NAMES = [
+    "Critical Security Policy", "License Compliance Policy",
+    "Architecture Standards", "Component Quality Policy"
+]
+POLICY_DESCRIPTIONS = [
+    "Component has critical security vulnerabilities",
+    "License is not approved for commercial use",
+    "Component violates architecture standards",
+    "Component quality metrics below threshold"
+]
+
+
+class ScanDataGenerator:
+    """Deterministic generator of Sonar, Fortify and Nexus scan results"""
+
+    def __init__(self, seed: int, scale: float = 1.0, as_of: Optional[date] = None, churn: float = 0.0):
+        """
+        Initialize the generator.
+
+        Args:
+            seed: Seed every scan and finding stream is derived from
+            scale: Multiplier of the number of findings per scan, e.g. 100 for 100x today's sizes
+            as_of: Date scan dates are generated relative to; defaults to today
+            churn: Fraction of findings that differ between seeds; 0 draws every finding from
+                the seed, higher values make scans of a project re-scans of one baseline
+        """
+        self.seed = seed
+        self.scale = scale
+        self.churn = churn
+        self.as_of = datetime.combine(as_of or date.today(), datetime.min.time())
+
+    def _rng(self, *stream: Any) -> random.Random:
+        """Independent random generator of one named stream, derived from the seed"""
+        return random.Random(":".join(map(str, (self.seed, *stream))))
+
+    def _count(self, rng: random.Random, low: int, high: int) -> int:
+        return int(rng.randint(low, high) * self.scale)
+
+    def _date(self, rng: random.Random, days_back: int = 30) -> str:
+        return (self.as_of - timedelta(seconds=rng.randint(0, days_back * 86400))).isoformat()
+
+    @staticmethod
+    def _hex(rng: random.Random, length: int = 32) -> str:
+        return f"{rng.getrandbits(128):032x}"[:length]
+
+    @staticmethod
+    def _package(rng: random.Random) -> Tuple[str, str]:
+        component_type = rng.choice(["maven", "npm", "pypi", "nuget", "docker"])
+        if component_type == "maven":
+            component_name = f"org.apache.{rng.choice(['commons', 'http', 'logging'])}"
+            package_name = f"{component_name}:{rng.choice(['commons-lang3', 'httpclient', 'log4j-core'])}"
+        elif component_type == "npm":
+            package_name = rng.choice(['lodash', 'express', 'react', 'axios', 'moment'])
+        elif component_type == "pypi":
+            package_name = rng.choice(['requests', 'django', 'flask', 'numpy', 'pandas'])
+        elif component_type == "nuget":
+            package_name = rng.choice(['Newtonsoft.Json', 'Microsoft.AspNetCore', 'Serilog'])
+        else:  # docker
+            package_name = rng.choice(['alpine', 'ubuntu', 'nginx', 'node', 'python'])
+        return component_type, package_name
+
+    def _findings(self, source: str, name: str, kind: str, low: int, high: int,
+                  build: Callable[[random.Random], Dict[str, Any]],
+                  change: Callable[[random.Random, Dict[str, Any]], None]) -> Iterator[Dict[str, Any]]:
+        """
+        Yield the findings of one stream.
+
+        Without churn every finding is drawn from the seed. With churn the findings are drawn
+        from a baseline shared by every seed, and each seed replaces half the churn fraction
+        of them with new findings and changes the other half in place, like a re-scan of
+        slightly changed code.
+        """
+        rng = self._rng(source, name, kind)
+        if not self.churn:
+            for _ in range(self._count(rng, low, high)):
+                yield build(rng)
+            return
+
+        baseline = random.Random(":".join(map(str, ("baseline", source, name, kind))))
+        for _ in range(self._count(baseline, low, high)):
+            finding = build(baseline)
+            draw = rng.random()
+            if draw < self.churn / 2:
+                finding = build(rng)
+            elif draw < self.churn:
+                change(rng, finding)
+            yield finding
+
+    @staticmethod
+    def _change_severity(rng: random.Random, finding: Dict[str, Any]):
+        finding["severity"] = rng.choice(SEVERITY_LEVELS)
+
+    def sonar_issues(self, project_key: str) -> Iterator[Dict[str, Any]]:
+        """Yield the SonarQube issues of a project"""
+        def build(rng: random.Random) -> Dict[str, Any]:
+            return {
+                "key": f"sonar-{self._hex(rng, 8)}",
+                "type": rng.choice(ISSUE_TYPES),
+                "severity": rng.choice(SEVERITY_LEVELS),
+                "component": f"src/main/java/com/example/{rng.choice(['Controller', 'Service', 'Repository', 'Model'])}.java",
+                "line": rng.randint(1, 500),
+                "message": rng.choice(ISSUE_MESSAGES),
+                "effort": f"{rng.randint(5, 120)}min",
+                "debt": f"{rng.randint(1, 8)}h",
+                "created_date": self._date(rng, 7)
+            }
+
+        return self._findings("sonar", project_key, "issues", 5, 25, build, self._change_severity)
+
+    def fortify_vulnerabilities(self, application_name: str) -> Iterator[Dict[str, Any]]:
+        """Yield the Fortify vulnerabilities of an application"""
+        def build(rng: random.Random) -> Dict[str, Any]:
+            return {
+                "instance_id": f"fortify-{self._hex(rng, 8)}",
+                "category": rng.choice(VULNERABILITY_CATEGORIES),
+                "severity": rng.choice(SEVERITY_LEVELS),
+                "confidence": rng.choice(["High", "Medium", "Low"]),
+                "impact": round(rng.uniform(1, 5), 1),
+                "likelihood": round(rng.uniform(1, 5), 1),
+                "file_path": f"src/main/java/com/example/{rng.choice(['web', 'service', 'dao', 'util'])}/{rng.choice(['UserController', 'AuthService', 'DatabaseDAO', 'ValidationUtil'])}.java",
+                "line_number": rng.randint(1, 500),
+                "function_name": rng.choice(
+                    ["authenticate", "processInput", "executeQuery", "validateUser", "encryptData"]),
+                "description": rng.choice(VULNERABILITY_DESCRIPTIONS),
+                "recommendation": "Implement proper input validation and output encoding",
+                "cwe_id": rng.choice([79, 89, 22, 78, 90, 91, 120, 134, 311, 330]),
+                "owasp_category": rng.choice(["A03:2021", "A02:2021", "A01:2021", "A04:2021", "A06:2021"]),
+                "first_detected": self._date(rng, 30),
+                "last_seen": self._date(rng, 3)
+            }
+
+        return self._findings("fortify", application_name, "vulnerabilities", 3, 20, build, self._change_severity)
+
+    def nexus_components(self, repository_name: str) -> Iterator[Dict[str, Any]]:
+        """Yield the Nexus IQ components of a repository, each with its vulnerabilities"""
+        def build(rng: random.Random) -> Dict[str, Any]:
+            component_type, package_name = self._package(rng)
+            version = f"{rng.randint(1, 5)}.{rng.randint(0, 20)}.{rng.randint(0, 10)}"
+
+            vulnerabilities = [{
+                "cve_id": f"CVE-{rng.randint(2020, 2024)}-{rng.randint(1000, 9999)}",
+                "cvss_score": round(rng.uniform(1, 10), 1),
+                "severity": rng.choice(SEVERITY_LEVELS),
+                "summary": rng.choice(CVE_SUMMARIES),
+                "published_date": self._date(rng, 365),
+                "modified_date": self._date(rng, 30)
+            } for _ in range(rng.randint(0, 5))]
+
+            return {
+                "component_id": f"{component_type}-{self._hex(rng, 8)}",
+                "package_name": package_name,
+                "version": version,
+                "type": component_type,
+                "license": rng.choice(LICENSES),
+                "direct_dependency": rng.choice([True, False]),
+                "vulnerabilities": vulnerabilities,
+                "vulnerability_count": len(vulnerabilities),
+                "highest_cvss": max(v["cvss_score"] for v in vulnerabilities) if vulnerabilities else 0,
+                "policy_violations": rng.randint(0, 3),
+                "license_threat_level": rng.choice(["None", "Low", "Medium", "High"]),
+                "age_months": rng.randint(1, 60)
+            }
+
+        def upgrade(rng: random.Random, component: Dict[str, Any]):
+            # An upgrade that fixes the component's vulnerabilities
+            major, minor, _ = component["version"].split(".")
+            component.update(version=f"{major}.{int(minor) + 1}.{rng.randint(0, 10)}", vulnerabilities=[],
+                             vulnerability_count=0, highest_cvss=0, age_months=rng.randint(1, 3))
+
+        return self._findings("nexus", repository_name, "components", 5, 30, build, upgrade)
+
+    def nexus_policy_violations(self, repository_name: str) -> Iterator[Dict[str, Any]]:
+        """Yield the Nexus IQ policy violations of a repository"""
+        def build(rng: random.Random) -> Dict[str, Any]:
+            return {
+                "violation_id": f"policy-{self._hex(rng, 8)}",
+                "type": rng.choice(["Security", "License", "Architecture", "Quality"]),
+                "severity": rng.choice(SEVERITY_LEVELS),
+                "policy_name": rng.choice(POLICY_NAMES),
+                "component": self._package(rng)[1],
+                "description": rng.choice(POLICY_DESCRIPTIONS),
+                "detected_date": self._date(rng, 14)
+            }
+
+        return self._findings("nexus", repository_name, "policy_violations", 0, 10, build, self._change_severity)
+
+    def sonar_scan_results(self, project_key: str, issues: Optional[Iterable[Dict[str, Any]]] = None) -> Dict[str, Any]:
+        """
+        Generate SonarQube scan results.
+
+        Args:
+            project_key: The project identifier in SonarQube
+            issues: Issues to summarize instead of the generated list; an iterator is
+                consumed and left out of the result
+
+        Returns:
+            Dictionary containing SonarQube scan results
+        """
+        issues = list(self.sonar_issues(project_key)) if issues is None else issues
+        issue_stats = aggregate_findings(issues, group_by=["type"])
+
+        rng = self._rng("sonar", project_key)
+        lines_of_code = rng.randint(1000, 100000)
+        coverage = round(rng.uniform(40, 95), 1)
+
+        return {
+            "scan_id": f"sonar-{self._hex(rng)}",
+            "project_key": project_key,
+            "project_name": f"Project {project_key.title()}",
+            "scan_date": self._date(rng, 1),
+            "status": rng.choice(["Completed", "In Progress", "Failed", "Queued"]),
+            "metrics": {
+                "lines_of_code": lines_of_code,
+                "coverage": coverage,
+                "duplicated_lines_density": round(rng.uniform(0, 15), 1),
+                "maintainability_rating": rng.choice(["A", "B", "C", "D", "E"]),
+                "reliability_rating": rng.choice(["A", "B", "C", "D", "E"]),
+                "security_rating": rng.choice(["A", "B", "C", "D", "E"]),
+                "technical_debt": f"{rng.randint(1, 50)}h"
+            },
+            **({"issues": issues} if isinstance(issues, list) else {}),
+            "issue_counts": severity_counts(issue_stats["total"], issue_stats["severity"]),
+            "quality_gate": {
+                "status": rng.choice(["PASSED", "FAILED", "WARNING"]),
+                "conditions": [
+                    {
+                        "metric": "coverage",
+                        "operator": "LT",
+                        "threshold": "80.0",
+                        "actual_value": str(coverage),
+                        "status": "PASSED" if coverage >= 80 else "FAILED"
+                    },
+                    {
+                        "metric": "new_vulnerabilities",
+                        "operator": "GT",
+                        "threshold": "0",
+                        "actual_value": str(issue_stats["groups"]["type"].get("Vulnerability", 0)),
+                        "status": rng.choice(["PASSED", "FAILED"])
+                    }
+                ]
+            },
+            "dashboard_url": f"https://sonarqube.company.com/dashboard?id={project_key}"
+        }
+
+    def fortify_scan_results(self, application_name: str,
+                             vulnerabilities: Optional[Iterable[Dict[str, Any]]] = None) -> Dict[str, Any]:
+        """
+        Generate Fortify scan results.
+
+        Args:
+            application_name: The application name in Fortify
+            vulnerabilities: Vulnerabilities to summarize instead of the generated list; an
+                iterator is consumed and left out of the result
+
+        Returns:
+            Dictionary containing Fortify scan results
+        """
+        if vulnerabilities is None:
+            vulnerabilities = list(self.fortify_vulnerabilities(application_name))
+        vulnerability_stats = aggregate_findings(vulnerabilities, group_by=["category"])
+
+        rng = self._rng("fortify", application_name)
+        scan_duration = rng.randint(300, 3600)  # seconds
+
+        return {
+            "scan_id": f"fortify-{self._hex(rng)}",
+            "application_name": application_name,
+            "version": f"v{rng.randint(1, 10)}.{rng.randint(0, 9)}.{rng.randint(0, 9)}",
+            "scan_date": self._date(rng, 1),
+            "status": rng.choice(["Completed", "In Progress", "Failed", "Queued"]),
+            "scan_statistics": {
+                "total_files_scanned": rng.randint(100, 1000),
+                "lines_of_code": rng.randint(50000, 500000),
+                "scan_duration_seconds": scan_duration,
+                "scan_duration_formatted": f"{scan_duration // 60}m {scan_duration % 60}s",
+                "fortify_version": f"22.{rng.randint(1, 2)}.{rng.randint(0, 3)}"
+            },
+            **({"vulnerabilities": vulnerabilities} if isinstance(vulnerabilities, list) else {}),
+            "vulnerability_counts": severity_counts(vulnerability_stats["total"], vulnerability_stats["severity"]),
+            "category_breakdown": vulnerability_stats["groups"]["category"],
+            "risk_metrics": {
+                "fortify_priority_order": round(rng.uniform(1, 5), 2),
+                "business_criticality": rng.choice(["High", "Medium", "Low"]),
+                "overall_risk_score": round(rng.uniform(1, 10), 1)
+            },
+            "dashboard_url": f"https://fortify.company.com/ssc/html/ssc/index.jsp#!/version/{rng.randint(1000, 9999)}/fix"
+        }
+
+    def nexus_scan_results(self, repository_name: str,
+                           components: Optional[Iterable[Dict[str, Any]]] = None,
+                           policy_violations: Optional[Iterable[Dict[str, Any]]] = None) -> Dict[str, Any]:
+        """
+        Generate Nexus IQ scan results.
+
+        Args:
+            repository_name: The repository name in Nexus IQ
+            components: Components to summarize instead of the generated list; an iterator
+                is consumed and left out of the result
+            policy_violations: Policy violations to summarize instead of the generated list;
+                an iterator is consumed and left out of the result
+
+        Returns:
+            Dictionary containing Nexus IQ scan results
+        """
+        components = list(self.nexus_components(repository_name)) if components is None else components
+        if policy_violations is None:
+            policy_violations = list(self.nexus_policy_violations(repository_name))
+
+        component_stats = aggregate_findings(
+            components,
+            group_by=["license"],
+            conditions={
+                "with_vulnerabilities": ("vulnerability_count", lambda count: count > 0),
+                "license_issues": ("license_threat_level", lambda level: level in ("Medium", "High")),
+                "legacy": ("age_months", lambda age: age > 24)
+            },
+            max_fields=["highest_cvss"],
+            nested_key="vulnerabilities",
+            severity_field=None
+        )
+        violation_stats = aggregate_findings(policy_violations)
+
+        rng = self._rng("nexus", repository_name)
+        return {
+            "scan_id": f"nexus-{self._hex(rng)}",
+            "repository_name": repository_name,
+            "application_name": f"App-{repository_name}",
+            "scan_date": self._date(rng, 1),
+            "status": rng.choice(["Completed", "In Progress", "Failed", "Queued"]),
+            "stage": rng.choice(["develop", "build", "stage-release", "release", "operate"]),
+            "summary": {
+                "total_components": component_stats["total"],
+                "components_with_vulnerabilities": component_stats["matches"]["with_vulnerabilities"],
+                "total_vulnerabilities": component_stats["nested_total"],
+                "critical_vulnerabilities": component_stats["nested_severity"]["critical"],
+                "high_vulnerabilities": component_stats["nested_severity"]["high"],
+                "highest_cvss": component_stats["max"]["highest_cvss"],
+                "policy_violations": violation_stats["total"],
+                "license_issues": component_stats["matches"]["license_issues"]
+            },
+            **({"components": components} if isinstance(components, list) else {}),
+            **({"policy_violations": policy_violations} if isinstance(policy_violations, list) else {}),
+            "risk_metrics": {
+                "application_risk_score": round(rng.uniform(1, 100), 1),
+                "policy_evaluation": rng.choice(["Pass", "Warn", "Fail"]),
+                "open_policy_violations": violation_stats["severity"]["critical"] + violation_stats["severity"]["high"],
+                "legacy_components": component_stats["matches"]["legacy"]
+            },
+            "license_summary": component_stats["groups"]["license"],
+            "dashboard_url": f"https://nexus-iq.company.com/ui/links/application/{repository_name}/report/{self._hex(rng, 8)}"
+        }
+
+    def export_fixtures(self, project: str, output_dir: str) -> Dict[str, int]:
+        """
+        Stream the scans of a project to fixture files without holding the findings in memory.
+
+        Writes <project>.<source>.json with each scan result (without its findings) and
+        <project>.<source>.<findings>.jsonl with one finding per line.
+
+        Args:
+            project: Project, application and repository name of the scans
+            output_dir: Directory the fixtures are written to
+
+        Returns:
+            Dict: Findings written per fixture file
+        """
+        os.makedirs(output_dir, exist_ok=True)
+        written: Dict[str, int] = {}
+
+        def stream_to(path: str, findings: Iterator[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+            written[path] = 0
+            with open(path, "w") as file:
+                for finding in findings:
+                    file.write(json.dumps(finding, separators=(",", ":")) + "\n")
+                    written[path] += 1
+                    yield finding
+
+        def path(*parts: str) -> str:
+            return os.path.join(output_dir, ".".join((project, *parts)))
+
+        results = {
+            "sonar": self.sonar_scan_results(
+                project, stream_to(path("sonar", "issues", "jsonl"), self.sonar_issues(project))),
+            "fortify": self.fortify_scan_results(
+                project, stream_to(path("fortify", "vulnerabilities", "jsonl"), self.fortify_vulnerabilities(project))),
+            "nexus": self.nexus_scan_results(
+                project,
+                stream_to(path("nexus", "components", "jsonl"), self.nexus_components(project)),
+                stream_to(path("nexus", "policy_violations", "jsonl"), self.nexus_policy_violations(project)))
+        }
+        for source, result in results.items():
+            with open(path(source, "json"), "w") as file:
+                json.dump({"seed": self.seed, "scale": self.scale, **result}, file, indent=2)
+        return written
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the generated scans")
+    parser.add_argument("--scale", type=float, default=1.0, help="Multiplier of the findings per scan")
+    parser.add_argument("--churn", type=float, default=0.0,
+                        help="Fraction of findings that differ from the project baseline")
+    parser.add_argument("--as-of", type=date.fromisoformat, default=None,
+                        help="Date (YYYY-MM-DD) scan dates are relative to; defaults to today")
+    parser.add_argument("--project", action="append", help="Project to export; may be repeated")
+    parser.add_argument("--output", default="fixtures", help="Output directory")
+    args = parser.parse_args()
+
+    generator = ScanDataGenerator(args.seed, args.scale, args.as_of, args.churn)
+    for project in args.project or ["default-project"]:
+        start = time.perf_counter()
+        written = generator.export_fixtures(project, args.output)
+        elapsed = time.perf_counter() - start
+        for path, count in written.items():
+            print(f"{path}: {count:,} findings")
+        print(f"{project}: {sum(written.values()):,} findings in {elapsed:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
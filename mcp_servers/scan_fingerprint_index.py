@@ -0,0 +1,201 @@
+"""
+Local fingerprint index of earlier scans, backing the delta mode of the scan tools.
+
+Every scan a tool returns is recorded under its scan_id in the scan store (scan_store.py),
+together with a fingerprint of each finding. A later call with since_scan_id compares its
+scan with the recorded one and keeps only the findings that are new or changed, lists the
+resolved ones and reports how the summary counts moved, so the result grows with the
+change rather than with the project.
+
+A finding is identified across scans by a fingerprint of stable fields (never scanner
+ids, line numbers or timestamps, which change between scans of the same code), and is
+changed when any other field differs.
+"""
+
+import hashlib
+import json
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Tuple
+
+from scan_backends import SOURCE_FINDINGS
+from scan_store import ScanResultStore
+
+# Fields identifying a finding across scans, per findings list
+FINGERPRINT_FIELDS = {
+    "issues": ("type", "component", "message"),
+    "vulnerabilities": ("category", "cwe_id", "file_path", "function_name"),
+    "components": ("type", "package_name"),
+    "policy_violations": ("type", "policy_name", "component"),
+}
+
+# Fields kept for resolved findings, after the fingerprint fields
+RESOLVED_FIELDS = {
+    "issues": ("key", "severity", "line"),
+    "vulnerabilities": ("instance_id", "severity", "line_number"),
+    "components": ("component_id", "version", "vulnerability_count"),
+    "policy_violations": ("violation_id", "severity"),
+}
+
+# Fields that differ between scans of unchanged code; ignored when comparing findings
+VOLATILE_FIELDS = frozenset([
+    "key", "instance_id", "component_id", "violation_id", "line", "line_number",
+    "created_date", "first_detected", "last_seen", "detected_date", "published_date", "modified_date"
+])
+
+# Summary sections whose counts are compared, per source
+SUMMARY_SECTIONS = {
+    "sonar": ("issue_counts",),
+    "fortify": ("vulnerability_counts", "category_breakdown"),
+    "nexus": ("summary", "license_summary"),
+}
+
+
+def _strip_volatile(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {k: _strip_volatile(v) for k, v in value.items() if k not in VOLATILE_FIELDS}
+    if isinstance(value, list):
+        return [_strip_volatile(item) for item in value]
+    return value
+
+
+def _digest(value: Any) -> str:
+    return hashlib.sha1(json.dumps(value, sort_keys=True, separators=(",", ":"), default=str).encode()).hexdigest()
+
+
+def fingerprint(findings_key: str, finding: Dict[str, Any]) -> Tuple[str, str]:
+    """
+    Fingerprint a finding.
+
+    Args:
+        findings_key: Key of the findings list the finding belongs to, e.g. "issues"
+        finding: The finding
+
+    Returns:
+        Tuple of the identity fingerprint and the hash of its comparable content
+    """
+    identity = [finding.get(field) for field in FINGERPRINT_FIELDS[findings_key]]
+    return _digest(identity), _digest(_strip_volatile(finding))
+
+
+def fingerprint_rows(source: str, results: Dict[str, Any]) -> List[Tuple[str, str, str, str]]:
+    """
+    Fingerprint every finding of a full scan result, for ScanResultStore.record.
+
+    Args:
+        source: Scanner the result comes from ("sonar", "fortify" or "nexus")
+        results: Scan result holding the full findings lists
+
+    Returns:
+        List of rows of findings_key, fingerprint, content hash and finding JSON
+    """
+    return [(findings_key, *fingerprint(findings_key, finding),
+             json.dumps(finding, separators=(",", ":"), default=str))
+            for findings_key in SOURCE_FINDINGS[source] for finding in results.get(findings_key, [])]
+
+
+class ScanFingerprintIndex:
+    """Delta comparisons of scan results with the scans recorded in a scan store"""
+
+    def __init__(self, store: ScanResultStore):
+        """
+        Initialize the index.
+
+        Args:
+            store: Store holding the recorded scans and their fingerprints
+        """
+        self.store = store
+
+    def _load(self, source: str, name: str, scan_id: str) -> Tuple[Dict[str, Any], List[Tuple[str, str, str, str]]]:
+        scan = self.store.fingerprints(scan_id)
+        if scan is None:
+            raise ValueError(f"Unknown since_scan_id {scan_id}: it was never returned by this server "
+                             f"or has expired; call again without since_scan_id for the full scan")
+        if scan[:2] != (source, name):
+            raise ValueError(f"since_scan_id {scan_id} is a {scan[0]} scan of {scan[1]}, "
+                             f"not a {source} scan of {name}")
+        return scan[2], scan[3]
+
+    def apply_delta(self, source: str, name: str, since_scan_id: str, results: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Reduce a full scan result to its changes since an earlier scan, in place.
+
+        Each findings list keeps only new findings (marked "delta": "new") and changed ones
+        (marked "delta": "changed", with the earlier values of the differing fields under
+        "previous"). Resolved findings are listed under "resolved", and a "delta" section
+        holds the counts per findings list and the summary deltas.
+
+        Args:
+            source: Scanner the result comes from
+            name: Project, application or repository name of the scan
+            since_scan_id: scan_id of the earlier scan of the same project
+            results: Scan result holding the full findings lists
+
+        Returns:
+            Dictionary with the reduced findings lists, "resolved" and "delta" sections
+        """
+        summary, rows = self._load(source, name, since_scan_id)
+        earlier: Dict[str, Dict[str, List[Tuple[str, str]]]] = defaultdict(lambda: defaultdict(list))
+        for findings_key, identity, content_hash, finding in rows:
+            earlier[findings_key][identity].append((content_hash, finding))
+
+        counts = {}
+        resolved = {}
+        for findings_key in SOURCE_FINDINGS[source]:
+            previous = earlier[findings_key]
+            current: Dict[str, List[Tuple[str, Dict[str, Any]]]] = defaultdict(list)
+            for finding in results.get(findings_key, []):
+                identity, content_hash = fingerprint(findings_key, finding)
+                current[identity].append((content_hash, finding))
+
+            new, changed, gone = [], [], []
+            unchanged = 0
+            for identity in [*current, *(identity for identity in previous if identity not in current)]:
+                # Findings sharing a fingerprint are paired identical ones first, then in order
+                now = current.get(identity, [])
+                before = previous.get(identity, [])
+                before_hashes = [content_hash for content_hash, _ in before]
+                remaining = []
+                for content_hash, finding in now:
+                    if content_hash in before_hashes:
+                        index = before_hashes.index(content_hash)
+                        before_hashes.pop(index)
+                        before.pop(index)
+                        unchanged += 1
+                    else:
+                        remaining.append(finding)
+                for finding, (_, old) in zip(remaining, before):
+                    changed.append({**finding, "delta": "changed", "previous": self._differences(json.loads(old), finding)})
+                new.extend({**finding, "delta": "new"} for finding in remaining[len(before):])
+                gone.extend(json.loads(old) for _, old in before[len(remaining):])
+
+            keep = FINGERPRINT_FIELDS[findings_key] + RESOLVED_FIELDS[findings_key]
+            results[findings_key] = new + changed
+            resolved[findings_key] = [{field: finding.get(field) for field in keep} for finding in gone]
+            counts[findings_key] = {"new": len(new), "changed": len(changed),
+                                    "resolved": len(gone), "unchanged": unchanged}
+
+        results["resolved"] = resolved
+        results["delta"] = {
+            "since_scan_id": since_scan_id,
+            "counts": counts,
+            "summary_delta": {section: self._count_changes(summary.get(section), results.get(section))
+                              for section in SUMMARY_SECTIONS[source]}
+        }
+        return results
+
+    @staticmethod
+    def _differences(old: Dict[str, Any], new: Dict[str, Any]) -> Dict[str, Any]:
+        """Earlier values of the comparable fields that differ"""
+        return {field: old.get(field) for field in {**old, **new}
+                if field not in VOLATILE_FIELDS and _strip_volatile(old.get(field)) != _strip_volatile(new.get(field))}
+
+    @staticmethod
+    def _count_changes(old: Optional[Dict[str, Any]], new: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Non-zero differences of the numeric counts of a summary section"""
+        old, new = old or {}, new or {}
+        changes = {}
+        for field in {**old, **new}:
+            before, after = old.get(field, 0), new.get(field, 0)
+            if isinstance(before, (int, float)) and isinstance(after, (int, float)) and before != after:
+                changes[field] = round(after - before, 2) if isinstance(after - before, float) else after - before
+        return changes
@@ -4,375 +4,326 @@ Security Scan Results MCP Server
 Provides methods to collect dummy scan results from Sonar, Fortify, and Nexus
 """
 
+import asyncio
+import base64
+import json
+import os
 import random
-import uuid
-from datetime import datetime, timedelta
-from typing import Dict, Any
+from datetime import datetime
+from functools import partial
+from typing import Dict, Any, List, Optional, Tuple
 
 from fastmcp import FastMCP
 
+from scan_backends import create_backend
+from scan_data_generator import SEVERITY_LEVELS
+from scan_fingerprint_index import ScanFingerprintIndex, fingerprint_rows
+from scan_store import ScanResultStore
+
 # Initialize FastMCP
 mcp = FastMCP("Security Scan Results Server")
 
+SEVERITY_RANK = {severity.lower(): rank for rank, severity in enumerate(SEVERITY_LEVELS)}
 
-def generate_random_severity():
-    """Generate random severity level"""
-    return random.choice(["Critical", "High", "Medium", "Low", "Info"])
+# Source of scan results, selected with SCAN_BACKEND (see scan_backends.create_backend)
+backend = create_backend()
 
+# Source, summary section and total and critical count fields added up in consolidated results
+CONSOLIDATED_COUNTS = [
+    ("sonar", "issue_counts", "total", "critical"),
+    ("fortify", "vulnerability_counts", "total", "critical"),
+    ("nexus", "summary", "total_vulnerabilities", "critical_vulnerabilities")
+]
 
-def generate_random_status():
-    """Generate random scan status"""
-    return random.choice(["Completed", "In Progress", "Failed", "Queued"])
+# Every fetched scan, for historical queries that do not call the scanners
+scan_store = ScanResultStore()
 
+# Delta comparisons with the scans in the store, for since_scan_id
+fingerprint_index = ScanFingerprintIndex(scan_store)
 
-def generate_random_date(days_back=30):
-    """Generate random date within last N days"""
-    base_date = datetime.now()
-    random_days = random.randint(0, days_back)
-    return (base_date - timedelta(days=random_days)).isoformat()
+# Seconds get_all_scan_results waits for each scanner before reporting a partial result
+SOURCE_TIMEOUT_SECONDS = float(os.environ.get("SCAN_SOURCE_TIMEOUT_SECONDS", 20))
 
 
-@mcp.tool()
-def get_sonar_scan_results(project_key: str = "default-project") -> Dict[str, Any]:
+def encode_cursor(seed: int, offset: int, scan_id: str) -> str:
+    """Encode the scan seed, next offset and scan_id into an opaque page cursor"""
+    return base64.urlsafe_b64encode(f"{seed}:{offset}:{scan_id}".encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str]) -> Tuple[int, int, Optional[str]]:
+    """Decode a page cursor into (seed, offset, scan_id); without a cursor a new scan is started"""
+    if not cursor:
+        return random.getrandbits(32), 0, None
+    try:
+        seed, offset, scan_id = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode().split(":", 2)
+        return int(seed), int(offset), scan_id
+    except ValueError:
+        raise ValueError(f"Invalid cursor: {cursor}")
+
+
+def encode_scan_ids(scan_ids: Dict[str, Optional[str]]) -> str:
+    """Encode the scan_ids of the sources of a consolidated result into one opaque scan_id"""
+    return base64.urlsafe_b64encode(json.dumps(scan_ids, separators=(",", ":")).encode()).decode().rstrip("=")
+
+
+def decode_scan_ids(scan_id: Optional[str]) -> Dict[str, Optional[str]]:
+    """Decode a consolidated scan_id into the scan_ids of its sources"""
+    if not scan_id:
+        return {}
+    try:
+        scan_ids = json.loads(base64.urlsafe_b64decode(scan_id + "=" * (-len(scan_id) % 4)))
+    except ValueError:
+        scan_ids = None
+    if not isinstance(scan_ids, dict):
+        raise ValueError(f"Invalid since_scan_id: {scan_id}; use the scan_id of a get_all_scan_results result")
+    return scan_ids
+
+
+async def load_scan(source: str, name: str, seed: int, since_scan_id: Optional[str] = None,
+                    scan_id: Optional[str] = None) -> Dict[str, Any]:
     """
-    Collect SonarQube scan results for code quality and security analysis.
+    Fetch a full scan and record it, with its finding fingerprints, in the scan store.
 
     Args:
-        project_key: The project identifier in SonarQube
+        source: Scanner to fetch from ("sonar", "fortify" or "nexus")
+        name: Project, application or repository name
+        seed: Seed of the scan
+        since_scan_id: scan_id of an earlier scan of the project; the result is reduced to
+            the findings that changed since then
+        scan_id: scan_id from a page cursor, to read a further page of that scan; it was
+            recorded with its first page
 
     Returns:
-        Dictionary containing SonarQube scan results
+        Dictionary containing the scan result
     """
+    results = await backend.get_scan(source, name, seed, scan_id)
+    if not scan_id:
+        await asyncio.to_thread(lambda: scan_store.record(source, name, results, fingerprint_rows(source, results)))
+    if since_scan_id:
+        results = await asyncio.to_thread(fingerprint_index.apply_delta, source, name, since_scan_id, results)
+    return results
 
-    # Generate random metrics
-    lines_of_code = random.randint(1000, 100000)
-    coverage = round(random.uniform(40, 95), 1)
-
-    # Generate random issues
-    issues = []
-    issue_types = [
-        "Code Smell", "Bug", "Vulnerability", "Security Hotspot",
-        "Maintainability Issue", "Reliability Issue"
-    ]
-
-    for _ in range(random.randint(5, 25)):
-        issues.append({
-            "key": f"sonar-{uuid.uuid4().hex[:8]}",
-            "type": random.choice(issue_types),
-            "severity": generate_random_severity(),
-            "component": f"src/main/java/com/example/{random.choice(['Controller', 'Service', 'Repository', 'Model'])}.java",
-            "line": random.randint(1, 500),
-            "message": random.choice([
-                "Potential SQL injection vulnerability",
-                "Unused import should be removed",
-                "Method complexity is too high",
-                "Hardcoded credentials detected",
-                "Potential XSS vulnerability",
-                "Memory leak possible",
-                "Dead code should be removed"
-            ]),
-            "effort": f"{random.randint(5, 120)}min",
-            "debt": f"{random.randint(1, 8)}h",
-            "created_date": generate_random_date(7)
-        })
-
-    # Generate quality gates
-    quality_gate = {
-        "status": random.choice(["PASSED", "FAILED", "WARNING"]),
-        "conditions": [
-            {
-                "metric": "coverage",
-                "operator": "LT",
-                "threshold": "80.0",
-                "actual_value": str(coverage),
-                "status": "PASSED" if coverage >= 80 else "FAILED"
-            },
-            {
-                "metric": "new_vulnerabilities",
-                "operator": "GT",
-                "threshold": "0",
-                "actual_value": str(len([i for i in issues if i["type"] == "Vulnerability"])),
-                "status": random.choice(["PASSED", "FAILED"])
-            }
-        ]
-    }
 
-    return {
-        "scan_id": f"sonar-{uuid.uuid4().hex}",
-        "project_key": project_key,
-        "project_name": f"Project {project_key.title()}",
-        "scan_date": generate_random_date(1),
-        "status": generate_random_status(),
-        "metrics": {
-            "lines_of_code": lines_of_code,
-            "coverage": coverage,
-            "duplicated_lines_density": round(random.uniform(0, 15), 1),
-            "maintainability_rating": random.choice(["A", "B", "C", "D", "E"]),
-            "reliability_rating": random.choice(["A", "B", "C", "D", "E"]),
-            "security_rating": random.choice(["A", "B", "C", "D", "E"]),
-            "technical_debt": f"{random.randint(1, 50)}h"
-        },
-        "issues": issues,
-        "issue_counts": {
-            "total": len(issues),
-            "critical": len([i for i in issues if i["severity"] == "Critical"]),
-            "high": len([i for i in issues if i["severity"] == "High"]),
-            "medium": len([i for i in issues if i["severity"] == "Medium"]),
-            "low": len([i for i in issues if i["severity"] == "Low"]),
-            "info": len([i for i in issues if i["severity"] == "Info"])
-        },
-        "quality_gate": quality_gate,
-        "dashboard_url": f"https://sonarqube.company.com/dashboard?id={project_key}"
+def meets_severity(severity: str, min_severity: Optional[str]) -> bool:
+    """Check whether a severity is at least as severe as min_severity"""
+    if not min_severity:
+        return True
+    return SEVERITY_RANK.get(severity.lower(), len(SEVERITY_LEVELS)) <= SEVERITY_RANK[min_severity.lower()]
+
+
+def select_findings(results: Dict[str, Any], findings_key: str, seed: int, offset: int,
+                    min_severity: Optional[str] = None, fields: Optional[List[str]] = None,
+                    page_size: Optional[int] = None, nested_key: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Filter, project and page the findings of a scan result in place.
+
+    Summary counts already in the result stay computed over the full data set.
+
+    Args:
+        results: Scan result holding the findings list
+        findings_key: Key of the findings list, e.g. "issues"
+        seed: Seed the scan was generated with, carried in the next cursor with the scan_id
+        offset: Index of the first matching finding to return
+        min_severity: Only return findings at least this severe
+        fields: Finding fields to return; all fields if None
+        page_size: Maximum findings to return; all remaining if None
+        nested_key: Key of nested findings that carry the severity instead, e.g. component vulnerabilities
+
+    Returns:
+        Dictionary with the selected findings and a "page" section holding the next cursor
+    """
+    if min_severity and min_severity.lower() not in SEVERITY_RANK:
+        raise ValueError(f"min_severity must be one of {', '.join(SEVERITY_LEVELS)}")
+
+    matches = []
+    for finding in results[findings_key]:
+        if nested_key:
+            nested = [item for item in finding[nested_key] if meets_severity(item["severity"], min_severity)]
+            if min_severity and not nested:
+                continue
+            finding = {**finding, nested_key: nested}
+        elif not meets_severity(finding["severity"], min_severity):
+            continue
+        matches.append(finding)
+
+    end = len(matches) if page_size is None else offset + max(page_size, 1)
+    page = matches[offset:end]
+    if fields:
+        page = [{field: finding[field] for field in fields if field in finding} for finding in page]
+
+    resolved = results.get("resolved", {}).get(findings_key)
+    if resolved and min_severity and not nested_key:
+        results["resolved"][findings_key] = [finding for finding in resolved
+                                             if meets_severity(finding["severity"], min_severity)]
+
+    results[findings_key] = page
+    results["page"] = {
+        "matching": len(matches),
+        "returned": len(page),
+        "next_cursor": encode_cursor(seed, end, results["scan_id"]) if end < len(matches) else None
     }
+    return results
 
 
 @mcp.tool()
-def get_fortify_scan_results(application_name: str = "default-app") -> Dict[str, Any]:
+async def get_sonar_scan_results(project_key: str = "default-project", min_severity: Optional[str] = None,
+                                 fields: Optional[List[str]] = None, page_size: Optional[int] = None,
+                                 cursor: Optional[str] = None, since_scan_id: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Collect SonarQube scan results for code quality and security analysis.
+
+    Args:
+        project_key: The project identifier in SonarQube
+        min_severity: Only return issues at least this severe (Critical, High, Medium, Low, Info)
+        fields: Issue fields to return, e.g. ["key", "severity", "message"]; all fields if omitted
+        page_size: Maximum issues to return; all matching issues if omitted
+        cursor: The page.next_cursor of a previous call, to fetch the next page of the same scan
+        since_scan_id: The scan_id of an earlier result for the same project; only issues new or
+            changed since that scan are returned, with resolved ones under "resolved" and count
+            changes under "delta"
+
+    Returns:
+        Dictionary containing SonarQube scan results; issue_counts cover all issues
+    """
+    seed, offset, scan_id = decode_cursor(cursor)
+    results = await load_scan("sonar", project_key, seed, since_scan_id, scan_id)
+    return select_findings(results, "issues", seed, offset, min_severity, fields, page_size)
+
+
+@mcp.tool()
+async def get_fortify_scan_results(application_name: str = "default-app", min_severity: Optional[str] = None,
+                                   fields: Optional[List[str]] = None, page_size: Optional[int] = None,
+                                   cursor: Optional[str] = None, since_scan_id: Optional[str] = None) -> Dict[str, Any]:
     """
     Collect Fortify Static Code Analyzer (SCA) scan results for security vulnerabilities.
 
     Args:
         application_name: The application name in Fortify
+        min_severity: Only return vulnerabilities at least this severe (Critical, High, Medium, Low, Info)
+        fields: Vulnerability fields to return, e.g. ["category", "severity", "file_path"]; all fields if omitted
+        page_size: Maximum vulnerabilities to return; all matching vulnerabilities if omitted
+        cursor: The page.next_cursor of a previous call, to fetch the next page of the same scan
+        since_scan_id: The scan_id of an earlier result for the same application; only vulnerabilities
+            new or changed since that scan are returned, with resolved ones under "resolved" and
+            count changes under "delta"
 
     Returns:
-        Dictionary containing Fortify scan results
+        Dictionary containing Fortify scan results; vulnerability_counts and category_breakdown
+        cover all vulnerabilities
     """
-
-    # Generate random vulnerabilities
-    vulnerabilities = []
-    vulnerability_categories = [
-        "Cross-Site Scripting", "SQL Injection", "Path Manipulation",
-        "Command Injection", "LDAP Injection", "XML Injection",
-        "Buffer Overflow", "Resource Injection", "Privacy Violation",
-        "Weak Cryptographic Hash", "Insecure Randomness", "Trust Boundary Violation"
-    ]
-
-    for _ in range(random.randint(3, 20)):
-        vulnerabilities.append({
-            "instance_id": f"fortify-{uuid.uuid4().hex[:8]}",
-            "category": random.choice(vulnerability_categories),
-            "severity": generate_random_severity(),
-            "confidence": random.choice(["High", "Medium", "Low"]),
-            "impact": round(random.uniform(1, 5), 1),
-            "likelihood": round(random.uniform(1, 5), 1),
-            "file_path": f"src/main/java/com/example/{random.choice(['web', 'service', 'dao', 'util'])}/{random.choice(['UserController', 'AuthService', 'DatabaseDAO', 'ValidationUtil'])}.java",
-            "line_number": random.randint(1, 500),
-            "function_name": random.choice(
-                ["authenticate", "processInput", "executeQuery", "validateUser", "encryptData"]),
-            "description": random.choice([
-                "User input is not properly validated before being used in SQL query",
-                "Data from user input is not encoded before output to web page",
-                "File path constructed from user input without proper validation",
-                "Cryptographic hash function is weak and vulnerable to attacks",
-                "Random number generator is not cryptographically secure"
-            ]),
-            "recommendation": "Implement proper input validation and output encoding",
-            "cwe_id": random.choice([79, 89, 22, 78, 90, 91, 120, 134, 311, 330]),
-            "owasp_category": random.choice(["A03:2021", "A02:2021", "A01:2021", "A04:2021", "A06:2021"]),
-            "first_detected": generate_random_date(30),
-            "last_seen": generate_random_date(3)
-        })
-
-    # Generate scan statistics
-    total_files_scanned = random.randint(100, 1000)
-    scan_duration = random.randint(300, 3600)  # seconds
-
-    return {
-        "scan_id": f"fortify-{uuid.uuid4().hex}",
-        "application_name": application_name,
-        "version": f"v{random.randint(1, 10)}.{random.randint(0, 9)}.{random.randint(0, 9)}",
-        "scan_date": generate_random_date(1),
-        "status": generate_random_status(),
-        "scan_statistics": {
-            "total_files_scanned": total_files_scanned,
-            "lines_of_code": random.randint(50000, 500000),
-            "scan_duration_seconds": scan_duration,
-            "scan_duration_formatted": f"{scan_duration // 60}m {scan_duration % 60}s",
-            "fortify_version": f"22.{random.randint(1, 2)}.{random.randint(0, 3)}"
-        },
-        "vulnerabilities": vulnerabilities,
-        "vulnerability_counts": {
-            "total": len(vulnerabilities),
-            "critical": len([v for v in vulnerabilities if v["severity"] == "Critical"]),
-            "high": len([v for v in vulnerabilities if v["severity"] == "High"]),
-            "medium": len([v for v in vulnerabilities if v["severity"] == "Medium"]),
-            "low": len([v for v in vulnerabilities if v["severity"] == "Low"]),
-            "info": len([v for v in vulnerabilities if v["severity"] == "Info"])
-        },
-        "category_breakdown": {
-            category: len([v for v in vulnerabilities if v["category"] == category])
-            for category in set(v["category"] for v in vulnerabilities)
-        },
-        "risk_metrics": {
-            "fortify_priority_order": round(random.uniform(1, 5), 2),
-            "business_criticality": random.choice(["High", "Medium", "Low"]),
-            "overall_risk_score": round(random.uniform(1, 10), 1)
-        },
-        "dashboard_url": f"https://fortify.company.com/ssc/html/ssc/index.jsp#!/version/{random.randint(1000, 9999)}/fix"
-    }
+    seed, offset, scan_id = decode_cursor(cursor)
+    results = await load_scan("fortify", application_name, seed, since_scan_id, scan_id)
+    return select_findings(results, "vulnerabilities", seed, offset, min_severity, fields, page_size)
 
 
 @mcp.tool()
-def get_nexus_scan_results(repository_name: str = "default-repo") -> Dict[str, Any]:
+async def get_nexus_scan_results(repository_name: str = "default-repo", min_severity: Optional[str] = None,
+                                 fields: Optional[List[str]] = None, page_size: Optional[int] = None,
+                                 cursor: Optional[str] = None, since_scan_id: Optional[str] = None) -> Dict[str, Any]:
     """
     Collect Nexus IQ scan results for open source component vulnerabilities and license compliance.
 
     Args:
         repository_name: The repository name in Nexus IQ
+        min_severity: Only return components with vulnerabilities at least this severe, and only those
+            vulnerabilities (Critical, High, Medium, Low, Info)
+        fields: Component fields to return, e.g. ["package_name", "version", "vulnerabilities"]; all fields if omitted
+        page_size: Maximum components to return; all matching components if omitted
+        cursor: The page.next_cursor of a previous call, to fetch the next page of the same scan
+        since_scan_id: The scan_id of an earlier result for the same repository; only components and
+            policy violations new or changed since that scan are returned, with resolved ones under
+            "resolved" and count changes under "delta"
 
     Returns:
-        Dictionary containing Nexus IQ scan results
+        Dictionary containing Nexus IQ scan results; summary, risk_metrics and license_summary
+        cover all components
     """
+    seed, offset, scan_id = decode_cursor(cursor)
+    results = await load_scan("nexus", repository_name, seed, since_scan_id, scan_id)
+    return select_findings(results, "components", seed, offset, min_severity, fields, page_size,
+                           nested_key="vulnerabilities")
 
-    # Generate random components with vulnerabilities
-    components = []
-    component_types = ["maven", "npm", "pypi", "nuget", "docker"]
-
-    for _ in range(random.randint(5, 30)):
-        component_type = random.choice(component_types)
-        if component_type == "maven":
-            component_name = f"org.apache.{random.choice(['commons', 'http', 'logging'])}"
-            package_name = f"{component_name}:{random.choice(['commons-lang3', 'httpclient', 'log4j-core'])}"
-        elif component_type == "npm":
-            package_name = random.choice(['lodash', 'express', 'react', 'axios', 'moment'])
-        elif component_type == "pypi":
-            package_name = random.choice(['requests', 'django', 'flask', 'numpy', 'pandas'])
-        elif component_type == "nuget":
-            package_name = random.choice(['Newtonsoft.Json', 'Microsoft.AspNetCore', 'Serilog'])
-        else:  # docker
-            package_name = random.choice(['alpine', 'ubuntu', 'nginx', 'node', 'python'])
-
-        version = f"{random.randint(1, 5)}.{random.randint(0, 20)}.{random.randint(0, 10)}"
-
-        # Generate vulnerabilities for this component
-        vulnerabilities = []
-        for _ in range(random.randint(0, 5)):
-            vulnerabilities.append({
-                "cve_id": f"CVE-{random.randint(2020, 2024)}-{random.randint(1000, 9999)}",
-                "cvss_score": round(random.uniform(1, 10), 1),
-                "severity": generate_random_severity(),
-                "summary": random.choice([
-                    "Remote code execution vulnerability",
-                    "Cross-site scripting vulnerability",
-                    "Denial of service vulnerability",
-                    "Information disclosure vulnerability",
-                    "Authentication bypass"
-                ]),
-                "published_date": generate_random_date(365),
-                "modified_date": generate_random_date(30)
-            })
-
-        components.append({
-            "component_id": f"{component_type}-{uuid.uuid4().hex[:8]}",
-            "package_name": package_name,
-            "version": version,
-            "type": component_type,
-            "license": random.choice([
-                "Apache-2.0", "MIT", "GPL-3.0", "BSD-3-Clause",
-                "ISC", "LGPL-2.1", "MPL-2.0", "Unlicense", "EPL-1.0"
-            ]),
-            "direct_dependency": random.choice([True, False]),
-            "vulnerabilities": vulnerabilities,
-            "vulnerability_count": len(vulnerabilities),
-            "highest_cvss": max([v["cvss_score"] for v in vulnerabilities]) if vulnerabilities else 0,
-            "policy_violations": random.randint(0, 3),
-            "license_threat_level": random.choice(["None", "Low", "Medium", "High"]),
-            "age_months": random.randint(1, 60)
-        })
-
-    # Generate policy violations
-    policy_violations = []
-    violation_types = ["Security", "License", "Architecture", "Quality"]
-
-    for _ in range(random.randint(0, 10)):
-        policy_violations.append({
-            "violation_id": f"policy-{uuid.uuid4().hex[:8]}",
-            "type": random.choice(violation_types),
-            "severity": generate_random_severity(),
-            "policy_name": random.choice([
-                "Critical Security Policy", "License Compliance Policy",
-                "Architecture Standards", "Component Quality Policy"
-            ]),
-            "component": random.choice(components)["package_name"],
-            "description": random.choice([
-                "Component has critical security vulnerabilities",
-                "License is not approved for commercial use",
-                "Component violates architecture standards",
-                "Component quality metrics below threshold"
-            ]),
-            "detected_date": generate_random_date(14)
-        })
-
-    return {
-        "scan_id": f"nexus-{uuid.uuid4().hex}",
-        "repository_name": repository_name,
-        "application_name": f"App-{repository_name}",
-        "scan_date": generate_random_date(1),
-        "status": generate_random_status(),
-        "stage": random.choice(["develop", "build", "stage-release", "release", "operate"]),
-        "summary": {
-            "total_components": len(components),
-            "components_with_vulnerabilities": len([c for c in components if c["vulnerability_count"] > 0]),
-            "total_vulnerabilities": sum(c["vulnerability_count"] for c in components),
-            "critical_vulnerabilities": len(
-                [c for comp in components for c in comp["vulnerabilities"] if c["severity"] == "Critical"]),
-            "high_vulnerabilities": len(
-                [c for comp in components for c in comp["vulnerabilities"] if c["severity"] == "High"]),
-            "policy_violations": len(policy_violations),
-            "license_issues": len([c for c in components if c["license_threat_level"] in ["Medium", "High"]])
-        },
-        "components": components,
-        "policy_violations": policy_violations,
-        "risk_metrics": {
-            "application_risk_score": round(random.uniform(1, 100), 1),
-            "policy_evaluation": random.choice(["Pass", "Warn", "Fail"]),
-            "open_policy_violations": len([p for p in policy_violations if p["severity"] in ["Critical", "High"]]),
-            "legacy_components": len([c for c in components if c["age_months"] > 24])
-        },
-        "license_summary": {
-            license: len([c for c in components if c["license"] == license])
-            for license in set(c["license"] for c in components)
-        },
-        "dashboard_url": f"https://nexus-iq.company.com/ui/links/application/{repository_name}/report/{uuid.uuid4().hex[:8]}"
-    }
+
+async def collect_source(name: str, collector, *args, timeout: float = None) -> Tuple[str, Optional[Dict[str, Any]], Optional[str]]:
+    """
+    Run one scanner collector, bounded by a timeout.
+
+    Returns:
+        Tuple of source name, results (None on failure) and the error message (None on success)
+    """
+    timeout = SOURCE_TIMEOUT_SECONDS if timeout is None else timeout
+    try:
+        return name, await asyncio.wait_for(collector(*args), timeout), None
+    except asyncio.TimeoutError:
+        return name, None, f"timed out after {timeout}s"
+    except Exception as e:
+        return name, None, str(e)
+
+
+def source_delta(results: Dict[str, Optional[Dict[str, Any]]], name: str, section: str, field: str) -> int:
+    """Change of one summary count of a source since the earlier scan; 0 if it failed or was not compared"""
+    delta = (results[name] or {}).get("delta")
+    return delta["summary_delta"][section].get(field, 0) if delta else 0
 
 
 @mcp.tool()
-def get_all_scan_results(project_identifier: str = "default-project") -> Dict[str, Any]:
+async def get_all_scan_results(project_identifier: str = "default-project",
+                               min_severity: Optional[str] = None,
+                               since_scan_id: Optional[str] = None) -> Dict[str, Any]:
     """
     Collect scan results from all three security tools (Sonar, Fortify, Nexus) for a given project.
 
+    The tools are queried concurrently. A tool that fails or does not answer within the
+    per-source timeout is reported under failed_sources and the result is marked partial.
+
     Args:
         project_identifier: Common project identifier used across all tools
+        min_severity: Only return findings at least this severe (Critical, High, Medium, Low, Info);
+            summary counts always cover all findings
+        since_scan_id: The scan_id of an earlier consolidated result for the project; each tool
+            then returns only what changed since its part of that scan, and "delta" holds the
+            change of the consolidated counts
 
     Returns:
         Dictionary containing consolidated scan results from all tools
     """
+    since = decode_scan_ids(since_scan_id)
+
+    collected = await asyncio.gather(
+        collect_source("sonar", partial(get_sonar_scan_results, since_scan_id=since.get("sonar")),
+                       project_identifier, min_severity),
+        collect_source("fortify", partial(get_fortify_scan_results, since_scan_id=since.get("fortify")),
+                       project_identifier, min_severity),
+        collect_source("nexus", partial(get_nexus_scan_results, since_scan_id=since.get("nexus")),
+                       project_identifier, min_severity)
+    )
+    results = {name: result for name, result, _ in collected}
+    failed_sources = {name: error for name, _, error in collected if error is not None}
+    sonar_results, fortify_results, nexus_results = results["sonar"], results["fortify"], results["nexus"]
 
-    sonar_results = get_sonar_scan_results(project_identifier)
-    fortify_results = get_fortify_scan_results(project_identifier)
-    nexus_results = get_nexus_scan_results(project_identifier)
-
-    # Calculate consolidated metrics
+    # Calculate consolidated metrics over the tools that answered
     total_issues = (
-            sonar_results["issue_counts"]["total"] +
-            fortify_results["vulnerability_counts"]["total"] +
-            nexus_results["summary"]["total_vulnerabilities"]
+            (sonar_results["issue_counts"]["total"] if sonar_results else 0) +
+            (fortify_results["vulnerability_counts"]["total"] if fortify_results else 0) +
+            (nexus_results["summary"]["total_vulnerabilities"] if nexus_results else 0)
     )
 
     critical_issues = (
-            sonar_results["issue_counts"]["critical"] +
-            fortify_results["vulnerability_counts"]["critical"] +
-            nexus_results["summary"]["critical_vulnerabilities"]
+            (sonar_results["issue_counts"]["critical"] if sonar_results else 0) +
+            (fortify_results["vulnerability_counts"]["critical"] if fortify_results else 0) +
+            (nexus_results["summary"]["critical_vulnerabilities"] if nexus_results else 0)
     )
 
-    return {
+    consolidated = {
+        "scan_id": encode_scan_ids({name: result["scan_id"] if result else None for name, result in results.items()}),
         "project_identifier": project_identifier,
         "consolidated_scan_date": datetime.now().isoformat(),
+        "partial": bool(failed_sources),
+        "failed_sources": failed_sources,
         "summary": {
             "total_issues": total_issues,
             "critical_issues": critical_issues,
-            "tools_scanned": 3,
+            "tools_scanned": len(collected) - len(failed_sources),
             "overall_risk_level": "Critical" if critical_issues > 5 else "High" if critical_issues > 0 else "Medium"
         },
         "sonar_results": sonar_results,
@@ -386,6 +337,112 @@ def get_all_scan_results(project_identifier: str = "default-project") -> Dict[st
             "Implement secure coding practices to prevent future issues"
         ]
     }
+    if since_scan_id:
+        consolidated["delta"] = {
+            "since_scan_id": since_scan_id,
+            "summary_delta": {
+                "total_issues": sum(source_delta(results, name, section, total)
+                                    for name, section, total, _ in CONSOLIDATED_COUNTS),
+                "critical_issues": sum(source_delta(results, name, section, critical)
+                                       for name, section, _, critical in CONSOLIDATED_COUNTS)
+            }
+        }
+    return consolidated
+
+
+@mcp.tool()
+async def query_scan_findings(project: Optional[str] = None, tool: Optional[str] = None,
+                              min_severity: Optional[str] = None, cwe_id: Optional[int] = None,
+                              cve_id: Optional[str] = None, file_path: Optional[str] = None,
+                              package: Optional[str] = None, since: Optional[str] = None,
+                              until: Optional[str] = None, latest_only: bool = True,
+                              limit: int = 50, offset: int = 0) -> Dict[str, Any]:
+    """
+    Search the findings of stored scans, across projects, without calling the scanners.
+
+    Every scan returned by the scan tools is stored; findings are Sonar issues, Fortify
+    vulnerabilities, Nexus component vulnerabilities and Nexus policy violations.
+
+    Args:
+        project: Only findings of this project, application or repository
+        tool: Only findings of this tool (sonar, fortify or nexus)
+        min_severity: Only findings at least this severe (Critical, High, Medium, Low, Info)
+        cwe_id: Only findings with this CWE number, e.g. 89
+        cve_id: Only findings with this CVE, e.g. "CVE-2023-1234"
+        file_path: Only findings in files whose path starts with this
+        package: Only Nexus findings in packages starting with this, e.g. "log4j" or "lodash@4"
+        since: Only findings of scans on or after this ISO date
+        until: Only findings of scans before this ISO date
+        latest_only: Only findings of the latest scan of each project and tool; False to search history
+        limit: Maximum findings to return
+        offset: Matching findings to skip, e.g. the next_offset of a previous call
+
+    Returns:
+        Dictionary with the number of matching findings, the findings (newest scan first) and next_offset
+    """
+    return await asyncio.to_thread(scan_store.query, limit, offset, project=project, tool=tool,
+                                   min_severity=min_severity, cwe_id=cwe_id, cve_id=cve_id, file_path=file_path,
+                                   package=package, since=since, until=until, latest_only=latest_only)
+
+
+@mcp.tool()
+async def count_scan_findings(group_by: Optional[List[str]] = None, project: Optional[str] = None,
+                              tool: Optional[str] = None, min_severity: Optional[str] = None,
+                              cwe_id: Optional[int] = None, cve_id: Optional[str] = None,
+                              file_path: Optional[str] = None, package: Optional[str] = None,
+                              since: Optional[str] = None, until: Optional[str] = None,
+                              latest_only: bool = True) -> Dict[str, Any]:
+    """
+    Count the findings of stored scans, grouped by columns, without calling the scanners.
+
+    Args:
+        group_by: Columns to group by: project, tool, severity, cwe_id, cve_id, file_path,
+            package, category; defaults to ["project"]
+        project: Only findings of this project, application or repository
+        tool: Only findings of this tool (sonar, fortify or nexus)
+        min_severity: Only findings at least this severe (Critical, High, Medium, Low, Info)
+        cwe_id: Only findings with this CWE number, e.g. 89
+        cve_id: Only findings with this CVE, e.g. "CVE-2023-1234"
+        file_path: Only findings in files whose path starts with this
+        package: Only Nexus findings in packages starting with this
+        since: Only findings of scans on or after this ISO date
+        until: Only findings of scans before this ISO date
+        latest_only: Only findings of the latest scan of each project and tool; False to count history
+
+    Returns:
+        Dictionary with the total and the finding count of each group, largest first
+    """
+    return await asyncio.to_thread(scan_store.count, group_by or ["project"], project=project, tool=tool,
+                                   min_severity=min_severity, cwe_id=cwe_id, cve_id=cve_id, file_path=file_path,
+                                   package=package, since=since, until=until, latest_only=latest_only)
+
+
+@mcp.tool()
+async def get_scan_history(project: str, tool: Optional[str] = None, limit: int = 20) -> Dict[str, Any]:
+    """
+    List the stored scans of a project with their summaries, newest first, without calling the scanners.
+
+    Args:
+        project: Project, application or repository name
+        tool: Only scans of this tool (sonar, fortify or nexus); all tools if omitted
+        limit: Maximum scans to return
+
+    Returns:
+        Dictionary with the project and its scans; recent scan_ids can be passed as since_scan_id
+    """
+    return {"project": project, "scans": await asyncio.to_thread(scan_store.history, project, tool, limit)}
+
+
+@mcp.tool()
+def get_scan_backend_metrics() -> Dict[str, Any]:
+    """
+    Get page fetch metrics of the scanner backend.
+
+    Returns:
+        Dictionary with the backend name and, for HTTP backends, request, retry and error
+        counts, pages and findings per second and page latency percentiles
+    """
+    return backend.get_metrics()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,396 @@
+#!/usr/bin/env python3
+"""
+Persistent store of scan results for historical queries.
+
+Every scan the scan tools fetch is kept in a SQLite database, one row per finding
+(Sonar issue, Fortify vulnerability, Nexus component vulnerability or policy violation)
+with the columns questions are asked about: project, tool, severity, CWE, CVE, file path
+or package and scan date. Covering indexes lead with each of those columns, so filtered
+counts are answered from an index alone and filtered listings touch only the rows they
+return. Each project and tool's most recently recorded scan is flagged latest, so "current"
+questions skip superseded scans without a join; latest follows the order scans were
+fetched in, not the scanner's scan_date. Only the most recently recorded scans of each
+project and tool are kept, so the file stops growing once every project has that many.
+
+The same database holds the fingerprints of each scan's findings that the delta mode of
+the scan tools compares against (see scan_fingerprint_index.py), written in the same
+transaction and expired with the scan.
+
+Populate a store with generated scans with:
+    python mcp_servers/scan_store.py --projects 200 --scans 3 --scale 10
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from scan_data_generator import SEVERITY_LEVELS, ScanDataGenerator
+
+DEFAULT_STORE_PATH = os.path.join(os.path.expanduser("~"), ".cache", "devops_agent", "scan_results.db")
+
+# Summary sections kept with each scan, per tool
+SUMMARY_SECTIONS = {
+    "sonar": ("metrics", "issue_counts", "quality_gate"),
+    "fortify": ("vulnerability_counts", "category_breakdown", "risk_metrics"),
+    "nexus": ("summary", "risk_metrics", "license_summary"),
+}
+
+FINDING_COLUMNS = ("scan_id", "project", "tool", "scan_date", "latest", "severity", "cwe_id", "cve_id",
+                   "file_path", "package", "category", "line", "finding_id", "title")
+
+# Columns findings can be counted by
+GROUP_COLUMNS = ("project", "tool", "severity", "cwe_id", "cve_id", "file_path", "package", "category")
+
+# Stored in PRAGMA user_version; a database of another version is a stale cache and is reset
+SCHEMA_VERSION = 2
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS scans (
+    scan_id TEXT PRIMARY KEY,
+    project TEXT NOT NULL,
+    tool TEXT NOT NULL,
+    scan_date TEXT NOT NULL,
+    recorded_at TEXT NOT NULL,
+    latest INTEGER NOT NULL,
+    summary TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS scans_by_project ON scans (project, tool, recorded_at);
+CREATE TABLE IF NOT EXISTS fingerprints (
+    scan_id TEXT NOT NULL,
+    findings_key TEXT NOT NULL,
+    fingerprint TEXT NOT NULL,
+    content_hash TEXT NOT NULL,
+    finding TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS fingerprints_by_scan ON fingerprints (scan_id);
+CREATE TABLE IF NOT EXISTS findings (
+    scan_id TEXT NOT NULL,
+    project TEXT NOT NULL,
+    tool TEXT NOT NULL,
+    scan_date TEXT NOT NULL,
+    latest INTEGER NOT NULL,
+    severity TEXT,
+    cwe_id INTEGER,
+    cve_id TEXT,
+    file_path TEXT,
+    package TEXT,
+    category TEXT,
+    line INTEGER,
+    finding_id TEXT,
+    title TEXT
+);
+CREATE INDEX IF NOT EXISTS findings_by_scan ON findings (scan_id);
+CREATE INDEX IF NOT EXISTS findings_by_project ON findings (project, tool, latest, severity, scan_date);
+CREATE INDEX IF NOT EXISTS findings_by_severity ON findings (severity, latest, scan_date, project, tool);
+CREATE INDEX IF NOT EXISTS findings_by_date ON findings (scan_date, tool, severity, latest, project);
+CREATE INDEX IF NOT EXISTS findings_by_cwe ON findings (cwe_id, severity, latest, scan_date, project, tool)
+    WHERE cwe_id IS NOT NULL;
+CREATE INDEX IF NOT EXISTS findings_by_cve ON findings (cve_id, severity, latest, scan_date, project, tool)
+    WHERE cve_id IS NOT NULL;
+CREATE INDEX IF NOT EXISTS findings_by_file ON findings (file_path, severity, latest, scan_date, project, tool)
+    WHERE file_path IS NOT NULL;
+CREATE INDEX IF NOT EXISTS findings_by_package ON findings (package, severity, latest, scan_date, project, tool)
+    WHERE package IS NOT NULL;
+"""
+
+
+def finding_rows(tool: str, results: Dict[str, Any]) -> Iterator[Tuple[Any, ...]]:
+    """
+    Flatten the findings of a full scan result into finding columns.
+
+    Yields tuples of severity, cwe_id, cve_id, file_path, package, category, line,
+    finding_id and title.
+    """
+    if tool == "sonar":
+        for issue in results.get("issues", []):
+            yield (issue["severity"], None, None, issue["component"], None, issue["type"],
+                   issue["line"], issue["key"], issue["message"])
+    elif tool == "fortify":
+        for vulnerability in results.get("vulnerabilities", []):
+            yield (vulnerability["severity"], vulnerability["cwe_id"], None, vulnerability["file_path"], None,
+                   vulnerability["category"], vulnerability["line_number"], vulnerability["instance_id"],
+                   vulnerability["description"])
+    elif tool == "nexus":
+        for component in results.get("components", []):
+            package = f"{component['package_name']}@{component['version']}"
+            for vulnerability in component["vulnerabilities"]:
+                yield (vulnerability["severity"], None, vulnerability["cve_id"], None, package, component["type"],
+                       None, f"{component['component_id']}:{vulnerability['cve_id']}", vulnerability["summary"])
+        for violation in results.get("policy_violations", []):
+            yield (violation["severity"], None, None, None, violation["component"], violation["type"],
+                   None, violation["violation_id"], violation["policy_name"])
+    else:
+        raise ValueError(f"Unknown tool: {tool}")
+
+
+class ScanResultStore:
+    """SQLite store of scan results and their findings, shared by the tool calls of a server process"""
+
+    def __init__(self, path: Optional[str] = None, retention: int = 20):
+        """
+        Initialize the store; the database is opened on first use.
+
+        Args:
+            path: Database file; SCAN_STORE_PATH or a file under ~/.cache if None
+            retention: Scans kept per project and tool before the oldest is dropped
+        """
+        self.path = path or os.environ.get("SCAN_STORE_PATH", DEFAULT_STORE_PATH)
+        self.retention = retention
+        self._connection: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            if self.path != ":memory:":
+                os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            # Several server processes may share the file; WAL lets readers run alongside a writer
+            connection = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            if connection.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+                connection.executescript(f"""
+                    DROP TABLE IF EXISTS scans;
+                    DROP TABLE IF EXISTS findings;
+                    DROP TABLE IF EXISTS fingerprints;
+                    PRAGMA user_version = {SCHEMA_VERSION};
+                """)
+            connection.executescript(SCHEMA)
+            self._connection = connection
+        return self._connection
+
+    def record(self, tool: str, project: str, results: Dict[str, Any],
+               fingerprints: Iterable[Tuple[str, str, str, str]] = ()) -> bool:
+        """
+        Store a full scan result, unless its scan_id is already stored.
+
+        The scan becomes the latest of its project and tool.
+
+        Args:
+            tool: Scanner the result comes from ("sonar", "fortify" or "nexus")
+            project: Project, application or repository name of the scan
+            results: Scan result holding the full findings lists
+            fingerprints: Rows of findings_key, fingerprint, content hash and finding JSON
+                kept for delta comparisons (see scan_fingerprint_index.fingerprint_rows)
+
+        Returns:
+            bool: True if the scan was stored, False if it already was
+        """
+        scan_id, scan_date = results["scan_id"], results["scan_date"]
+        summary = json.dumps({section: results.get(section) for section in SUMMARY_SECTIONS[tool]})
+        findings = list(finding_rows(tool, results))
+
+        with self._lock:
+            connection = self._connect()
+            with connection:
+                if connection.execute("SELECT 1 FROM scans WHERE scan_id = ?", (scan_id,)).fetchone():
+                    return False
+                previous = connection.execute(
+                    "SELECT scan_id FROM scans WHERE project = ? AND tool = ? AND latest = 1",
+                    (project, tool)).fetchone()
+                if previous:
+                    connection.execute("UPDATE scans SET latest = 0 WHERE scan_id = ?", previous)
+                    connection.execute("UPDATE findings SET latest = 0 WHERE scan_id = ?", previous)
+
+                connection.execute("INSERT INTO scans VALUES (?, ?, ?, ?, ?, 1, ?)",
+                                   (scan_id, project, tool, scan_date, datetime.now().isoformat(), summary))
+                connection.executemany(
+                    f"INSERT INTO findings ({', '.join(FINDING_COLUMNS)}) "
+                    f"VALUES ({', '.join('?' * len(FINDING_COLUMNS))})",
+                    ((scan_id, project, tool, scan_date, 1, *row) for row in findings))
+                connection.executemany("INSERT INTO fingerprints VALUES (?, ?, ?, ?, ?)",
+                                       ((scan_id, *row) for row in fingerprints))
+
+                expired = [row[0] for row in connection.execute(
+                    "SELECT scan_id FROM scans WHERE project = ? AND tool = ? "
+                    "ORDER BY recorded_at DESC LIMIT -1 OFFSET ?", (project, tool, self.retention))]
+                for expired_id in expired:
+                    for table in ("findings", "fingerprints", "scans"):
+                        connection.execute(f"DELETE FROM {table} WHERE scan_id = ?", (expired_id,))
+            self._refresh_statistics(connection)
+        return True
+
+    def _refresh_statistics(self, connection: sqlite3.Connection):
+        """
+        Re-analyze the findings each time the table has doubled since the last analysis.
+
+        Without statistics the planner cannot tell a selective index column (project, CWE)
+        from one with two values (latest) and may walk the wrong covering index. Doubling
+        keeps the cost of analysis to a constant per stored finding.
+        """
+        rows = connection.execute("SELECT MAX(rowid) FROM findings").fetchone()[0] or 0
+        try:
+            stat = connection.execute(
+                "SELECT stat FROM sqlite_stat1 WHERE tbl = 'findings' AND idx = 'findings_by_scan'").fetchone()
+        except sqlite3.OperationalError:  # Never analyzed
+            stat = None
+        analyzed = int(stat[0].split()[0]) if stat else 0
+        if rows >= max(2 * analyzed, 1000):
+            connection.execute("ANALYZE")
+            connection.commit()
+
+    @staticmethod
+    def _where(project: Optional[str] = None, tool: Optional[str] = None, min_severity: Optional[str] = None,
+               cwe_id: Optional[int] = None, cve_id: Optional[str] = None, file_path: Optional[str] = None,
+               package: Optional[str] = None, since: Optional[str] = None, until: Optional[str] = None,
+               latest_only: bool = True) -> Tuple[str, List[Any]]:
+        """Build the WHERE clause of the finding filters, in terms the indexes can serve"""
+        clauses, params = [], []
+        for column, value in (("project", project), ("tool", tool), ("cwe_id", cwe_id), ("cve_id", cve_id)):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        if min_severity:
+            levels = [level.lower() for level in SEVERITY_LEVELS]
+            if min_severity.lower() not in levels:
+                raise ValueError(f"min_severity must be one of {', '.join(SEVERITY_LEVELS)}")
+            severities = SEVERITY_LEVELS[:levels.index(min_severity.lower()) + 1]
+            clauses.append(f"severity IN ({', '.join('?' * len(severities))})")
+            params.extend(severities)
+        # Prefix matches as ranges, which use the index where LIKE would not
+        for column, prefix in (("file_path", file_path), ("package", package)):
+            if prefix:
+                clauses.append(f"{column} >= ? AND {column} < ?")
+                params.extend([prefix, prefix + "\U0010ffff"])
+        if since:
+            clauses.append("scan_date >= ?")
+            params.append(since)
+        if until:
+            clauses.append("scan_date < ?")
+            params.append(until)
+        if latest_only:
+            clauses.append("latest = 1")
+        return " AND ".join(clauses) or "1", params
+
+    def query(self, limit: int = 50, offset: int = 0, **filters: Any) -> Dict[str, Any]:
+        """
+        List stored findings, newest scan first.
+
+        Args:
+            limit: Maximum findings to return
+            offset: Matching findings to skip
+            **filters: project, tool, min_severity, cwe_id, cve_id, file_path (prefix),
+                package (prefix), since, until (ISO dates) and latest_only
+
+        Returns:
+            Dictionary with the total matching, the findings and the next offset
+        """
+        where, params = self._where(**filters)
+        start = time.perf_counter()
+        with self._lock:
+            connection = self._connect()
+            total = connection.execute(f"SELECT COUNT(*) FROM findings WHERE {where}", params).fetchone()[0]
+            rows = connection.execute(
+                f"SELECT {', '.join(FINDING_COLUMNS)} FROM findings WHERE {where} "
+                f"ORDER BY scan_date DESC, rowid LIMIT ? OFFSET ?", [*params, limit, offset]).fetchall()
+
+        findings = [{column: value for column, value in zip(FINDING_COLUMNS, row) if value is not None}
+                    for row in rows]
+        return {
+            "matching": total,
+            "returned": len(findings),
+            "next_offset": offset + len(findings) if offset + len(findings) < total else None,
+            "findings": findings,
+            "query_ms": round((time.perf_counter() - start) * 1000, 2)
+        }
+
+    def count(self, group_by: Sequence[str] = ("project",), **filters: Any) -> Dict[str, Any]:
+        """
+        Count stored findings, grouped by columns.
+
+        Args:
+            group_by: Columns to group by, from GROUP_COLUMNS
+            **filters: The filters of query
+
+        Returns:
+            Dictionary with the total and the count of each group, largest first
+        """
+        unknown = [column for column in group_by if column not in GROUP_COLUMNS]
+        if unknown:
+            raise ValueError(f"Cannot group by {', '.join(unknown)}; use {', '.join(GROUP_COLUMNS)}")
+        where, params = self._where(**filters)
+        columns = ", ".join(group_by)
+        start = time.perf_counter()
+        with self._lock:
+            rows = self._connect().execute(
+                f"SELECT {columns + ', ' if group_by else ''}COUNT(*) AS findings FROM findings WHERE {where} "
+                f"{'GROUP BY ' + columns if group_by else ''} ORDER BY findings DESC", params).fetchall()
+
+        groups = [{**dict(zip(group_by, row[:-1])), "findings": row[-1]} for row in rows]
+        return {
+            "total": sum(group["findings"] for group in groups),
+            "groups": groups,
+            "query_ms": round((time.perf_counter() - start) * 1000, 2)
+        }
+
+    def fingerprints(self, scan_id: str) -> Optional[Tuple[str, str, Dict[str, Any], List[Tuple[str, str, str, str]]]]:
+        """
+        Get a stored scan's finding fingerprints.
+
+        Args:
+            scan_id: scan_id of the scan
+
+        Returns:
+            Tuple of the tool, project, summary and rows of findings_key, fingerprint,
+            content hash and finding JSON; None if the scan is not stored
+        """
+        with self._lock:
+            connection = self._connect()
+            scan = connection.execute("SELECT tool, project, summary FROM scans WHERE scan_id = ?",
+                                      (scan_id,)).fetchone()
+            if scan is None:
+                return None
+            rows = connection.execute(
+                "SELECT findings_key, fingerprint, content_hash, finding FROM fingerprints WHERE scan_id = ?",
+                (scan_id,)).fetchall()
+        return scan[0], scan[1], json.loads(scan[2]), rows
+
+    def history(self, project: str, tool: Optional[str] = None, limit: int = 20) -> List[Dict[str, Any]]:
+        """
+        List the stored scans of a project, most recently recorded first, with their summaries.
+
+        Args:
+            project: Project, application or repository name
+            tool: Only scans of this tool; all tools if None
+            limit: Maximum scans to return
+
+        Returns:
+            List of scans with scan_id, tool, scan_date, latest and summary
+        """
+        where, params = self._where(project=project, tool=tool, latest_only=False)
+        with self._lock:
+            rows = self._connect().execute(
+                f"SELECT scan_id, tool, scan_date, latest, summary FROM scans WHERE {where} "
+                f"ORDER BY recorded_at DESC LIMIT ?", [*params, limit]).fetchall()
+        return [{"scan_id": scan_id, "tool": tool, "scan_date": scan_date, "latest": bool(latest),
+                 "summary": json.loads(summary)} for scan_id, tool, scan_date, latest, summary in rows]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--path", default=None, help="Store database; SCAN_STORE_PATH or ~/.cache by default")
+    parser.add_argument("--projects", type=int, default=100, help="Projects to generate scans of")
+    parser.add_argument("--scans", type=int, default=1, help="Scans per project and tool")
+    parser.add_argument("--scale", type=float, default=1.0, help="Multiplier of the findings per scan")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the first scan")
+    parser.add_argument("--retention", type=int, default=20, help="Scans kept per project and tool")
+    args = parser.parse_args()
+
+    store = ScanResultStore(args.path, args.retention)
+    start = time.perf_counter()
+    for scan in range(args.scans):
+        generator = ScanDataGenerator(args.seed + scan, args.scale, churn=0.1)
+        for index in range(args.projects):
+            project = f"project-{index:05d}"
+            for tool in SUMMARY_SECTIONS:
+                store.record(tool, project, getattr(generator, f"{tool}_scan_results")(project))
+    totals = store.count(group_by=["tool"], latest_only=False)
+    print(f"{store.path}: {totals['total']:,} findings stored in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+import threading
+from typing import Dict, Tuple
+
+from modules.agent_resolver import BedrockAgentResolver
+
+
+class AgentCatalog:
+    """
+    Process-wide catalog of the agents offered in the sidebar.
+
+    The mapping from display name to (config key, agent name, agent type) is computed once
+    per agent index refresh or configuration change and shared by every session, so
+    rendering the sidebar does not call Bedrock or rescan the agent list.
+    """
+
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self, agent_resolver: BedrockAgentResolver):
+        """
+        Initialize the agent catalog.
+
+        Args:
+            agent_resolver: Shared resolver providing the cached Bedrock agent names
+        """
+        self.agent_resolver = agent_resolver
+        self._options: Dict[str, Tuple[str, str, str]] = {}
+        self._built_for = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def get_instance(cls, agent_resolver: BedrockAgentResolver) -> "AgentCatalog":
+        """Return the catalog shared by every session in this process"""
+        if cls._instance is None:
+            with cls._instance_lock:
+                if cls._instance is None:
+                    cls._instance = cls(agent_resolver)
+        return cls._instance
+
+    def get_options(self, config: Dict) -> Dict[str, Tuple[str, str, str]]:
+        """
+        Get the selectable agents for the given configuration.
+
+        Args:
+            config: Application configuration dictionary
+
+        Returns:
+            Dict: Display name mapped to (config key, agent name, agent type)
+        """
+        agent_names = self.agent_resolver.get_agent_names()
+        built_for = (self.agent_resolver.version,
+                     tuple((key, values['name'], values['type']) for key, values in config.items()))
+
+        if built_for != self._built_for:
+            with self._lock:
+                if built_for != self._built_for:
+                    self._options = self._build_options(config, agent_names)
+                    self._built_for = built_for
+
+        return self._options
+
+    @staticmethod
+    def _build_options(config: Dict, agent_names) -> Dict[str, Tuple[str, str, str]]:
+        options = {values['name']: (key, values['name'], values['type'])
+                   for key, values in config.items() if values['type'] == 'mcp'}
+
+        # Bedrock agents are matched to the config key contained in their name
+        for agent in agent_names:
+            for key, values in config.items():
+                if key in agent:
+                    options[values['name']] = (key, agent, values['type'])
+
+        return options
@@ -0,0 +1,176 @@
+import logging
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class BedrockAgentResolver:
+    """
+    Resolves Bedrock agent names to agent and alias IDs from a process-wide cached index.
+
+    The index is built from every page of ``list_agents`` and shared by all sessions. Alias
+    IDs are looked up on first use and kept in the index. Once the TTL expires the stale
+    index keeps serving requests while a background thread refreshes it, and a name that
+    is not in the index forces a (rate-limited) refresh before it is reported missing.
+    """
+
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self, bedrock_agent_client, ttl: float = 300.0, min_refresh_interval: float = 10.0):
+        """
+        Initialize the resolver.
+
+        Args:
+            bedrock_agent_client: Boto3 client for the 'bedrock-agent' service
+            ttl: Seconds before the index is refreshed in the background
+            min_refresh_interval: Minimum seconds between refreshes forced by a miss
+        """
+        self.bedrock_agent_client = bedrock_agent_client
+        self.ttl = ttl
+        self.min_refresh_interval = min_refresh_interval
+
+        self._agent_ids: Dict[str, str] = {}
+        self._alias_ids: Dict[str, str] = {}
+        self._loaded_at = 0.0
+        self._version = 0
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._refreshing = False
+
+    @classmethod
+    def get_instance(cls, bedrock_agent_client) -> "BedrockAgentResolver":
+        """Return the resolver shared by every session in this process"""
+        if cls._instance is None:
+            with cls._instance_lock:
+                if cls._instance is None:
+                    cls._instance = cls(bedrock_agent_client)
+        return cls._instance
+
+    @property
+    def version(self) -> int:
+        """Counter incremented every time the index is rebuilt"""
+        return self._version
+
+    def get_agent_names(self) -> List[str]:
+        """
+        Retrieve the names of all available agents.
+
+        Returns:
+            list: Agent names in listing order
+        """
+        self._ensure_fresh()
+        return list(self._agent_ids)
+
+    def resolve(self, agent_name: str) -> Tuple[str, str]:
+        """
+        Resolve an agent name to its agent ID and 'latest' alias ID.
+
+        Args:
+            agent_name: Name (or part of the name) of the agent to find
+
+        Returns:
+            Tuple[str, str]: Agent ID and agent alias ID
+
+        Raises:
+            ValueError: If the agent or its alias is not found
+        """
+        self._ensure_fresh()
+
+        agent_id = self._find_agent_id(agent_name)
+        if agent_id is None and self._refresh_on_miss():
+            agent_id = self._find_agent_id(agent_name)
+        if agent_id is None:
+            raise ValueError(f"Agent {agent_name} not found")
+
+        alias_id = self._alias_ids.get(agent_id)
+        if alias_id is None:
+            alias_id = self._load_alias_id(agent_id)
+            if alias_id is None:
+                raise ValueError(f"Alias for agent {agent_name} not found")
+            with self._lock:
+                self._alias_ids[agent_id] = alias_id
+
+        return agent_id, alias_id
+
+    def invalidate(self):
+        """Drop the cached index so the next lookup reloads it"""
+        with self._lock:
+            self._loaded_at = 0.0
+
+    def _find_agent_id(self, agent_name: str) -> Optional[str]:
+        agent_ids = self._agent_ids
+        if agent_name in agent_ids:
+            return agent_ids[agent_name]
+
+        # Keep the historical partial-name matching for configured agent keys
+        for name, agent_id in agent_ids.items():
+            if agent_name in name:
+                return agent_id
+        return None
+
+    def _ensure_fresh(self):
+        if not self._loaded_at:
+            with self._refresh_lock:
+                if not self._loaded_at:
+                    self._load()
+        elif time.monotonic() - self._loaded_at > self.ttl:
+            self._refresh_in_background()
+
+    def _refresh_on_miss(self) -> bool:
+        if time.monotonic() - self._loaded_at < self.min_refresh_interval:
+            return False
+        self.refresh()
+        return True
+
+    def _refresh_in_background(self):
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+
+        def run():
+            try:
+                self.refresh()
+            except Exception as e:
+                logger.error(f"Background refresh of Bedrock agent index failed: {e}")
+            finally:
+                self._refreshing = False
+
+        threading.Thread(target=run, name="bedrock-agent-resolver", daemon=True).start()
+
+    def refresh(self):
+        """Rebuild the name to ID index from every page of list_agents"""
+        with self._refresh_lock:
+            self._load()
+
+    def _load(self):
+        agent_ids = {}
+        for page in self.bedrock_agent_client.get_paginator('list_agents').paginate():
+            for agent in page.get('agentSummaries', []):
+                agent_ids.setdefault(agent['agentName'], agent['agentId'])
+
+        # Re-resolve aliases only for agents that have been used, off the request path
+        alias_ids = {}
+        for agent_id in set(self._alias_ids) & set(agent_ids.values()):
+            alias_id = self._load_alias_id(agent_id)
+            if alias_id is not None:
+                alias_ids[agent_id] = alias_id
+
+        with self._lock:
+            self._agent_ids = agent_ids
+            self._alias_ids = alias_ids
+            self._loaded_at = time.monotonic()
+            self._version += 1
+
+        logger.info(f"Loaded {len(agent_ids)} Bedrock agents into the resolver index")
+
+    def _load_alias_id(self, agent_id: str) -> Optional[str]:
+        paginator = self.bedrock_agent_client.get_paginator('list_agent_aliases')
+        for page in paginator.paginate(agentId=agent_id):
+            for alias in page.get('agentAliasSummaries', []):
+                if 'latest' in alias['agentAliasName']:
+                    return alias['agentAliasId']
+        return None
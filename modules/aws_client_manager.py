@@ -1,9 +1,140 @@
 import os
+import threading
+import time
+from typing import Dict, Any
 
 import boto3
 from botocore.config import Config
 
 
+class AWSClientFactory:
+    """
+    Process-wide factory of shared boto3 clients.
+
+    Clients are created once per service and region and reused by every session, so warm
+    HTTPS connections survive Streamlit reruns. Connection pools are sized for concurrent
+    users, TCP keepalive is enabled and retries use the adaptive mode, which also applies
+    client-side rate limiting when Bedrock throttles.
+    """
+
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self, max_pool_connections: int = 50, max_attempts: int = 5):
+        """
+        Initialize the client factory.
+
+        Args:
+            max_pool_connections: Maximum pooled HTTPS connections per client
+            max_attempts: Maximum attempts per call, including the first one
+        """
+        self.boto3_config = Config(
+            read_timeout=1000,
+            max_pool_connections=max_pool_connections,
+            tcp_keepalive=True,
+            retries={'mode': 'adaptive', 'total_max_attempts': max_attempts}
+        )
+        self._clients: Dict[tuple, Any] = {}
+        self._metrics: Dict[tuple, Dict[str, float]] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def get_instance(cls) -> "AWSClientFactory":
+        """Return the factory shared by every session in this process"""
+        if cls._instance is None:
+            with cls._instance_lock:
+                if cls._instance is None:
+                    cls._instance = cls(
+                        max_pool_connections=int(os.environ.get('AWS_MAX_POOL_CONNECTIONS', 50)),
+                        max_attempts=int(os.environ.get('AWS_MAX_ATTEMPTS', 5))
+                    )
+        return cls._instance
+
+    def get_client(self, service_name: str, region: str):
+        """
+        Get the shared client for a service, creating it on first use.
+
+        Args:
+            service_name: AWS service name, e.g. 'bedrock-runtime'
+            region: AWS region of the client
+
+        Returns:
+            boto3.client: Shared, thread-safe boto3 client
+        """
+        key = (service_name, region)
+        client = self._clients.get(key)
+        if client is None:
+            with self._lock:
+                client = self._clients.get(key)
+                if client is None:
+                    client = boto3.client(service_name, region, config=self.boto3_config)
+                    self._register_metrics(client, key)
+                    self._clients[key] = client
+        return client
+
+    def _register_metrics(self, client, key: tuple):
+        metrics = self._metrics.setdefault(key, {
+            'calls': 0, 'errors': 0, 'retries': 0, 'total_latency_seconds': 0.0
+        })
+
+        def before_call(context, **kwargs):
+            context['metrics_start_time'] = time.monotonic()
+
+        def after_call(http_response, parsed, context, **kwargs):
+            with self._lock:
+                metrics['calls'] += 1
+                metrics['total_latency_seconds'] += time.monotonic() - context.get('metrics_start_time',
+                                                                                   time.monotonic())
+                metrics['retries'] += parsed.get('ResponseMetadata', {}).get('RetryAttempts', 0)
+                if http_response.status_code >= 400:
+                    metrics['errors'] += 1
+
+        def after_call_error(context, **kwargs):
+            with self._lock:
+                metrics['calls'] += 1
+                metrics['errors'] += 1
+
+        client.meta.events.register('before-call', before_call)
+        client.meta.events.register('after-call', after_call)
+        client.meta.events.register('after-call-error', after_call_error)
+
+    def get_metrics(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get call and connection pool metrics for every shared client.
+
+        Returns:
+            Dict: Per service call counts, retries, average latency and, where available,
+            the connections created and currently idle in each HTTPS pool
+        """
+        result = {}
+        with self._lock:
+            for (service_name, region), client in self._clients.items():
+                metrics = dict(self._metrics.get((service_name, region), {}))
+                calls = metrics.get('calls', 0)
+                metrics['average_latency_seconds'] = metrics.get('total_latency_seconds', 0.0) / calls if calls else 0.0
+                metrics['max_pool_connections'] = self.boto3_config.max_pool_connections
+                metrics['pools'] = self._get_pool_stats(client)
+                result[f"{service_name}:{region}"] = metrics
+        return result
+
+    @staticmethod
+    def _get_pool_stats(client) -> Dict[str, Dict[str, int]]:
+        # botocore does not expose its urllib3 pools publicly; report them when reachable
+        try:
+            pools = client._endpoint.http_session._manager.pools
+            stats = {}
+            for pool_key in pools.keys():
+                pool = pools[pool_key]
+                stats[f"{pool.host}:{pool.port}"] = {
+                    'connections_created': pool.num_connections,
+                    'requests': pool.num_requests,
+                    'idle_connections': pool.pool.qsize() if pool.pool else 0
+                }
+            return stats
+        except (AttributeError, KeyError):
+            return {}
+
+
 class AWSClientManager:
     """
     Manages AWS client connections for Bedrock services.
@@ -13,29 +144,25 @@ class AWSClientManager:
         """
         Initialize AWS client connections with appropriate configuration.
 
+        Clients come from the process-wide AWSClientFactory, so creating a manager on every
+        Streamlit rerun is cheap and reuses warm connections.
+
         Attributes:
-            boto3_config (Config): Configuration object for boto3 with a custom read timeout.
             region (str): AWS region retrieved from the 'AWS_REGION' environment variable.
             bedrock_client (boto3.client): Boto3 client for interacting with the 'bedrock-agent-runtime' service.
             bedrock_agent_client (boto3.client): Boto3 client for interacting with the 'bedrock-agent' service.
+            bedrock_runtime_client (boto3.client): Boto3 client for interacting with the 'bedrock-runtime' service.
 
         Raises:
             EnvironmentError: If the 'AWS_REGION' environment variable is not set.
         """
 
-        self.boto3_config = Config(read_timeout=1000)
+        self.client_factory = AWSClientFactory.get_instance()
+        self.boto3_config = self.client_factory.boto3_config
         self.region = os.environ.get('AWS_REGION')
         if not self.region:
             raise EnvironmentError("AWS_REGION environment variable is not set")
 
-        self.bedrock_client = boto3.client(
-            'bedrock-agent-runtime',
-            self.region,
-            config=self.boto3_config
-        )
-
-        self.bedrock_agent_client = boto3.client(
-            'bedrock-agent',
-            self.region,
-            config=self.boto3_config
-        )
+        self.bedrock_client = self.client_factory.get_client('bedrock-agent-runtime', self.region)
+        self.bedrock_agent_client = self.client_factory.get_client('bedrock-agent', self.region)
+        self.bedrock_runtime_client = self.client_factory.get_client('bedrock-runtime', self.region)
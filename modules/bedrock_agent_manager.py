@@ -1,10 +1,12 @@
-import time
-from typing import Optional, Dict
+from typing import Optional, Dict, List
 
 import streamlit as st
 
+from modules.agent_resolver import BedrockAgentResolver
 from modules.aws_client_manager import AWSClientManager
+from modules.conversation_window import ConversationWindow
 from modules.mcp_client import MCPBedrockClient
+from modules.progress_channel import ProgressEvent
 
 
 class BedrockAgentManager:
@@ -21,18 +23,21 @@ class BedrockAgentManager:
         """
         self.bedrock_client = aws_clients.bedrock_client
         self.bedrock_agent_client = aws_clients.bedrock_agent_client
-        self.mcp_client = MCPBedrockClient(region_name=aws_clients.region)
+        self.agent_resolver = BedrockAgentResolver.get_instance(self.bedrock_agent_client)
+        self.mcp_client = MCPBedrockClient(region_name=aws_clients.region,
+                                           bedrock_client=aws_clients.bedrock_runtime_client)
         self.placeholder = None
+        self.stream_placeholder = None
+        self.streamed_text = ''
 
     def get_agent_list(self):
         """
-        Retrieve a list of available agents.
+        Retrieve a list of available agents from the shared agent index.
 
         Returns:
-            list: List of agent dictionaries
+            list: List of agent names
         """
-        response = self.bedrock_agent_client.list_agents()
-        return [agent['agentName'] for agent in response['agentSummaries']]
+        return self.agent_resolver.get_agent_names()
 
     def get_agent_id(self, agent_name: str) -> str:
         """
@@ -47,18 +52,7 @@ class BedrockAgentManager:
         Raises:
             ValueError: If the agent is not found
         """
-        response = self.bedrock_agent_client.list_agents()
-
-        agent_id = None
-        if 'agentSummaries' in response:
-            for agent in response['agentSummaries']:
-                if agent_name in agent['agentName']:
-                    agent_id = agent['agentId']
-                    break
-
-        if agent_id is None:
-            raise ValueError(f"Agent {agent_name} not found")
-
+        agent_id, _ = self.agent_resolver.resolve(agent_name)
         return agent_id
 
     def get_agent_alias_id(self, agent_id: str, agent_name: str) -> str:
@@ -75,18 +69,7 @@ class BedrockAgentManager:
         Raises:
             ValueError: If the agent alias is not found
         """
-        response = self.bedrock_agent_client.list_agent_aliases(agentId=agent_id)
-
-        alias_id = None
-        if 'agentAliasSummaries' in response:
-            for alias in response['agentAliasSummaries']:
-                if 'latest' in alias['agentAliasName']:
-                    alias_id = alias['agentAliasId']
-                    break
-
-        if alias_id is None:
-            raise ValueError(f"Alias for agent {agent_name} not found")
-
+        _, alias_id = self.agent_resolver.resolve(agent_name)
         return alias_id
 
     def invoke_agent(
@@ -96,7 +79,8 @@ class BedrockAgentManager:
             session_id: str,
             agent_name: str,
             agent_type: str,
-            agent_config: Optional[Dict] = None
+            agent_config: Optional[Dict] = None,
+            bypass_tool_cache: bool = False
     ) -> Optional[str]:
         """
         Invoke AWS Bedrock agent with streaming response.
@@ -108,24 +92,29 @@ class BedrockAgentManager:
             agent_name: Name of the agent to invoke
             agent_type: Type of the agent (e.g., 'bedrock', 'mcp')
             agent_config: Optional configuration for the agent
+            bypass_tool_cache: Ignore cached MCP tool results for this request
 
         Returns:
             Optional[str]: Full response from the agent, or None on error
         """
         try:
             if agent_type == 'bedrock':
-                agent_id = self.get_agent_id(agent_name)
-                alias_agent_id = self.get_agent_alias_id(agent_id=agent_id, agent_name=agent_name)
-
-                response = self.bedrock_client.invoke_agent(
-                    agentAliasId=alias_agent_id,
-                    agentId=agent_id,
-                    enableTrace=False,
-                    endSession=False,
-                    inputText=prompt,
-                    sessionId=session_id,
-                    streamingConfigurations={'streamFinalResponse': True}
-                )
+                agent_id, alias_agent_id = self.agent_resolver.resolve(agent_name)
+
+                try:
+                    response = self.bedrock_client.invoke_agent(
+                        agentAliasId=alias_agent_id,
+                        agentId=agent_id,
+                        enableTrace=False,
+                        endSession=False,
+                        inputText=prompt,
+                        sessionId=session_id,
+                        streamingConfigurations={'streamFinalResponse': True}
+                    )
+                except self.bedrock_client.exceptions.ResourceNotFoundException:
+                    # The cached IDs are stale (agent or alias recreated); reload on next use
+                    self.agent_resolver.invalidate()
+                    raise
 
                 full_response = ''
                 if response.get('completion'):
@@ -143,8 +132,15 @@ class BedrockAgentManager:
             else:
                 self.mcp_client.add_servers(agent_config.get('servers', []))
                 self.mcp_client.set_system_prompt(agent_config.get('system_prompt'))
+                self.mcp_client.set_server_quorum(agent_config.get('server_quorum'))
+                self.mcp_client.set_max_concurrent_tools(agent_config.get('max_concurrent_tools'))
                 self.mcp_client.set_progress_callback(self.progress_callable)
-                return self.mcp_client.process_mcp_response(prompt, user_id)
+                self.mcp_client.set_streaming(agent_config.get('streaming', False), self.stream_callable)
+                self.mcp_client.set_prompt_caching(agent_config.get('prompt_caching', False))
+                self.mcp_client.set_conversation(self.get_conversation(user_id, agent_name, agent_config))
+                self.stream_placeholder = None
+                self.streamed_text = ''
+                return self.mcp_client.process_mcp_response(prompt, user_id, bypass_tool_cache)
 
         except Exception as e:
             error_msg = f"Error invoking Bedrock agent: {str(e)}"
@@ -152,214 +148,64 @@ class BedrockAgentManager:
             st.session_state.response_queue.put((user_id, error_msg, True))
             return None
 
-    def progress_callable(self, message: str):
+    def get_conversation(self, user_id: str, agent_name: str, agent_config: Dict) -> ConversationWindow:
         """
-        Enhanced progress callback with improved animations and visual feedback.
+        Get the MCP conversation window of a user and agent, creating it on first use.
 
         Args:
-            message: Progress message to display
+            user_id: Unique user identifier
+            agent_name: Name of the agent
+            agent_config: Configuration for the agent; its optional 'history' section
+                sets token_budget and compaction
+
+        Returns:
+            ConversationWindow: Conversation history for this user and agent
+        """
+        conversations = st.session_state.mcp_conversations
+        key = (user_id, agent_name)
+        if key not in conversations:
+            conversations[key] = ConversationWindow(**agent_config.get('history', {}))
+        return conversations[key]
+
+    def stream_callable(self, text_chunk: str):
         """
-        # Generate unique ID for this progress step
-        step_id = f"progress_{hash(message) % 10000}"
+        Render streamed model text as it arrives.
 
+        Args:
+            text_chunk: Text delta received from the model
+        """
+        if self.stream_placeholder is None:
+            self.stream_placeholder = st.empty()
+
+        self.streamed_text += text_chunk
+        self.stream_placeholder.markdown(self.streamed_text)
+
+    def progress_callable(self, events: List[ProgressEvent]):
+        """
+        Render the latest progress event without blocking the worker.
+
+        The styling lives in style.css, which is loaded once with the page, so each update
+        only sends the markup for the current step.
+
+        Args:
+            events: Progress events received since the last update
+        """
         if st.session_state.placeholder is None:
             st.session_state.placeholder = st.empty()
 
-        with st.session_state.placeholder:
-            # Display the progress message
-            st.markdown(f"""
-                    <style>
-                    .enhanced-progress-container {{
-                        display: flex;
-                        flex-direction: column;
-                        align-items: center;
-                        font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-                        margin: 20px 0;
-                        position: relative;
-                    }}
-
-                    .progress-box-{step_id} {{
-                        width: auto;
-                        height: 90px;
-                        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-                        border: 2px solid transparent;
-                        border-radius: 16px;
-                        display: flex;
-                        align-items: center;
-                        justify-content: space-between;
-                        padding: 0 24px;
-                        color: white;
-                        font-weight: 600;
-                        font-size: 16px;
-                        text-align: left;
-                        box-shadow: 
-                            0 8px 32px rgba(102, 126, 234, 0.3),
-                            0 4px 16px rgba(0, 0, 0, 0.2);
-                        margin: 8px 0;
-                        position: relative;
-                        overflow: hidden;
-                        animation: slideInScale-{step_id} 0.8s cubic-bezier(0.34, 1.56, 0.64, 1) forwards;
-                        transform: translateY(20px) scale(0.9);
-                        opacity: 0;
-                    }}
-
-                    .progress-box-{step_id}::before {{
-                        content: '';
-                        position: absolute;
-                        top: 0;
-                        left: -100%;
-                        width: 100%;
-                        height: 100%;
-                        background: linear-gradient(90deg, transparent, rgba(255,255,255,0.3), transparent);
-                        animation: shimmer-{step_id} 2s ease-in-out infinite;
-                    }}
-
-
-
-                    .progress-spinner-{step_id} {{
-                        width: 24px;
-                        height: 24px;
-                        border: 3px solid rgba(255,255,255,0.3);
-                        border-top: 3px solid white;
-                        border-radius: 50%;
-                        animation: spin-{step_id} 1s linear infinite;
-                    }}
-
-                    .progress-line-{step_id} {{
-                        width: 4px;
-                        height: 0;
-                        background: linear-gradient(180deg, #667eea, #764ba2);
-                        position: relative;
-                        border-radius: 2px;
-                        animation: growLine-{step_id} 1s cubic-bezier(0.25, 0.46, 0.45, 0.94) 0.5s forwards;
-                        box-shadow: 0 0 10px rgba(102, 126, 234, 0.5);
-                        margin: 5px 0;
-                    }}
-
-                    .progress-line-{step_id}::before {{
-                        content: '';
-                        position: absolute;
-                        top: 0;
-                        left: 50%;
-                        transform: translateX(-50%);
-                        width: 8px;
-                        height: 8px;
-                        background: #667eea;
-                        border-radius: 50%;
-                        animation: pulse-{step_id} 2s ease-in-out infinite;
-                        box-shadow: 0 0 15px rgba(102, 126, 234, 0.8);
-                    }}
-
-                    .progress-line-{step_id}::after {{
-                        content: '';
-                        position: absolute;
-                        bottom: -8px;
-                        left: 50%;
-                        transform: translateX(-50%);
-                        border: 8px solid transparent;
-                        border-top: 12px solid #764ba2;
-                        filter: drop-shadow(0 2px 4px rgba(0,0,0,0.3));
-                        animation: arrowFade-{step_id} 1s ease-out 1.2s forwards;
-                        opacity: 0;
-                    }}
-
-                    .progress-bar-container-{step_id} {{
-                        width: 520px;
-                        margin: 15px 0;
-                    }}
-
-                    .progress-bar-{step_id} {{
-                        width: 100%;
-                        height: 6px;
-                        background-color: rgba(255,255,255,0.1);
-                        border-radius: 3px;
-                        overflow: hidden;
-                        position: relative;
-                    }}
-
-                    .progress-fill-{step_id} {{
-                        height: 100%;
-                        background: linear-gradient(90deg, #667eea, #764ba2);
-                        border-radius: 3px;
-                        animation: progressFill-{step_id} 2s ease-out forwards;
-                        transform-origin: left;
-                        transform: scaleX(0);
-                    }}
-
-                    .progress-fill-{step_id}::after {{
-                        content: '';
-                        position: absolute;
-                        top: 0;
-                        right: 0;
-                        width: 20px;
-                        height: 100%;
-                        background: linear-gradient(90deg, transparent, rgba(255,255,255,0.6), transparent);
-                        animation: progressShine-{step_id} 1.5s ease-in-out infinite;
-                    }}
-
-                    /* Keyframe Animations */
-                    @keyframes slideInScale-{step_id} {{
-                        to {{
-                            transform: translateY(0) scale(1);
-                            opacity: 1;
-                        }}
-                    }}
-
-                    @keyframes shimmer-{step_id} {{
-                        0% {{ left: -100%; }}
-                        50% {{ left: 100%; }}
-                        100% {{ left: 100%; }}
-                    }}
-
-
-
-                    @keyframes growLine-{step_id} {{
-                        to {{ height: 60px; }}
-                    }}
-
-                    @keyframes pulse-{step_id} {{
-                        0%, 100% {{ 
-                            transform: translateX(-50%) scale(1);
-                            opacity: 1;
-                        }}
-                        50% {{ 
-                            transform: translateX(-50%) scale(1.5);
-                            opacity: 0.7;
-                        }}
-                    }}
-
-                    @keyframes arrowFade-{step_id} {{
-                        to {{ opacity: 1; }}
-                    }}
-
-                    @keyframes spin-{step_id} {{
-                        0% {{ transform: rotate(0deg); }}
-                        100% {{ transform: rotate(360deg); }}
-                    }}
-
-                    @keyframes progressFill-{step_id} {{
-                        to {{ transform: scaleX(1); }}
-                    }}
-
-                    @keyframes progressShine-{step_id} {{
-                        0% {{ transform: translateX(-20px); }}
-                        100% {{ transform: translateX(20px); }}
-                    }}
-                    </style>
-
-                    <div class="enhanced-progress-container">
-                        <div class="progress-box-{step_id}">
-                            <span>🔄 {message}</span>
-                            <div class="progress-spinner-{step_id}"></div>
-                        </div>
-                        <div class="progress-line-{step_id}"></div>
-                        <div class="progress-bar-container-{step_id}">
-                            <div class="progress-bar-{step_id}">
-                                <div class="progress-fill-{step_id}"></div>
-                            </div>
-                        </div>
+        event = events[-1]
+        st.session_state.placeholder.markdown(f"""
+            <div class="enhanced-progress-container">
+                <div class="progress-box">
+                    <span>🔄 {event.message}</span>
+                    <div class="progress-spinner"></div>
+                </div>
+                <div class="progress-meta">{event.phase} · {event.time_label}</div>
+                <div class="progress-line"></div>
+                <div class="progress-bar-container">
+                    <div class="progress-bar">
+                        <div class="progress-fill"></div>
                     </div>
-                """, unsafe_allow_html=True)
-
-            # Shorter delay for better responsiveness
-            time.sleep(1)
+                </div>
+            </div>
+        """, unsafe_allow_html=True)
@@ -0,0 +1,104 @@
+import json
+from typing import Any, Dict, List, Optional
+
+
+class ConversationWindow:
+    """
+    Token-budgeted multi-turn message history for one user and MCP agent.
+
+    A turn is every message exchanged for one prompt: the user prompt, the assistant
+    tool_use messages with their tool_result replies and the final assistant answer.
+    Turns are kept whole so tool_use/tool_result pairs stay valid. When the estimated
+    size exceeds the token budget, the oldest turns slide out of the window; they are
+    returned to the caller so they can be compacted into a running summary.
+    """
+
+    # Rough size of a token in serialized message JSON
+    CHARS_PER_TOKEN = 4
+
+    def __init__(self, token_budget: int = 20000, compaction: bool = False):
+        """
+        Initialize the conversation window.
+
+        Args:
+            token_budget: Estimated tokens of history sent with each prompt
+            compaction: Whether evicted turns should be compacted into a summary
+        """
+        self.token_budget = token_budget
+        self.compaction = compaction
+        self.summary: Optional[str] = None
+        self.pending_compaction = None
+        self._turns: List[List[Dict[str, Any]]] = []
+        self._turn_tokens: List[int] = []
+
+    @property
+    def token_count(self) -> int:
+        """Estimated tokens of the history, including the summary"""
+        return sum(self._turn_tokens) + self.estimate_tokens(self.summary or '')
+
+    def messages(self) -> List[Dict[str, Any]]:
+        """
+        Get the history to send ahead of a new prompt.
+
+        Returns:
+            List[Dict]: Alternating user/assistant messages, starting with the summary if any
+        """
+        messages = []
+        if self.summary:
+            messages.append({"role": "user", "content": [
+                {"type": "text", "text": f"Summary of our earlier conversation:\n{self.summary}"}]})
+            messages.append({"role": "assistant", "content": [
+                {"type": "text", "text": "Understood, I will take that into account."}]})
+
+        for turn in self._turns:
+            messages.extend(turn)
+        return messages
+
+    def add_turn(self, turn: List[Dict[str, Any]], reply: str) -> List[List[Dict[str, Any]]]:
+        """
+        Append a completed turn and enforce the token budget.
+
+        Args:
+            turn: Messages of the turn, starting with the user prompt
+            reply: Final text returned to the user for this turn
+
+        Returns:
+            List[List[Dict]]: Turns evicted from the window, oldest first
+        """
+        if not turn or turn[-1].get('role') != 'assistant':
+            # The tool loop did not finish cleanly; keep only the prompt and the reply
+            turn = self._condense(turn[:1], reply)
+
+        self._turns.append(turn)
+        self._turn_tokens.append(self.estimate_tokens(turn))
+        return self._enforce_budget(reply)
+
+    def clear(self):
+        """Forget the whole conversation"""
+        self._turns.clear()
+        self._turn_tokens.clear()
+        self.summary = None
+        self.pending_compaction = None
+
+    def _enforce_budget(self, reply: str) -> List[List[Dict[str, Any]]]:
+        evicted = []
+        while self.token_count > self.token_budget and len(self._turns) > 1:
+            evicted.append(self._turns.pop(0))
+            self._turn_tokens.pop(0)
+
+        # A single oversized turn keeps its prompt and answer but drops its tool exchanges
+        if self.token_count > self.token_budget and self._turns:
+            self._turns[0] = self._condense(self._turns[0][:1], reply)
+            self._turn_tokens[0] = self.estimate_tokens(self._turns[0])
+
+        return evicted
+
+    @staticmethod
+    def _condense(prompt_messages: List[Dict[str, Any]], reply: str) -> List[Dict[str, Any]]:
+        return prompt_messages + [{"role": "assistant", "content": [{"type": "text", "text": reply or "(no reply)"}]}]
+
+    @classmethod
+    def estimate_tokens(cls, value: Any) -> int:
+        """Estimate the tokens a message, list of messages or string will use"""
+        text = value if isinstance(value, str) else json.dumps(value, separators=(',', ':'))
+        return len(text) // cls.CHARS_PER_TOKEN
@@ -1,15 +1,26 @@
 # Configure logging
 import asyncio
+import atexit
+import concurrent.futures
+import functools
+import hashlib
 import json
 import logging
 import os
-import subprocess
+import shutil
+import threading
 import time
 from typing import Dict, Any, List, Optional
 
 import boto3
 from mcp import StdioServerParameters, stdio_client, ClientSession
 
+from modules.conversation_window import ConversationWindow
+from modules.progress_channel import ProgressChannel, ProgressEvent
+from modules.tool_registry import ToolRegistry
+from modules.tool_result_compactor import ResultPolicy, ToolResultCompactor
+from modules.tool_result_cache import ToolResultCache
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
@@ -17,11 +28,20 @@ logger = logging.getLogger(__name__)
 class MCPServerConfig:
     """Configuration for a single MCP server"""
 
-    def __init__(self, name: str, command: str, args: List[str], description: Optional[str] = None):
+    def __init__(self, name: str, command: str, args: List[str], description: Optional[str] = None,
+                 init_timeout: float = 15.0, max_concurrent_calls: int = 4,
+                 cacheable_tools: Optional[Dict[str, float]] = None,
+                 result_policies: Optional[Dict[str, Dict[str, Any]]] = None):
         self.name = name
         self.command = command
         self.args = args
         self.description = description or f"MCP Server: {name}"
+        self.init_timeout = init_timeout
+        self.max_concurrent_calls = max_concurrent_calls
+        self.cacheable_tools = cacheable_tools or {}
+        self.result_policies = {tool: ResultPolicy(**policy) for tool, policy in (result_policies or {}).items()}
+        self._result_policies_json = json.dumps(result_policies or {}, sort_keys=True)
+        self.key = self.make_key(name, command, args)
 
         # Validate command exists
         if not os.path.exists(command):
@@ -32,6 +52,18 @@ class MCPServerConfig:
             if not os.path.exists(script):
                 raise ValueError(f"Server script {script} does not exist for server {name}")
 
+    @staticmethod
+    def make_key(name: str, command: str, args: List[str]) -> str:
+        """Hash of the server identity (name, command, args), used to share sessions across clients"""
+        identity = json.dumps([name, command, list(args)], separators=(',', ':'))
+        return hashlib.sha256(identity.encode()).hexdigest()
+
+    @property
+    def settings(self) -> tuple:
+        """Settings that can change without restarting the server"""
+        return (self.description, self.init_timeout, self.max_concurrent_calls,
+                tuple(sorted(self.cacheable_tools.items())), self._result_policies_json)
+
 
 class MCPServerSession:
     """Manages a single MCP server session"""
@@ -39,114 +71,334 @@ class MCPServerSession:
     def __init__(self, config: MCPServerConfig):
         self.initialization_error = None
         self.config = config
-        self.stdio_context = None
-        self.session_context = None
         self.mcp_session = None
-        self.read = None
-        self.write = None
         self.tools = {}
         self.initialized = False
+        self.last_used = time.monotonic()
+        self.active_calls = 0
+        self._call_semaphore = asyncio.Semaphore(config.max_concurrent_calls)
+        self._ready = None
+        self._closing = None
+        self._lifecycle_task = None
+
+    @property
+    def is_alive(self) -> bool:
+        """Whether the server process and its MCP session are still running"""
+        return self.initialized and self._lifecycle_task is not None and not self._lifecycle_task.done()
+
+    def touch(self):
+        """Mark this session as recently used"""
+        self.last_used = time.monotonic()
+
+    def reconfigure(self, config: MCPServerConfig):
+        """
+        Apply new settings of the same server (see MCPServerConfig.settings) without restarting it.
+
+        Calls already holding a slot of the previous concurrency limit finish under it.
+        """
+        if config.max_concurrent_calls != self.config.max_concurrent_calls:
+            self._call_semaphore = asyncio.Semaphore(config.max_concurrent_calls)
+        self.config = config
 
     async def initialize(self):
         """Initialize this server session"""
+        self._ready = asyncio.Event()
+        self._closing = asyncio.Event()
+        self._lifecycle_task = asyncio.create_task(self._run())
+        await self._ready.wait()
+        return self.initialized
+
+    async def _run(self):
+        """
+        Own the stdio and MCP session contexts for the lifetime of the server process.
+
+        The contexts are entered and exited from this task because anyio cancel scopes
+        must be exited by the task that entered them, which lets the session outlive
+        the request that started it.
+        """
         try:
             server_params = StdioServerParameters(
                 command=self.config.command,
                 args=self.config.args
             )
 
-            self.stdio_context = stdio_client(server_params)
-            self.read, self.write = await self.stdio_context.__aenter__()
+            async with stdio_client(server_params) as (read, write):
+                async with ClientSession(read, write) as mcp_session:
+                    self.mcp_session = mcp_session
+
+                    try:
+                        await asyncio.wait_for(self._handshake(), timeout=self.config.init_timeout)
+                    except asyncio.TimeoutError:
+                        self.initialization_error = "MCP session initialization timed out"
+                        logger.error(f"Server '{self.config.name}' initialization timed out "
+                                     f"after {self.config.init_timeout}s")
+                        return
+                    except Exception as e:
+                        self.initialization_error = f"MCP session initialization failed: {str(e)}"
+                        logger.error(f"Server '{self.config.name}' initialization failed: {e}")
+                        return
+
+                    self.initialized = True
+                    self.touch()
+                    logger.info(f"Initialized MCP server '{self.config.name}' with {len(self.tools)} tools")
+                    self._ready.set()
+
+                    # Keep the server running until the session is closed
+                    await self._closing.wait()
 
-            self.session_context = ClientSession(self.read, self.write)
-            self.mcp_session = await self.session_context.__aenter__()
+        except Exception as e:
+            if self.initialized:
+                logger.error(f"MCP server '{self.config.name}' terminated unexpectedly: {e}")
+            else:
+                self.initialization_error = str(e)
+                logger.error(f"Failed to initialize MCP server '{self.config.name}': {e}")
+        finally:
+            self.initialized = False
+            self.mcp_session = None
+            self._ready.set()
+
+    async def _handshake(self):
+        """Run the MCP initialize handshake and load the server's tools"""
+        await self.mcp_session.initialize()
+
+        tools_response = await self.mcp_session.list_tools()
+        for tool in tools_response.tools:
+            # Prefix tool name with server name to avoid conflicts
+            tool_key = f"{self.config.name}.{tool.name}"
+            self.tools[tool_key] = {
+                'name': tool.name,  # Original tool name for server calls
+                'server_name': self.config.name,
+                'description': f"[{self.config.name}] {tool.description}",
+                'schema': tool.inputSchema
+            }
 
-            try:
-                await asyncio.wait_for(self.mcp_session.initialize(), timeout=15.0)
-            except asyncio.TimeoutError:
-                self.initialization_error = "MCP session initialization timed out"
-                logger.error(f"Server '{self.config.name}' initialization timed out")
-                return False
-            except Exception as e:
-                self.initialization_error = f"MCP session initialization failed: {str(e)}"
-                logger.error(f"Server '{self.config.name}' initialization failed: {e}")
-                return False
-
-            # Load tools from this server
-            tools_response = await self.mcp_session.list_tools()
-            for tool in tools_response.tools:
-                # Prefix tool name with server name to avoid conflicts
-                tool_key = f"{self.config.name}.{tool.name}"
-                self.tools[tool_key] = {
-                    'name': tool.name,  # Original tool name for server calls
-                    'server_name': self.config.name,
-                    'description': f"[{self.config.name}] {tool.description}",
-                    'schema': tool.inputSchema
-                }
+    async def health_check(self, timeout: float = 5.0) -> bool:
+        """Check that the server still answers MCP pings"""
+        if not self.is_alive:
+            return False
 
-            self.initialized = True
-            logger.info(f"Initialized MCP server '{self.config.name}' with {len(self.tools)} tools")
+        try:
+            await asyncio.wait_for(self.mcp_session.send_ping(), timeout=timeout)
+            self.touch()
             return True
-
         except Exception as e:
-            logger.error(f"Failed to initialize MCP server '{self.config.name}': {e}")
+            logger.warning(f"Health check failed for server {self.config.name}: {e}")
             return False
 
     async def execute_tool(self, tool_name: str, arguments: Dict[str, Any]) -> str:
         """Execute a tool on this server"""
+        self.active_calls += 1
+        self.touch()
         try:
-            result = await self.mcp_session.call_tool(tool_name, arguments)
+            # Bound in-flight calls so a single stdio server is not flooded
+            async with self._call_semaphore:
+                result = await self.mcp_session.call_tool(tool_name, arguments)
 
             if result.content:
                 text_content = []
                 for content in result.content:
                     if hasattr(content, 'text'):
                         text_content.append(content.text)
-                return '\n'.join(text_content)
+                text = '\n'.join(text_content)
+                # Failures raised by the tool come back as content flagged isError
+                return f"Error: {text}" if result.isError else text
+
+            if result.isError:
+                return f"Error: Tool {tool_name} failed"
 
             return "Tool executed successfully"
 
         except Exception as e:
             logger.error(f"Error executing tool {tool_name} on server {self.config.name}: {e}")
             return f"Error: {str(e)}"
+        finally:
+            self.active_calls -= 1
+            self.touch()
 
     async def cleanup(self):
         """Cleanup this server session"""
         try:
-            if self.session_context:
-                await self.session_context.__aexit__(None, None, None)
-            if self.stdio_context:
-                await self.stdio_context.__aexit__(None, None, None)
+            if self._closing:
+                self._closing.set()
+            if self._lifecycle_task:
+                await self._lifecycle_task
             self.initialized = False
         except Exception as e:
             logger.error(f"Error cleaning up server {self.config.name}: {e}")
 
 
+class MCPSessionPool:
+    """
+    Process-wide pool of long-lived MCP server sessions keyed by server configuration.
+
+    Sessions live on a dedicated event loop thread so they survive across chat turns,
+    Streamlit reruns and users. Idle sessions are evicted after ``idle_timeout`` seconds
+    and sessions that fail a health check are transparently reconnected.
+    """
+
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self, idle_timeout: float = 600.0, health_check_interval: float = 30.0,
+                 sweep_interval: float = 60.0):
+        self.idle_timeout = idle_timeout
+        self.health_check_interval = health_check_interval
+        self.sweep_interval = sweep_interval
+
+        self._sessions: Dict[str, MCPServerSession] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._run_loop, name="mcp-session-pool", daemon=True)
+        self._thread.start()
+        self._sweeper = self.submit(self._sweep_idle_sessions())
+        atexit.register(self.shutdown)
+
+    @classmethod
+    def get_instance(cls) -> "MCPSessionPool":
+        """Return the pool shared by every client in this process"""
+        if cls._instance is None:
+            with cls._instance_lock:
+                if cls._instance is None:
+                    cls._instance = cls()
+        return cls._instance
+
+    def _run_loop(self):
+        asyncio.set_event_loop(self._loop)
+        self._loop.run_forever()
+
+    def submit(self, coro) -> concurrent.futures.Future:
+        """Schedule a coroutine on the pool event loop from any thread"""
+        return asyncio.run_coroutine_threadsafe(coro, self._loop)
+
+    async def acquire(self, config: MCPServerConfig) -> MCPServerSession:
+        """
+        Get a ready session for the given server, starting or reconnecting it if needed.
+
+        Must be awaited on the pool event loop. The returned session is not initialized
+        if the server could not be started; check ``initialized`` and
+        ``initialization_error``. A running session takes the settings of the config it
+        is acquired with, so they follow the latest sidebar.yaml.
+        """
+        key = config.key
+        lock = self._locks.setdefault(key, asyncio.Lock())
+
+        async with lock:
+            session = self._sessions.get(key)
+            if session is not None:
+                recently_used = time.monotonic() - session.last_used < self.health_check_interval
+                if (recently_used and session.is_alive) or await session.health_check():
+                    if session.config.settings != config.settings:
+                        logger.info(f"Applying new settings to pooled MCP server '{config.name}'")
+                        session.reconfigure(config)
+                    session.touch()
+                    return session
+
+                logger.warning(f"Reconnecting unhealthy MCP server '{config.name}'")
+                await self._evict(key)
+
+            session = MCPServerSession(config)
+            if await session.initialize():
+                self._sessions[key] = session
+            return session
+
+    async def _evict(self, key: str):
+        session = self._sessions.pop(key, None)
+        if session is not None:
+            await session.cleanup()
+            logger.info(f"Closed pooled MCP server '{session.config.name}'")
+
+    async def _sweep_idle_sessions(self):
+        """Periodically close sessions that are idle or whose server has exited"""
+        while True:
+            await asyncio.sleep(self.sweep_interval)
+            now = time.monotonic()
+            for key, session in list(self._sessions.items()):
+                idle = session.active_calls == 0 and now - session.last_used > self.idle_timeout
+                if idle or not session.is_alive:
+                    async with self._locks[key]:
+                        if self._sessions.get(key) is session:
+                            await self._evict(key)
+
+    async def close_all(self):
+        """Close every pooled session"""
+        for key in list(self._sessions.keys()):
+            await self._evict(key)
+
+    def shutdown(self, timeout: float = 10.0):
+        """Close all sessions and stop the pool event loop"""
+        if self._loop.is_closed():
+            return
+        try:
+            self._sweeper.cancel()
+            self.submit(self.close_all()).result(timeout=timeout)
+        except Exception as e:
+            logger.error(f"Error shutting down MCP session pool: {e!r}")
+        finally:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join(timeout=timeout)
+            self._loop.close()
+
+
 class MCPBedrockClient:
-    def __init__(self, region_name: str = 'us-east-1'):
-        """Initialize Bedrock client with support for multiple MCP servers"""
+    def __init__(self, region_name: str = 'us-east-1', bedrock_client=None):
+        """Initialize Bedrock client with support for multiple MCP servers
+
+        Args:
+            region_name: AWS region used when no client is supplied
+            bedrock_client: Optional shared 'bedrock-runtime' client to reuse
+        """
         self.mcp_initialized = False
-        self.bedrock_client = boto3.client(
+        self.bedrock_client = bedrock_client or boto3.client(
             service_name='bedrock-runtime',
             region_name=region_name
         )
         self.model_id = 'us.anthropic.claude-3-5-sonnet-20241022-v2:0'
 
         # Multiple server support
-        self.server_configs: List[MCPServerConfig] = []
+        self.server_configs: Dict[str, MCPServerConfig] = {}
+        self._server_fingerprints: Dict[str, str] = {}
         self.server_sessions: Dict[str, MCPServerSession] = {}
         self.all_tools: Dict[str, Dict] = {}
+        self.tool_registry = ToolRegistry.for_sessions({})
+        self.pool = MCPSessionPool.get_instance()
+        self.tool_cache = ToolResultCache.get_instance()
+        self.result_compactor = ToolResultCompactor.get_instance()
+        self.bypass_tool_cache = False
 
-        self.main_loop = None
         self.system_prompt = None
         self.progress_callback = None
-
-    def add_server(self, name: str, command: str, args: List[str], description: Optional[str] = None):
-        """Add an MCP server configuration"""
+        self.progress_channel: Optional[ProgressChannel] = None
+        self.server_quorum = None
+        self.max_concurrent_tools = None
+        self.streaming = False
+        self.text_callback = None
+        self.text_streamed = False
+        self.prompt_caching = False
+        self.token_usage = self._empty_token_usage()
+        self.conversation: Optional[ConversationWindow] = None
+
+    def add_server(self, name: str, command: str, args: List[str], description: Optional[str] = None,
+                   init_timeout: float = 15.0, max_concurrent_calls: int = 4,
+                   cacheable_tools: Optional[Dict[str, float]] = None,
+                   result_policies: Optional[Dict[str, Dict[str, Any]]] = None):
+        """Add or replace an MCP server configuration
+
+        Servers are keyed by name. Registering an identical configuration again is a no-op,
+        and a changed configuration replaces only that server.
+        """
         try:
-            config = MCPServerConfig(name, command, args, description)
-            self.server_configs.append(config)
-            logger.info(f"Added MCP server configuration: {name}")
+            config = MCPServerConfig(name, command, args, description, init_timeout, max_concurrent_calls,
+                                     cacheable_tools, result_policies)
+            existing = self.server_configs.get(name)
+            if existing is not None and existing.key == config.key and existing.settings == config.settings:
+                return
+
+            self.server_configs[name] = config
+            if existing is None:
+                logger.info(f"Added MCP server configuration: {name}")
+            else:
+                logger.info(f"Replaced MCP server configuration: {name}")
         except ValueError as e:
             logger.error(f"Failed to add server {name}: {e}")
             raise
@@ -155,15 +407,29 @@ class MCPBedrockClient:
         """Add multiple MCP server configurations
 
         Args:
-            servers: List of server configs, each with keys: name, command, args, description (optional)
+            servers: List of server configs, each with keys: name, command, args, description (optional),
+                init_timeout (optional, seconds allowed for the server to start and list its tools),
+                max_concurrent_calls (optional, in-flight tool calls allowed on the server),
+                cacheable_tools (optional, tool name mapped to the seconds its results may be cached),
+                result_policies (optional, tool name mapped to ResultPolicy settings used to compact its results)
         """
         for server_config in servers:
+            # Skip servers registered with exactly this configuration before
+            fingerprint = json.dumps(server_config, sort_keys=True, default=str)
+            if self._server_fingerprints.get(server_config['name']) == fingerprint:
+                continue
+
             self.add_server(
                 name=server_config['name'],
                 command=self.which(server_config['command']),
                 args=server_config['args'],
-                description=server_config.get('description')
+                description=server_config.get('description'),
+                init_timeout=server_config.get('init_timeout', 15.0),
+                max_concurrent_calls=server_config.get('max_concurrent_calls', 4),
+                cacheable_tools=server_config.get('cacheable_tools'),
+                result_policies=server_config.get('result_policies')
             )
+            self._server_fingerprints[server_config['name']] = fingerprint
 
     def set_system_prompt(self, system_prompt: str):
         """Set the system prompt to be used for the MCP server"""
@@ -172,41 +438,88 @@ class MCPBedrockClient:
         self.system_prompt = system_prompt
 
     def set_progress_callback(self, callback):
-        """Set the progress callback to be used for the MCP server"""
+        """Set the progress callback to be used for the MCP server
+
+        The callback receives each burst of pending progress events as a list of ProgressEvent.
+        """
         self.progress_callback = callback
 
+    def set_streaming(self, enabled: bool, text_callback=None):
+        """Enable token streaming; text_callback receives the text streamed since its last call"""
+        self.streaming = enabled
+        self.text_callback = text_callback
+
+    def report_progress(self, phase: str, message: str):
+        """Publish a progress event for the request in flight, without blocking"""
+        if self.progress_channel is not None:
+            self.progress_channel.emit(phase, message)
+
+    def set_conversation(self, conversation: Optional[ConversationWindow]):
+        """Set the conversation window whose history is sent with, and extended by, each prompt"""
+        self.conversation = conversation
+
+    def set_prompt_caching(self, enabled: bool):
+        """Enable prompt caching of the system prompt and tool catalog"""
+        self.prompt_caching = enabled
+
+    @staticmethod
+    def _empty_token_usage() -> Dict[str, int]:
+        return {'input_tokens': 0, 'output_tokens': 0,
+                'cache_read_input_tokens': 0, 'cache_creation_input_tokens': 0}
+
+    def set_server_quorum(self, quorum: Optional[int]):
+        """Set how many MCP servers must be ready before a request proceeds (default: all)"""
+        if quorum is not None and quorum < 1:
+            raise ValueError("Server quorum must be at least 1.")
+        self.server_quorum = quorum
+
+    def set_max_concurrent_tools(self, limit: Optional[int]):
+        """Set how many tool calls of one model turn may run at once (default: unbounded)"""
+        if limit is not None and limit < 1:
+            raise ValueError("Tool concurrency limit must be at least 1.")
+        self.max_concurrent_tools = limit
+
     async def initialize_mcp_sessions(self):
-        """Initialize all MCP server sessions"""
+        """
+        Acquire sessions for all configured MCP servers from the shared pool.
+
+        All servers are started concurrently, each bounded by its own ``init_timeout``.
+        The request proceeds as soon as ``server_quorum`` servers are ready; servers that
+        are still starting join the tool catalog when they finish.
+        """
         try:
             if not self.server_configs:
                 raise ValueError("No MCP servers configured. Please add servers before initializing.")
 
-            self.progress_callback("Initializing MCP sessions...")
+            self.report_progress(ProgressEvent.INITIALIZE, "Initializing MCP sessions...")
 
-            # Store reference to current event loop
-            self.main_loop = asyncio.get_event_loop()
+            quorum = min(self.server_quorum or len(self.server_configs), len(self.server_configs))
+            pending = {asyncio.create_task(self.pool.acquire(config)) for config in self.server_configs.values()}
 
-            # Initialize all server sessions
+            # Acquire all server sessions concurrently, reusing warm ones from the pool
             success_count = 0
-            for config in self.server_configs:
-                session = MCPServerSession(config)
-                success = await session.initialize()
-
-                if success:
-                    self.server_sessions[config.name] = session
-                    # Merge tools from this server
-                    self.all_tools.update(session.tools)
-                    success_count += 1
-                    self.progress_callback(f"Initialized server: {config.name}")
-                else:
-                    logger.error(f"Failed to initialize server: {config.name}")
+            while pending and success_count < quorum:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    session = task.result()
+                    if session.initialized:
+                        self._add_session(session)
+                        success_count += 1
+                        self.report_progress(ProgressEvent.INITIALIZE, f"Initialized server: {session.config.name}")
+                    else:
+                        logger.error(f"Failed to initialize server: {session.config.name} "
+                                     f"({session.initialization_error})")
 
             if success_count == 0:
                 raise Exception("No MCP servers could be initialized")
 
+            # Let slower servers join the tool catalog once they are ready
+            for task in pending:
+                task.add_done_callback(self._on_late_session)
+
             self.mcp_initialized = True
-            self.progress_callback(f"Successfully initialized {success_count}/{len(self.server_configs)} MCP servers")
-            self.progress_callback(f"Total tools available: {len(self.all_tools)}")
+            self.report_progress(ProgressEvent.INITIALIZE, f"Successfully initialized {success_count}/{len(self.server_configs)} MCP servers")
+            self.report_progress(ProgressEvent.INITIALIZE, f"Total tools available: {len(self.all_tools)}")
 
             return True
 
@@ -214,118 +527,267 @@ class MCPBedrockClient:
             logger.error(f"Failed to initialize MCP sessions: {e}")
             return False
 
-    async def cleanup_mcp_sessions(self):
-        """Cleanup all MCP server sessions"""
-        try:
-            for session in self.server_sessions.values():
-                await session.cleanup()
-            self.server_sessions.clear()
-            self.all_tools.clear()
-            self.mcp_initialized = False
-        except Exception as e:
-            logger.error(f"Error cleaning up MCP sessions: {e}")
+    def _add_session(self, session: MCPServerSession):
+        """Register a ready session and merge its tools into the catalog"""
+        self.server_sessions[session.config.name] = session
+        self.all_tools.update(session.tools)
+        self.tool_registry = ToolRegistry.for_sessions(self.server_sessions)
+
+    def _on_late_session(self, task: asyncio.Task):
+        """Add a server that became ready after the quorum was reached"""
+        if task.cancelled() or task.exception() is not None or not self.mcp_initialized:
+            return
+
+        session = task.result()
+        if session.initialized:
+            self._add_session(session)
+            logger.info(f"Server '{session.config.name}' joined the tool catalog with {len(session.tools)} tools")
+
+    def release_mcp_sessions(self):
+        """Release this client's references to pooled MCP server sessions.
+
+        The sessions themselves stay open in the pool for the next request.
+        """
+        self.server_sessions.clear()
+        self.all_tools.clear()
+        self.tool_registry = ToolRegistry.for_sessions({})
+        self.mcp_initialized = False
 
     async def execute_mcp_tool(self, tool_key: str, arguments: Dict[str, Any]) -> str:
-        """Execute a tool via MCP using the appropriate server session"""
+        """Execute a tool via MCP using the appropriate server session
+
+        Results are compacted to the token budget of the tool's result policy before they
+        enter the conversation; the fetch tool pages through the full results.
+        """
         try:
-            tool_key = tool_key.replace('-', '.')
-            if tool_key not in self.all_tools:
+            if tool_key == ToolResultCompactor.FETCH_TOOL_NAME:
+                self.report_progress(ProgressEvent.TOOLS, f"Fetching compacted result: {arguments.get('handle')}")
+                return self.result_compactor.fetch(**arguments)
+
+            resolved = self.tool_registry.resolve(tool_key)
+            if resolved is None:
                 return f"Error: Tool {tool_key} not found"
 
-            tool_info = self.all_tools[tool_key]
-            server_name = tool_info['server_name']
-            original_tool_name = tool_info['name']
+            server_name, original_tool_name = resolved
 
             if server_name not in self.server_sessions:
                 return f"Error: Server {server_name} not available"
 
             session = self.server_sessions[server_name]
-            original_key = tool_info.get('original_key', tool_key)
-            self.progress_callback(f"Executing tool: {original_key} on server: {server_name}")
+            original_key = f"{server_name}.{original_tool_name}"
+
+            # Caching and compaction follow this client's config; the pooled session's may be another client's
+            config = self.server_configs.get(server_name, session.config)
+
+            # Serve repeated calls of cacheable tools from the shared result cache
+            cache_ttl = config.cacheable_tools.get(original_tool_name)
+            result_policy = config.result_policies.get(original_tool_name)
+            cache_key = self.tool_cache.make_key(session.config.key, original_tool_name, arguments)
+            if cache_ttl and not self.bypass_tool_cache:
+                cached_result = self.tool_cache.get(cache_key)
+                if cached_result is not None:
+                    self.report_progress(ProgressEvent.TOOLS, f"Using cached result: {original_key} on server: {server_name}")
+                    return self.result_compactor.compact(cached_result, result_policy)
+
+            self.report_progress(ProgressEvent.TOOLS, f"Executing tool: {original_key} on server: {server_name}")
 
             result = await session.execute_tool(original_tool_name, arguments)
-            return result
+            if cache_ttl and self._is_cacheable(result):
+                self.tool_cache.put(cache_key, result, cache_ttl)
+            return self.result_compactor.compact(result, result_policy)
 
         except Exception as e:
             logger.error(f"Error executing tool {tool_key}: {e}")
             return f"Error: {str(e)}"
 
-    def get_bedrock_tools_config(self) -> Dict[str, Any]:
-        """Convert all MCP tools to Bedrock format"""
-        bedrock_tools = []
+    @staticmethod
+    def _is_cacheable(result: str) -> bool:
+        """Whether a tool result may be cached: not an error, nor a result marked partial"""
+        if result.startswith("Error:"):
+            return False
+        if result.lstrip().startswith('{'):
+            try:
+                return not json.loads(result).get('partial')
+            except ValueError:
+                return True
+        return True
 
-        for tool_key, tool_info in self.all_tools.items():
-            # Clean tool name to match Bedrock requirements (alphanumeric, underscore, hyphen only)
-            clean_name = tool_key.replace('.', '-')
+    async def execute_mcp_tools(self, tool_calls: List[Dict[str, Any]]) -> List[str]:
+        """Execute the tool calls of one model turn concurrently, returning results in call order"""
+        semaphore = asyncio.Semaphore(self.max_concurrent_tools or len(tool_calls))
 
-            bedrock_tool = {
-                "name": clean_name,
-                "description": tool_info['description'],
-                "input_schema": tool_info['schema']
-            }
-            bedrock_tools.append(bedrock_tool)
+        async def run(tool_call: Dict[str, Any]) -> str:
+            async with semaphore:
+                # Execute via appropriate MCP server session
+                return await self.execute_mcp_tool(tool_call.get('name'), tool_call.get('input', {}))
 
-        return {
-            "tools": bedrock_tools,
-            "tool_choice": {"type": "auto"}
-        }
+        return await asyncio.gather(*(run(tool_call) for tool_call in tool_calls))
+
+    def get_bedrock_tools_config(self, cached: bool = False) -> Dict[str, Any]:
+        """Get all MCP tools in Bedrock format from the compiled tool registry
+
+        Args:
+            cached: Use the variant with a prompt cache breakpoint after the MCP tools
+
+        Returns:
+            Dict: Tools and tool_choice, with the result fetch tool appended
+        """
+        tools_config = self.tool_registry.cached_tools_config if cached else self.tool_registry.tools_config
+        if not tools_config['tools']:
+            return dict(tools_config)
+        return {**tools_config, "tools": tools_config['tools'] + (ToolResultCompactor.FETCH_TOOL,)}
 
     def get_server_summary(self) -> str:
         """Get a summary of all configured servers and their tools"""
-        if not self.server_sessions:
-            return "No MCP servers initialized"
+        return self.tool_registry.summary
+
+    async def invoke_bedrock(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        """Invoke the model, streaming the response when enabled, and return the response body"""
+        # Run the blocking boto3 calls off the shared pool event loop
+        if self.streaming:
+            response_body = await asyncio.to_thread(self._invoke_bedrock_stream, body)
+        else:
+            response_body = await asyncio.to_thread(self._invoke_bedrock_sync, body)
+
+        self._record_usage(response_body)
+        return response_body
+
+    def _invoke_bedrock_sync(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        """Invoke the model without streaming; blocking, so run it off the event loop"""
+        response = self.bedrock_client.invoke_model(
+            modelId=self.model_id,
+            body=json.dumps(body)
+        )
+        # Reading the body blocks on the network too
+        return json.loads(response['body'].read())
+
+    def _invoke_bedrock_stream(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Invoke the model with a response stream and rebuild the complete response body.
+
+        Text deltas are forwarded to the text callback as they arrive and tool_use inputs
+        are reassembled from their partial JSON deltas.
+        """
+        response = self.bedrock_client.invoke_model_with_response_stream(
+            modelId=self.model_id,
+            body=json.dumps(body)
+        )
+
+        message: Dict[str, Any] = {}
+        blocks: Dict[int, Dict[str, Any]] = {}
+        partial_inputs: Dict[int, List[str]] = {}
+
+        for event in response['body']:
+            if 'chunk' not in event:
+                # Modeled stream errors arrive as events keyed by the exception name
+                error_name, error = next(iter(event.items()))
+                raise RuntimeError(f"{error_name}: {error.get('message', error)}")
+
+            data = json.loads(event['chunk']['bytes'])
+            event_type = data.get('type')
+
+            if event_type == 'message_start':
+                message = {key: value for key, value in data['message'].items() if key != 'content'}
+            elif event_type == 'content_block_start':
+                block = dict(data['content_block'])
+                if block.get('type') == 'tool_use':
+                    block['input'] = {}
+                    partial_inputs[data['index']] = []
+                elif block.get('type') == 'text' and self.text_streamed:
+                    # Each text block, e.g. the preamble before a tool call and the final
+                    # answer, starts its own paragraph in the streamed text
+                    self.report_progress(ProgressEvent.TEXT, '\n\n')
+                blocks[data['index']] = block
+            elif event_type == 'content_block_delta':
+                delta = data['delta']
+                if delta.get('type') == 'text_delta':
+                    blocks[data['index']]['text'] = blocks[data['index']].get('text', '') + delta['text']
+                    self.report_progress(ProgressEvent.TEXT, delta['text'])
+                    self.text_streamed = True
+                elif delta.get('type') == 'input_json_delta':
+                    partial_inputs[data['index']].append(delta.get('partial_json', ''))
+            elif event_type == 'content_block_stop':
+                input_json = ''.join(partial_inputs.pop(data['index'], []))
+                if input_json:
+                    blocks[data['index']]['input'] = json.loads(input_json)
+            elif event_type == 'message_delta':
+                message.update(data.get('delta', {}))
+                message.setdefault('usage', {}).update(data.get('usage', {}))
+
+        message['content'] = [blocks[index] for index in sorted(blocks)]
+        return message
+
+    def build_request_body(self, messages: List[Dict], max_tokens: int) -> Dict[str, Any]:
+        """
+        Build an invoke_model request body for the given conversation.
+
+        The system prompt (with the server summary) and the tool catalog are identical on
+        every iteration, so with prompt caching enabled they are marked with cache_control
+        breakpoints and only the conversation is processed as new input.
+        """
+        # Add server summary to system prompt if available
+        system_prompt = self.system_prompt
+        if self.server_sessions:
+            server_info = self.get_server_summary()
+            system_prompt += f"\n\nAvailable MCP Tools:\n{server_info}"
 
-        summary = []
-        summary.append(f"Active MCP Servers ({len(self.server_sessions)}):")
+        if self.prompt_caching:
+            system = [{"type": "text", "text": system_prompt, "cache_control": {"type": "ephemeral"}}]
+        else:
+            system = system_prompt
+        tools_config = self.get_bedrock_tools_config(cached=self.prompt_caching)
 
-        for server_name, session in self.server_sessions.items():
-            server_tools = [tool_key for tool_key in self.all_tools.keys()
-                            if self.all_tools[tool_key]['server_name'] == server_name]
-            summary.append(f"  • {server_name}: {len(server_tools)} tools")
-            for tool_key in server_tools[:3]:  # Show first 3 tools as examples
-                original_key = self.all_tools[tool_key].get('original_key', tool_key)
-                summary.append(f"    - {original_key}")
-            if len(server_tools) > 3:
-                summary.append(f"    - ... and {len(server_tools) - 3} more")
+        return {
+            "anthropic_version": "bedrock-2023-05-31",
+            "max_tokens": max_tokens,
+            "system": system,
+            "messages": messages,
+            **tools_config
+        }
 
-        summary.append(f"\nTotal tools available: {len(self.all_tools)}")
-        return "\n".join(summary)
+    def _record_usage(self, response_body: Dict[str, Any]):
+        """Accumulate token usage, including prompt cache reads and writes, for this request"""
+        usage = response_body.get('usage', {})
+        for key in self.token_usage:
+            self.token_usage[key] += usage.get(key) or 0
+
+        logger.info(f"Bedrock usage: input={usage.get('input_tokens', 0)} "
+                    f"cache_read={usage.get('cache_read_input_tokens', 0)} "
+                    f"cache_write={usage.get('cache_creation_input_tokens', 0)} "
+                    f"output={usage.get('output_tokens', 0)}")
+        if self.prompt_caching:
+            self.report_progress(ProgressEvent.MODEL,
+                                 f"Prompt cache: {usage.get('cache_read_input_tokens') or 0} tokens read, "
+                                 f"{usage.get('cache_creation_input_tokens') or 0} tokens written")
 
     async def query_bedrock_with_mcp(self, user_message: str) -> str:
-        """Query Bedrock using all available MCP tools"""
+        """Query Bedrock using all available MCP tools, continuing the conversation window if set"""
         try:
-            messages = [
+            history = []
+            if self.conversation is not None:
+                if self.conversation.pending_compaction is not None:
+                    await self.conversation.pending_compaction
+                history = self.conversation.messages()
+
+            messages = history + [
                 {
                     "role": "user",
                     "content": [{"type": "text", "text": user_message}]
                 }
             ]
 
-            # Add server summary to system prompt if available
-            enhanced_system_prompt = self.system_prompt
-            if self.server_sessions:
-                server_info = self.get_server_summary()
-                enhanced_system_prompt += f"\n\nAvailable MCP Tools:\n{server_info}"
-
-            body = {
-                "anthropic_version": "bedrock-2023-05-31",
-                "max_tokens": 1000,
-                "system": enhanced_system_prompt,
-                "messages": messages,
-                **self.get_bedrock_tools_config()
-            }
+            body = self.build_request_body(messages, max_tokens=1000)
 
-            self.progress_callback("Sending prompt to Bedrock for parsing and coming up with action plan...")
+            self.report_progress(ProgressEvent.MODEL, "Sending prompt to Bedrock for parsing and coming up with action plan...")
             logger.info(f"Sending request to Bedrock: {user_message}")
 
-            response = self.bedrock_client.invoke_model(
-                modelId=self.model_id,
-                body=json.dumps(body)
-            )
+            response_body = await self.invoke_bedrock(body)
+            self.report_progress(ProgressEvent.MODEL, f"Received response from Bedrock")
+            reply = await self.process_response_with_mcp(response_body, messages)
 
-            response_body = json.loads(response['body'].read())
-            self.progress_callback(f"Received response from Bedrock")
-            return await self.process_response_with_mcp(response_body, messages)
+            if self.conversation is not None:
+                self._remember_turn(messages[len(history):], reply)
+            return reply
 
         except Exception as e:
             logger.error(f"Error in Bedrock query: {e}")
@@ -352,37 +814,37 @@ class MCPBedrockClient:
                     tool_calls.append(item)
 
             if not tool_calls:
+                if content:
+                    conversation_history.append({
+                        "role": "assistant",
+                        "content": content
+                    })
                 if not text_response.strip() and iteration_count > 1:
                     return "Task completed successfully using MCP tools."
                 return text_response
 
-            self.progress_callback(f"Iteration {iteration_count}: Executing {len(tool_calls)} MCP tools")
+            self.report_progress(ProgressEvent.TOOLS, f"Iteration {iteration_count}: Executing {len(tool_calls)} MCP tools")
 
             conversation_history.append({
                 "role": "assistant",
                 "content": content
             })
 
-            # Execute MCP tools using appropriate server sessions
-            tool_results = []
-
             # Building tool call sequence for logging and debugging as multiline text
             tool_call_sequence = "<br>".join([f"{index+1}. {tool_call.get('name', '')} - {tool_call.get('input', {})}" for index, tool_call in enumerate(tool_calls)])
-            self.progress_callback(f"Tool call sequence:<br>{tool_call_sequence}")
+            self.report_progress(ProgressEvent.TOOLS, f"Tool call sequence:<br>{tool_call_sequence}")
 
-            for tool_call in tool_calls:
-                tool_name = tool_call.get('name')
-                tool_input = tool_call.get('input', {})
-                tool_use_id = tool_call.get('id')
-
-                # Execute via appropriate MCP server session
-                mcp_result = await self.execute_mcp_tool(tool_name, tool_input)
+            # Execute MCP tools concurrently; gather keeps results in tool_use order
+            mcp_results = await self.execute_mcp_tools(tool_calls)
 
-                tool_results.append({
+            tool_results = [
+                {
                     "type": "tool_result",
-                    "tool_use_id": tool_use_id,
+                    "tool_use_id": tool_call.get('id'),
                     "content": [{"type": "text", "text": mcp_result}]
-                })
+                }
+                for tool_call, mcp_result in zip(tool_calls, mcp_results)
+            ]
 
             conversation_history.append({
                 "role": "user",
@@ -390,21 +852,11 @@ class MCPBedrockClient:
             })
 
             # Continue conversation
-            body = {
-                "anthropic_version": "bedrock-2023-05-31",
-                "max_tokens": 2000,
-                "system": self.system_prompt,
-                "messages": conversation_history,
-                **self.get_bedrock_tools_config()
-            }
+            body = self.build_request_body(conversation_history, max_tokens=2000)
 
             try:
-                self.progress_callback("Continuing conversation with Bedrock...")
-                next_response = self.bedrock_client.invoke_model(
-                    modelId=self.model_id,
-                    body=json.dumps(body)
-                )
-                current_response = json.loads(next_response['body'].read())
+                self.report_progress(ProgressEvent.MODEL, "Continuing conversation with Bedrock...")
+                current_response = await self.invoke_bedrock(body)
 
             except Exception as e:
                 logger.error(f"Error in iteration {iteration_count}: {e}")
@@ -412,10 +864,51 @@ class MCPBedrockClient:
 
         return "Maximum iterations reached."
 
+    def _remember_turn(self, turn: List[Dict], reply: str):
+        """Add a finished turn to the conversation window and compact evicted turns in the background"""
+        evicted = self.conversation.add_turn(turn, reply)
+        if evicted and self.conversation.compaction:
+            self.conversation.pending_compaction = asyncio.create_task(
+                self._compact_conversation(self.conversation, evicted))
+
+    async def _compact_conversation(self, conversation: ConversationWindow, turns: List[List[Dict]]):
+        """Fold turns that left the window into the conversation summary"""
+        try:
+            conversation.summary = await self.summarize_turns(conversation.summary, turns)
+        except Exception as e:
+            logger.error(f"Error compacting conversation history: {e}")
+        finally:
+            conversation.pending_compaction = None
+
+    async def summarize_turns(self, summary: Optional[str], turns: List[List[Dict]]) -> str:
+        """Summarize earlier turns, and the previous summary, into a short running summary"""
+        transcript = [f"Earlier summary:\n{summary}"] if summary else []
+        for turn in turns:
+            for message in turn:
+                for block in message.get('content', []):
+                    if block.get('type') == 'text':
+                        transcript.append(f"{message['role']}: {block['text']}")
+                    elif block.get('type') == 'tool_use':
+                        transcript.append(f"assistant called {block['name']} with {json.dumps(block.get('input', {}))}")
+                    elif block.get('type') == 'tool_result':
+                        result_text = ''.join(item.get('text', '') for item in block.get('content', []))
+                        transcript.append(f"tool result: {result_text[:2000]}")
+
+        body = {
+            "anthropic_version": "bedrock-2023-05-31",
+            "max_tokens": 500,
+            "system": "Summarize this conversation between a user and an assistant that uses tools. "
+                      "Keep the facts, tool findings and decisions needed to answer follow-up questions.",
+            "messages": [{"role": "user", "content": [{"type": "text", "text": "\n".join(transcript)}]}]
+        }
+
+        response_body = await asyncio.to_thread(self._invoke_bedrock_sync, body)
+        return ''.join(item.get('text', '') for item in response_body.get('content', []) if item.get('type') == 'text')
+
     async def _handle_mcp_request(self, prompt: str, user_id: str) -> str:
         """Handle MCP-enhanced requests"""
         try:
-            # Initialize MCP sessions if not already done
+            # Acquire MCP sessions if not already done
             if not self.mcp_initialized:
                 success = await self.initialize_mcp_sessions()
                 if not success:
@@ -430,66 +923,60 @@ class MCPBedrockClient:
             logger.error(error_msg)
             return error_msg
 
-    def process_mcp_response(self, prompt, user_id):
-        import asyncio
+    def process_mcp_response(self, prompt, user_id, bypass_tool_cache: bool = False):
+        """
+        Run an MCP request on the session pool event loop and wait for its response.
+
+        Progress events and streamed text are delivered to the callbacks on the calling
+        thread, so they keep the caller's Streamlit script run context. Each burst of
+        pending events is delivered in a single call. With bypass_tool_cache, cached tool
+        results are ignored (fresh results still refresh the cache).
+        """
+        channel = ProgressChannel()
+        self.progress_channel = channel
+        self.bypass_tool_cache = bypass_tool_cache
+        self.text_streamed = False
+        self.token_usage = self._empty_token_usage()
+
         try:
-            # If we're already in the main async context, run directly
-            if self.main_loop and self.main_loop.is_running():
-                try:
-                    # Try to run directly if nest_asyncio is working
-                    return asyncio.run(self._handle_mcp_request(prompt, user_id))
-                except RuntimeError:
-                    # Use a thread to avoid event loop conflicts
-                    import threading
-                    result = [None]
-                    exception = [None]
-
-                    def run_async():
-                        try:
-                            loop = asyncio.new_event_loop()
-                            asyncio.set_event_loop(loop)
-                            result[0] = loop.run_until_complete(
-                                self._handle_mcp_request(prompt, user_id)
-                            )
-                        except Exception as e:
-                            exception[0] = e
-                        finally:
-                            loop.close()
-
-                    thread = threading.Thread(target=run_async)
-                    thread.start()
-                    thread.join(timeout=300)
-
-                    if exception[0]:
-                        raise exception[0]
-                    return result[0]
-            else:
-                # No main loop, run normally
-                return asyncio.run(self._handle_mcp_request(prompt, user_id))
+            future = self.pool.submit(self._handle_mcp_request(prompt, user_id))
+            future.add_done_callback(lambda _: channel.close())
+
+            for events in channel.batches():
+                self._dispatch_progress(events)
+
+            return future.result()
         except Exception as e:
             logger.error(f"Error in process_mcp_response: {e}")
             return f"Error: {str(e)}"
         finally:
-            # Cleanup MCP sessions
-            asyncio.run(self.cleanup_mcp_sessions())
+            self.progress_channel = None
+            self.bypass_tool_cache = False
+            self.release_mcp_sessions()
 
-    def __del__(self):
-        """Close all MCP sessions"""
-        if self.server_sessions:
-            asyncio.run(self.cleanup_mcp_sessions())
-            logger.info("All MCP sessions closed.")
+    def _dispatch_progress(self, events: List[ProgressEvent]):
+        """Deliver a burst of events: progress as one list, streamed text as one string"""
+        progress_events = [event for event in events if event.phase != ProgressEvent.TEXT]
+        text = ''.join(event.message for event in events if event.phase == ProgressEvent.TEXT)
 
-    async def close(self):
-        """Close all MCP sessions"""
-        logger.info("Closing all MCP sessions...")
-        await self.cleanup_mcp_sessions()
+        if progress_events and self.progress_callback:
+            self.progress_callback(progress_events)
+        if text and self.text_callback:
+            self.text_callback(text)
 
-    def which(self, program):
-        try:
-            result = subprocess.run(['which', program], capture_output=True, text=True, check=True)
-            return result.stdout.strip()
-        except subprocess.CalledProcessError:
+    async def close(self):
+        """Release all MCP sessions held by this client"""
+        logger.info("Releasing all MCP sessions...")
+        self.release_mcp_sessions()
+
+    @staticmethod
+    @functools.lru_cache(maxsize=None)
+    def which(program):
+        """Resolve a command on the system path once per process, without forking"""
+        path = shutil.which(program)
+        if path is None:
             raise RuntimeError(f"'{program}' is not found in the system path.")
+        return path
 
 
 # Example usage:
@@ -521,7 +1008,7 @@ servers = [
 
 client.add_servers(servers)
 client.set_system_prompt("You are a helpful assistant with access to multiple tool servers.")
-client.set_progress_callback(lambda msg: print(f"Progress: {msg}"))
+client.set_progress_callback(lambda events: print(f"Progress: {events[-1].message}"))
 
 # Use the client
 response = client.process_mcp_response("Analyze the security of my application", "user123")
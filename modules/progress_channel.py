@@ -0,0 +1,66 @@
+import queue
+import time
+from datetime import datetime
+from typing import Iterator, List, Optional
+
+
+class ProgressEvent:
+    """A timestamped event emitted while a request is being processed"""
+
+    # Phases of an MCP agent request
+    INITIALIZE = "initialize"
+    MODEL = "model"
+    TOOLS = "tools"
+    TEXT = "text"
+
+    def __init__(self, phase: str, message: str, timestamp: Optional[float] = None):
+        self.phase = phase
+        self.message = message
+        self.timestamp = timestamp or time.time()
+
+    @property
+    def time_label(self) -> str:
+        """Wall-clock time of the event formatted for display"""
+        return datetime.fromtimestamp(self.timestamp).strftime("%H:%M:%S")
+
+
+class ProgressChannel:
+    """
+    Non-blocking channel carrying progress events from a worker to the thread rendering them.
+
+    Producers call ``emit`` from any thread and never wait. The consumer iterates over
+    ``batches``, which blocks until events arrive and yields every event that is pending
+    at that moment, so a burst of events is rendered once.
+    """
+
+    _CLOSED = object()
+
+    def __init__(self):
+        self._events = queue.Queue()
+
+    def emit(self, phase: str, message: str):
+        """Publish an event without blocking"""
+        self._events.put(ProgressEvent(phase, message))
+
+    def close(self):
+        """Signal that no more events will be emitted"""
+        self._events.put(self._CLOSED)
+
+    def batches(self) -> Iterator[List[ProgressEvent]]:
+        """Yield pending events in batches until the channel is closed"""
+        closed = False
+        while not closed:
+            batch = []
+            item = self._events.get()
+            while True:
+                if item is self._CLOSED:
+                    closed = True
+                    break
+                batch.append(item)
+                try:
+                    item = self._events.get_nowait()
+                except queue.Empty:
+                    break
+
+            if batch:
+                yield batch
@@ -22,6 +22,10 @@ class SessionManager:
         if "conversation_history" not in st.session_state:
             st.session_state.conversation_history = {}
 
+        # Multi-turn model history of MCP agents, keyed by (user_id, agent_name)
+        if "mcp_conversations" not in st.session_state:
+            st.session_state.mcp_conversations = {}
+
         # Authentication status
         if "is_authenticated" not in st.session_state:
             st.session_state.is_authenticated = False
@@ -45,5 +49,9 @@ class SessionManager:
         if 'previous_agent_key' not in st.session_state:
             st.session_state.previous_agent_key = None
 
+        # Ignore cached MCP tool results for the next requests (sidebar toggle)
+        if 'bypass_tool_cache' not in st.session_state:
+            st.session_state.bypass_tool_cache = False
+
         if 'placeholder' not in st.session_state:
             st.session_state.placeholder = None
@@ -1,11 +1,14 @@
+import functools
 import os
 import queue
 from typing import Dict
 
 import streamlit as st
 
+from modules.agent_catalog import AgentCatalog
 from modules.bedrock_agent_manager import BedrockAgentManager
 from modules.constants import Constants
+from modules.tool_result_cache import ToolResultCache
 
 
 class StreamlitUIManager:
@@ -15,6 +18,7 @@ class StreamlitUIManager:
 
     def __init__(self, bedrock_agent_manager: BedrockAgentManager):
         self.bedrock_agent_manager = bedrock_agent_manager
+        self.agent_catalog = AgentCatalog.get_instance(bedrock_agent_manager.agent_resolver)
 
     def configure_page(self):
         """Configure Streamlit page settings."""
@@ -68,13 +72,7 @@ class StreamlitUIManager:
         """
         with st.sidebar:
             st.subheader("Settings")
-            agent_list = self.bedrock_agent_manager.get_agent_list()
-            option_list = {}
-            option_list.update(
-                {values['name']: f"{key}:{values['name']}:{values['type']}" for key, values in config.items() if
-                 values['type'] == 'mcp'})
-            option_list.update({values['name']: f"{key}:{agent}:{values['type']}"
-                                for agent in agent_list for key, values in config.items() if key in agent})
+            option_list = self.agent_catalog.get_options(config)
 
             agent_name = st.selectbox(
                 "Select Bedrock Agent",
@@ -83,9 +81,10 @@ class StreamlitUIManager:
                 ]
             )
 
-            agent_key = option_list[agent_name].split(":")[0]
-            agent_type = option_list[agent_name].split(":")[2]
-            agent_name = option_list[agent_name].split(":")[1]
+            agent_key, agent_name, agent_type = option_list[agent_name]
+
+            if agent_type == 'mcp':
+                self.render_tool_cache_settings()
 
             st.divider()
 
@@ -99,6 +98,19 @@ class StreamlitUIManager:
 
         return agent_name, agent_key, agent_type
 
+    def render_tool_cache_settings(self):
+        """Render the tool result cache toggle and its effectiveness metrics."""
+        st.toggle(
+            "Bypass tool result cache",
+            key="bypass_tool_cache",
+            help="Call the MCP tools again instead of reusing their cached results; "
+                 "fresh results still refresh the cache"
+        )
+        metrics = ToolResultCache.get_instance().get_metrics()
+        st.caption(f"Tool cache: {metrics['hits']} hits, {metrics['misses']} misses "
+                   f"({metrics['hit_ratio']:.0%}), {metrics['size']} cached results, "
+                   f"{metrics['evictions']} evicted, {metrics['expirations']} expired")
+
     def render_chat_history(self, user_id: str, conversation_history: Dict):
         """
         Render the chat history for the current user.
@@ -118,28 +130,47 @@ class StreamlitUIManager:
                     st.chat_message("assistant", avatar=Constants.ASSISTANT_AVATAR).write(content)
 
     def process_response_queue(self):
-        """Process any queued streaming responses."""
-        while (st.session_state.waiting_for_response or
-               not st.session_state.response_queue.empty()):
-            if not st.session_state.response_queue.empty():
-                try:
-                    # Process all available responses
-                    while not st.session_state.response_queue.empty():
-                        user_id, text_chunk, is_error = st.session_state.response_queue.get(block=False)
+        """
+        Process any queued streaming responses.
 
-                        if is_error:
-                            st.error(text_chunk)
-                        else:
-                            st.rerun()
+        While a response is in flight this blocks on the queue instead of polling; the
+        request thread always finishes by queueing a completion marker (a None chunk).
+        """
+        response_queue = st.session_state.response_queue
+        while (st.session_state.waiting_for_response or
+               not response_queue.empty()):
+            # Block until the next chunk or the completion marker arrives
+            chunks = [response_queue.get()]
+
+            # Process all available responses
+            try:
+                while True:
+                    chunks.append(response_queue.get(block=False))
+            except queue.Empty:
+                pass
+
+            received_text = False
+            for user_id, text_chunk, is_error in chunks:
+                if text_chunk is None:
+                    continue
+                if is_error:
+                    st.error(text_chunk)
+                else:
+                    received_text = True
 
-                except queue.Empty:
-                    pass
+            if received_text:
+                st.rerun()
 
     def load_css(self):
         """Load CSS styles for the application."""
+        st.markdown(f'<style>{self._read_css()}</style>', unsafe_allow_html=True)
 
+    @staticmethod
+    @functools.lru_cache(maxsize=1)
+    def _read_css() -> str:
+        """Read style.css once per process."""
         directory_name = os.path.dirname(__file__)
         config_path = os.path.join(os.path.dirname(directory_name), 'style.css')
 
         with open(config_path) as f:
-            st.markdown(f'<style>{f.read()}</style>', unsafe_allow_html=True)
+            return f.read()
@@ -0,0 +1,134 @@
+import itertools
+import re
+import threading
+from collections import OrderedDict
+from types import MappingProxyType
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+
+class ToolRegistry:
+    """
+    Immutable, versioned catalog of the tools offered by a set of MCP server sessions.
+
+    Everything a Bedrock request needs from the catalog is computed once when the
+    registry is built: the Bedrock tool payload (with and without a prompt cache
+    breakpoint), the server summary text and an exact bidirectional map between Bedrock
+    tool names and (server, tool) pairs. Registries are shared for as long as the same
+    pooled sessions are in use.
+    """
+
+    _versions = itertools.count(1)
+    _cache: "OrderedDict[tuple, tuple]" = OrderedDict()
+    _cache_lock = threading.Lock()
+    _cache_size = 32
+
+    # Bedrock tool names must match ^[a-zA-Z0-9_-]{1,64}$
+    _INVALID_NAME_CHARS = re.compile(r'[^a-zA-Z0-9_-]')
+    _MAX_NAME_LENGTH = 64
+
+    def __init__(self, sessions: Mapping[str, Any]):
+        """
+        Build the registry.
+
+        Args:
+            sessions: Initialized MCP server sessions keyed by server name
+        """
+        self.version = next(self._versions)
+
+        names: Dict[str, Tuple[str, str]] = {}
+        clean_names: Dict[Tuple[str, str], str] = {}
+        tool_infos: Dict[str, Dict[str, Any]] = {}
+        bedrock_tools = []
+        summary = [f"Active MCP Servers ({len(sessions)}):"]
+
+        # Servers are listed in name order so the payload is stable for prompt caching
+        for server_name, session in sorted(sessions.items()):
+            server_tools = list(session.tools.items())
+            summary.append(f"  • {server_name}: {len(server_tools)} tools")
+
+            for index, (tool_key, tool_info) in enumerate(server_tools):
+                clean_name = self._make_clean_name(server_name, tool_info['name'], names)
+                names[clean_name] = (server_name, tool_info['name'])
+                clean_names[(server_name, tool_info['name'])] = clean_name
+                tool_infos[clean_name] = tool_info
+                bedrock_tools.append({
+                    "name": clean_name,
+                    "description": tool_info['description'],
+                    "input_schema": tool_info['schema']
+                })
+
+                if index < 3:  # Show first 3 tools as examples
+                    summary.append(f"    - {tool_key}")
+            if len(server_tools) > 3:
+                summary.append(f"    - ... and {len(server_tools) - 3} more")
+
+        summary.append(f"\nTotal tools available: {len(bedrock_tools)}")
+
+        self.names: Mapping[str, Tuple[str, str]] = MappingProxyType(names)
+        self.clean_names: Mapping[Tuple[str, str], str] = MappingProxyType(clean_names)
+        self.tool_infos: Mapping[str, Dict[str, Any]] = MappingProxyType(tool_infos)
+        self.summary = "\n".join(summary) if sessions else "No MCP servers initialized"
+        self.tools_config = MappingProxyType({
+            "tools": tuple(bedrock_tools),
+            "tool_choice": {"type": "auto"}
+        })
+
+        # Variant with a prompt cache breakpoint after the last tool
+        cached_tools = list(bedrock_tools)
+        if cached_tools:
+            cached_tools[-1] = {**cached_tools[-1], "cache_control": {"type": "ephemeral"}}
+        self.cached_tools_config = MappingProxyType({
+            "tools": tuple(cached_tools),
+            "tool_choice": {"type": "auto"}
+        })
+
+    @classmethod
+    def for_sessions(cls, sessions: Mapping[str, Any]) -> "ToolRegistry":
+        """
+        Return the registry for a set of sessions, building it only if this exact set is new.
+
+        Args:
+            sessions: Initialized MCP server sessions keyed by server name
+
+        Returns:
+            ToolRegistry: Shared registry for these sessions
+        """
+        key = tuple(sorted((name, id(session)) for name, session in sessions.items()))
+        with cls._cache_lock:
+            entry = cls._cache.get(key)
+            if entry is not None:
+                cls._cache.move_to_end(key)
+                return entry[1]
+
+        registry = cls(sessions)
+        with cls._cache_lock:
+            # Keep the sessions referenced so their ids cannot be reused by new sessions
+            cls._cache[key] = (tuple(sessions.values()), registry)
+            while len(cls._cache) > cls._cache_size:
+                cls._cache.popitem(last=False)
+        return registry
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def resolve(self, clean_name: str) -> Optional[Tuple[str, str]]:
+        """
+        Map a Bedrock tool name back to its server and original tool name.
+
+        Args:
+            clean_name: Tool name as sent to and returned by Bedrock
+
+        Returns:
+            Optional[Tuple[str, str]]: Server name and tool name, or None if unknown
+        """
+        return self.names.get(clean_name)
+
+    @classmethod
+    def _make_clean_name(cls, server_name: str, tool_name: str, taken: Mapping[str, Any]) -> str:
+        base = cls._INVALID_NAME_CHARS.sub('_', f"{server_name}-{tool_name}")[:cls._MAX_NAME_LENGTH]
+        clean_name = base
+        for suffix in itertools.count(2):
+            if clean_name not in taken:
+                return clean_name
+            tag = f"_{suffix}"
+            clean_name = base[:cls._MAX_NAME_LENGTH - len(tag)] + tag
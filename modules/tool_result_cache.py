@@ -0,0 +1,102 @@
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+
+class ToolResultCache:
+    """
+    Process-wide, size-bounded LRU cache of MCP tool results.
+
+    Entries are keyed by (server, tool, canonicalized arguments) and expire after the TTL
+    the tool declares in sidebar.yaml. The cache is shared by every session, so the same
+    lookup made by different users or in later turns is served without calling the server.
+    """
+
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self, max_entries: int = 256):
+        """
+        Initialize the tool result cache.
+
+        Args:
+            max_entries: Maximum number of results kept before the least recently used is evicted
+        """
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[tuple, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._metrics = {'hits': 0, 'misses': 0, 'evictions': 0, 'expirations': 0}
+
+    @classmethod
+    def get_instance(cls) -> "ToolResultCache":
+        """Return the cache shared by every session in this process"""
+        if cls._instance is None:
+            with cls._instance_lock:
+                if cls._instance is None:
+                    cls._instance = cls()
+        return cls._instance
+
+    @staticmethod
+    def make_key(server_key: str, tool_name: str, arguments: Dict[str, Any]) -> tuple:
+        """
+        Build the cache key for a tool call.
+
+        Args:
+            server_key: Identity hash of the server configuration
+            tool_name: Original tool name on the server
+            arguments: Tool arguments; key order and whitespace do not affect the key
+
+        Returns:
+            tuple: Hashable cache key
+        """
+        canonical_arguments = json.dumps(arguments or {}, sort_keys=True, separators=(',', ':'), default=str)
+        return server_key, tool_name, canonical_arguments
+
+    def get(self, key: tuple) -> Optional[str]:
+        """Return the cached result for a key, or None on a miss or expired entry"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._metrics['misses'] += 1
+                return None
+
+            result, expires_at = entry
+            if time.monotonic() >= expires_at:
+                del self._entries[key]
+                self._metrics['expirations'] += 1
+                self._metrics['misses'] += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self._metrics['hits'] += 1
+            return result
+
+    def put(self, key: tuple, result: str, ttl: float):
+        """Store a result for ttl seconds, evicting the least recently used entries if full"""
+        with self._lock:
+            self._entries[key] = (result, time.monotonic() + ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._metrics['evictions'] += 1
+
+    def clear(self):
+        """Drop every cached result"""
+        with self._lock:
+            self._entries.clear()
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """
+        Get cache effectiveness metrics.
+
+        Returns:
+            Dict: Hits, misses, evictions, expirations, current size and hit ratio
+        """
+        with self._lock:
+            metrics = dict(self._metrics)
+            metrics['size'] = len(self._entries)
+        lookups = metrics['hits'] + metrics['misses']
+        metrics['hit_ratio'] = metrics['hits'] / lookups if lookups else 0.0
+        return metrics
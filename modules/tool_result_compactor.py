@@ -0,0 +1,214 @@
+import hashlib
+import json
+import threading
+from collections import Counter, OrderedDict
+from typing import Any, Dict, List, Optional
+
+from modules.conversation_window import ConversationWindow
+
+
+class ResultPolicy:
+    """Compaction policy for the results of one tool"""
+
+    def __init__(self, max_tokens: int = 4000, fields: Optional[Dict[str, List[str]]] = None,
+                 max_items: int = 20, group_by: Optional[List[str]] = None):
+        """
+        Initialize the result policy.
+
+        Args:
+            max_tokens: Estimated tokens a result may use in the model context
+            fields: Array key mapped to the item fields kept when the result is too large,
+                e.g. {"issues": ["key", "severity", "message"]}; applies at any depth
+            max_items: Items kept from each long array of objects before it is aggregated
+            group_by: Item fields counted when an array is shortened
+        """
+        self.max_tokens = max_tokens
+        self.fields = fields or {}
+        self.max_items = max_items
+        self.group_by = group_by or ['severity', 'type']
+
+
+class ToolResultCompactor:
+    """
+    Process-wide stage that fits MCP tool results into a per-result token budget.
+
+    Results within budget pass through unchanged. Larger JSON results are reduced step by
+    step until they fit: item fields are projected to the ones the tool policy keeps, long
+    arrays of objects are replaced by their total, per-field counts and the most severe
+    items, and as a last resort the text is truncated. The full result is kept under a
+    handle so the model can page through it with the fetch tool instead of calling the
+    server again.
+    """
+
+    FETCH_TOOL_NAME = "fetch_tool_result"
+    FETCH_TOOL = {
+        "name": FETCH_TOOL_NAME,
+        "description": "Fetch part of a tool result that was compacted to fit the context. "
+                       "Use the handle from the result's 'compaction' section, an optional dotted "
+                       "path to a value (e.g. 'nexus_results.components') and offset/limit to page "
+                       "through arrays.",
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "handle": {"type": "string", "description": "Handle of the compacted result"},
+                "path": {"type": "string", "description": "Dotted path to the value to fetch; empty for the whole result"},
+                "offset": {"type": "integer", "description": "First array item (or character for text results) to return"},
+                "limit": {"type": "integer", "description": "Maximum array items to return"}
+            },
+            "required": ["handle"]
+        }
+    }
+
+    SEVERITY_ORDER = {"critical": 0, "high": 1, "medium": 2, "low": 3, "info": 4}
+
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self, max_results: int = 64):
+        """
+        Initialize the result compactor.
+
+        Args:
+            max_results: Full results kept for fetching before the least recently used is dropped
+        """
+        self.max_results = max_results
+        self.default_policy = ResultPolicy()
+        self._results: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def get_instance(cls) -> "ToolResultCompactor":
+        """Return the compactor shared by every session in this process"""
+        if cls._instance is None:
+            with cls._instance_lock:
+                if cls._instance is None:
+                    cls._instance = cls()
+        return cls._instance
+
+    def compact(self, result: str, policy: Optional[ResultPolicy] = None) -> str:
+        """
+        Fit a tool result into the token budget of its policy.
+
+        Args:
+            result: Tool result text as returned by the server
+            policy: Policy of the tool; the default policy is used if None
+
+        Returns:
+            str: The result itself if it fits, otherwise a compacted result with a fetch handle
+        """
+        policy = policy or self.default_policy
+        original_tokens = ConversationWindow.estimate_tokens(result)
+        if original_tokens <= policy.max_tokens:
+            return result
+
+        handle = self._store(result)
+        compaction = {
+            "handle": handle,
+            "original_tokens": original_tokens,
+            "note": f"Result compacted to fit the context; call {self.FETCH_TOOL_NAME} with this handle for details."
+        }
+
+        try:
+            data = json.loads(result)
+        except ValueError:
+            data = None
+
+        if isinstance(data, (dict, list)):
+            data = self._project(data, policy.fields)
+            max_items = policy.max_items
+            while True:
+                text = json.dumps({"result": self._aggregate(data, max_items, policy.group_by),
+                                   "compaction": compaction}, separators=(',', ':'), default=str)
+                if ConversationWindow.estimate_tokens(text) <= policy.max_tokens or max_items == 0:
+                    break
+                max_items //= 2
+            if ConversationWindow.estimate_tokens(text) <= policy.max_tokens:
+                return text
+
+        limit = max(policy.max_tokens * ConversationWindow.CHARS_PER_TOKEN - 200, 0)
+        if isinstance(data, (dict, list)):
+            result, hint = text, "a path to page through it"
+        else:
+            hint = f"offset {limit} for more"
+
+        return (f"{result[:limit]}\n...[truncated {len(result) - limit} characters; "
+                f"call {self.FETCH_TOOL_NAME} with handle '{handle}' and {hint}]")
+
+    def fetch(self, handle: str, path: str = "", offset: int = 0, limit: int = 20) -> str:
+        """
+        Return part of a full result kept by an earlier compaction.
+
+        Args:
+            handle: Handle from the compacted result
+            path: Dotted path of the value to return; list indexes are numbers
+            offset: First array item, or first character for text results
+            limit: Maximum array items returned
+
+        Returns:
+            str: The requested part, compacted again with the default policy if still too large
+        """
+        with self._lock:
+            result = self._results.get(handle)
+            if result is not None:
+                self._results.move_to_end(handle)
+        if result is None:
+            return f"Error: Unknown or expired result handle {handle}"
+
+        try:
+            value = json.loads(result)
+        except ValueError:
+            chunk = self.default_policy.max_tokens * ConversationWindow.CHARS_PER_TOKEN
+            part = result[offset:offset + chunk]
+            if offset + chunk < len(result):
+                part += (f"\n...[call {self.FETCH_TOOL_NAME} with handle '{handle}' "
+                         f"and offset {offset + chunk} for more]")
+            return part
+
+        try:
+            for part in filter(None, (path or "").split('.')):
+                value = value[int(part)] if isinstance(value, list) else value[part]
+        except (KeyError, IndexError, ValueError, TypeError):
+            return f"Error: Path {path} not found in result {handle}"
+
+        if isinstance(value, list):
+            value = {"total": len(value), "offset": offset, "items": value[offset:offset + limit]}
+        return self.compact(json.dumps(value, default=str))
+
+    def _store(self, result: str) -> str:
+        handle = hashlib.sha256(result.encode()).hexdigest()[:16]
+        with self._lock:
+            self._results[handle] = result
+            self._results.move_to_end(handle)
+            while len(self._results) > self.max_results:
+                self._results.popitem(last=False)
+        return handle
+
+    @classmethod
+    def _project(cls, value: Any, fields: Dict[str, List[str]], key: Optional[str] = None) -> Any:
+        if isinstance(value, dict):
+            return {k: cls._project(v, fields, k) for k, v in value.items()}
+        if isinstance(value, list):
+            keep = fields.get(key)
+            return [cls._project({k: v for k, v in item.items() if k in keep} if keep and isinstance(item, dict)
+                                 else item, fields) for item in value]
+        return value
+
+    @classmethod
+    def _aggregate(cls, value: Any, max_items: int, group_by: List[str]) -> Any:
+        if isinstance(value, dict):
+            return {k: cls._aggregate(v, max_items, group_by) for k, v in value.items()}
+        if not isinstance(value, list) or len(value) <= max_items:
+            return [cls._aggregate(item, max_items, group_by) for item in value] if isinstance(value, list) else value
+
+        items = value
+        summary: Dict[str, Any] = {"total": len(items), "omitted": len(items) - max_items}
+        if all(isinstance(item, dict) for item in items):
+            for field in group_by:
+                counts = Counter(str(item[field]) for item in items if field in item)
+                if counts:
+                    summary[f"by_{field}"] = dict(counts.most_common())
+            # Keep the most severe items when the array has severities
+            items = sorted(items, key=lambda item: cls.SEVERITY_ORDER.get(str(item.get('severity', '')).lower(), 5))
+
+        summary["items"] = [cls._aggregate(item, max_items, group_by) for item in items[:max_items]]
+        return summary